@@ -0,0 +1,118 @@
+"""
+Benchmarks of the import time of mpl_widget_box.
+
+Each statement is run in a fresh interpreter, so the import is cold (except
+for the file system cache), and the time of the statement and the number of
+the modules it imports are reported. The heavy dependencies that are imported
+(e.g., matplotlib) are listed too.
+
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --json base.json
+    python benchmarks/bench_import.py --compare base.json
+
+As with bench_widget_box.py, the json output records the git revision and can
+be compared against the result of another commit with ``--compare``.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+from bench_widget_box import summarize, get_metadata
+
+STATEMENTS = [
+    ("package", "import mpl_widget_box"),
+    ("widgets-module", "from mpl_widget_box import widgets as W"),
+    ("widgets", "from mpl_widget_box import widgets as W; W.Button"),
+    ("manager", "from mpl_widget_box import WidgetBoxManager"),
+    ("cbar-selector",
+     "from mpl_widget_box.misc.cbar_composite_widget import CbarSelectorWidget"),
+]
+
+# the dependencies that are worth deferring.
+HEAVY_MODULES = ["matplotlib", "matplotlib.pyplot", "numpy", "fontawesomefree",
+                 "yaml", "astropy", "asyncio"]
+
+_CHILD = """
+import json, sys, time
+n0 = len(sys.modules)
+t0 = time.perf_counter()
+{statement}
+t = (time.perf_counter() - t0) * 1e3
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps(dict(ms=t, modules=len(sys.modules) - n0, heavy=heavy)))
+"""
+
+
+def measure(statement):
+    "returns (ms, number of the imported modules, heavy modules) in a child."
+    code = _CHILD.format(statement=statement, heavy=HEAVY_MODULES)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                         text=True, check=True).stdout
+    r = json.loads(out.strip().splitlines()[-1])
+    return r["ms"], r["modules"], r["heavy"]
+
+
+def run(statement, repeat):
+    times = []
+    for _ in range(repeat):
+        ms, modules, heavy = measure(statement)
+        times.append(ms)
+
+    return dict(statement=statement, modules=modules, heavy=heavy,
+                stats=summarize(times))
+
+
+def print_results(results, baseline=None):
+    header = f"{'name':16s} {'modules':>7s} {'p50':>9s} {'max':>9s}"
+    if baseline is not None:
+        header += f" {'p50 base':>9s} {'ratio':>6s} {'mod base':>8s}"
+    print(header + "   (ms)  heavy modules")
+
+    for name, r in results.items():
+        s = r["stats"]
+        line = f"{name:16s} {r['modules']:7d} {s['p50']:9.1f} {s['max']:9.1f}"
+        if baseline is not None:
+            b = baseline.get(name)
+            if b is not None:
+                line += (f" {b['stats']['p50']:9.1f} "
+                         f"{s['p50'] / b['stats']['p50']:6.2f} "
+                         f"{b['modules']:8d}")
+        print(line + "   " + " ".join(r["heavy"]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="number of the interpreters per statement")
+    parser.add_argument("--filter", default=None,
+                        help="run the statements whose name contains this")
+    parser.add_argument("--json", default=None,
+                        help="save the results to the json file")
+    parser.add_argument("--compare", default=None,
+                        help="compare with the results in the json file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, statement in STATEMENTS:
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = run(statement, args.repeat)
+        print(f"done: {name}", file=sys.stderr)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+
+    print_results(results, baseline)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(dict(metadata=get_metadata(), repeat=args.repeat,
+                           results=results), f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""
+Headless benchmarks of the WidgetBoxManager.
+
+The benchmarks run on the Agg backend and feed synthetic mouse events through
+the canvas callbacks, as a GUI backend would. Each scenario scales one of the
+widget count, the container count, the figure size and the popup depth, and
+the latency of each operation is reported as a distribution.
+
+    python benchmarks/bench_widget_box.py
+    python benchmarks/bench_widget_box.py --quick --json base.json
+    python benchmarks/bench_widget_box.py --quick --compare base.json
+
+The json output records the git revision and the versions, and can be compared
+against the result of another commit with ``--compare``.
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+from matplotlib.backend_bases import MouseEvent
+
+from mpl_widget_box import widgets as W, WidgetBoxManager
+
+
+# Scenarios
+
+def make_widgets(n, prefix=""):
+    """
+    returns n widgets of mixed kinds, packed in rows of 5.
+    """
+    widgets = []
+    for i in range(n):
+        wid = f"{prefix}w{i}"
+        kind = i % 4
+        if kind == 0:
+            w = W.Button(wid, f"Button {i}", tooltip=f"tooltip {i}")
+        elif kind == 1:
+            w = W.Label(wid, f"Label {i}")
+        elif kind == 2:
+            w = W.CheckBox(wid, ["a", "b"], direction="h")
+        else:
+            w = W.Radio(wid, ["x", "y"], direction="h")
+        widgets.append(w)
+
+    return [W.HWidgets(widgets[i:i + 5]) for i in range(0, n, 5)]
+
+
+def make_nested_subs(depth, prefix="sub"):
+    "Sub widgets nested to the given depth."
+    widgets = [W.Label(f"{prefix}-l{depth}", f"level {depth}")]
+    for d in reversed(range(depth)):
+        widgets = [W.Sub(f"{prefix}{d}", f"Sub {d}", widgets),
+                   W.Label(f"{prefix}-l{d}", f"level {d}")]
+
+    return widgets
+
+
+class Scenario:
+    def __init__(self, name, n_widgets=100, n_containers=1, figsize=(8, 6),
+                 dpi=100, popup_depth=0):
+        self.name = name
+        self.n_widgets = n_widgets
+        self.n_containers = n_containers
+        self.figsize = figsize
+        self.dpi = dpi
+        self.popup_depth = popup_depth
+
+    def params(self):
+        return dict(n_widgets=self.n_widgets, n_containers=self.n_containers,
+                    figsize=list(self.figsize), dpi=self.dpi,
+                    popup_depth=self.popup_depth)
+
+    def build(self):
+        """
+        returns (fig, wbm), with the widgets installed but not drawn. The wids
+        of the (unpacked) widgets and the containers are kept as `wids` and
+        `containers`.
+        """
+        fig = plt.figure(figsize=self.figsize, dpi=self.dpi)
+        ncols = math.ceil(math.sqrt(self.n_containers))
+        nrows = math.ceil(self.n_containers / ncols)
+        axs = fig.subplots(nrows, ncols, squeeze=False).flat
+
+        # Only the public API of the baseline is used, so that the results
+        # can be compared across the commits.
+        wbm = WidgetBoxManager(fig)
+        self.wids = []
+        self.containers = []
+        n_per_container = max(self.n_widgets // self.n_containers, 1)
+        for i, ax in zip(range(self.n_containers), axs):
+            widgets = make_widgets(n_per_container, prefix=f"c{i}:")
+            self.wids.extend(f"c{i}:w{k}" for k in range(n_per_container))
+            if i == 0 and self.popup_depth:
+                widgets = make_nested_subs(self.popup_depth) + widgets
+            self.containers.append(
+                wbm.add_anchored_widget_box(widgets, ax, loc=2))
+
+        wbm.set_callback(lambda wbm, ev, status: None)
+
+        return fig, wbm
+
+
+def get_scenarios(quick=False):
+    if quick:
+        widget_counts, container_counts = [10, 100], [1, 10]
+        figsizes = [((6, 4), 100), ((16, 10), 150)]
+        depths = [1, 3]
+    else:
+        widget_counts, container_counts = [10, 100, 1000], [1, 10, 50]
+        figsizes = [((6, 4), 100), ((12, 8), 100), ((16, 10), 150)]
+        depths = [1, 3, 6]
+
+    scenarios = []
+    for n in widget_counts:
+        scenarios.append(Scenario(f"widgets-{n}", n_widgets=n))
+    for n in container_counts:
+        scenarios.append(Scenario(f"containers-{n}", n_widgets=200,
+                                  n_containers=n))
+    for figsize, dpi in figsizes:
+        w, h = figsize
+        scenarios.append(Scenario(f"figsize-{w}x{h}@{dpi}", figsize=figsize,
+                                  dpi=dpi))
+    for d in depths:
+        scenarios.append(Scenario(f"popup-depth-{d}", n_widgets=20,
+                                  popup_depth=d))
+
+    return scenarios
+
+
+# Measurements
+
+def _timed(func, *args):
+    t0 = time.perf_counter_ns()
+    func(*args)
+    return (time.perf_counter_ns() - t0) * 1e-6
+
+
+def _process(canvas, event):
+    canvas.callbacks.process(event.name, event)
+
+
+def _center(wbm, wid):
+    renderer = wbm.fig.canvas.get_renderer()
+    bb = wbm.get_widget_by_id(wid).get_event_area(renderer)
+    return (bb.x0 + bb.x1) / 2, (bb.y0 + bb.y1) / 2
+
+
+def _hover_targets(wbm, wids, n, rng):
+    "centers of randomly chosen widgets, which can be hovered."
+    renderer = wbm.fig.canvas.get_renderer()
+    centers = []
+    for wid in wids:
+        w = wbm.get_widget_by_id(wid)
+        if w is None or not w.get_visible():
+            continue
+        bb = w.get_event_area(renderer)
+        if wbm.fig.bbox.contains((bb.x0 + bb.x1) / 2, (bb.y0 + bb.y1) / 2):
+            centers.append((wid, (bb.x0 + bb.x1) / 2, (bb.y0 + bb.y1) / 2))
+
+    rng.shuffle(centers)
+    return centers[:n]
+
+
+def run_scenario(scenario, repeat):
+    rng = random.Random(0)
+    samples = {}
+
+    def add(op, t):
+        samples.setdefault(op, []).append(t)
+
+    # install
+    for i in range(max(repeat // 10, 3)):
+        fig, wbm = scenario.build()
+        add("install_all", _timed(wbm.install_all))
+        if i < max(repeat // 10, 3) - 1:
+            plt.close(fig)
+
+    canvas = fig.canvas
+    canvas.draw()
+    for i in range(max(repeat // 10, 3)):
+        add("figure_draw", _timed(canvas.draw))
+
+    # hover over widgets. Each motion changes the widget under the mouse.
+    targets = _hover_targets(wbm, scenario.wids, 50, rng)
+    if len(targets) > 1:
+        events = [MouseEvent("motion_notify_event", canvas, x, y)
+                  for _, x, y in targets]
+        for i in range(repeat):
+            add("hover", _timed(_process, canvas, events[i % len(events)]))
+
+    outside = MouseEvent("motion_notify_event", canvas, 1, 1)
+    inside = MouseEvent("motion_notify_event", canvas,
+                        targets[0][1], targets[0][2])
+    for i in range(repeat):
+        _process(canvas, inside)
+        add("hover_leave", _timed(_process, canvas, outside))
+    for i in range(repeat):
+        add("motion_outside", _timed(_process, canvas, outside))
+
+    # button press on buttons, which triggers the callback and a full redraw.
+    buttons = [(wid, x, y) for wid, x, y in targets
+               if isinstance(wbm.get_widget_by_id(wid), W.Button)]
+    if buttons:
+        events = [MouseEvent("button_press_event", canvas, x, y, button=1)
+                  for _, x, y in buttons]
+        for i in range(repeat):
+            add("button_press", _timed(_process, canvas,
+                                       events[i % len(events)]))
+
+    # draw_widgets without any dirty region redraws all.
+    for i in range(repeat):
+        add("draw_widgets", _timed(wbm.draw_widgets, outside))
+
+    def reinit():
+        c = scenario.containers[-1]
+        c.reinit_widget_box(wbm, c.get_widget_box().widgets_orig)
+
+    for i in range(max(repeat // 10, 3)):
+        add("reinit_widget_box", _timed(reinit))
+        canvas.draw()
+
+    # open the nested popups one by one, and close them all from the top.
+    for i in range(max(repeat // 10, 3) if scenario.popup_depth else 0):
+        for d in range(scenario.popup_depth):
+            x, y = _center(wbm, f"sub{d}")
+            ev = MouseEvent("button_press_event", canvas, x, y, button=1)
+            add("popup_open", _timed(_process, canvas, ev))
+        x, y = _center(wbm, "sub0")
+        ev = MouseEvent("button_press_event", canvas, x, y, button=1)
+        add("popup_close", _timed(_process, canvas, ev))
+
+    plt.close(fig)
+
+    return samples
+
+
+# Reporting
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return float("nan")
+    k = (len(sorted_values) - 1) * q / 100.
+    f = math.floor(k)
+    c = min(f + 1, len(sorted_values) - 1)
+    return sorted_values[f] + (sorted_values[c] - sorted_values[f]) * (k - f)
+
+
+def summarize(values):
+    v = sorted(values)
+    return dict(n=len(v), mean=sum(v) / len(v), p50=percentile(v, 50),
+                p90=percentile(v, 90), p99=percentile(v, 99), max=v[-1])
+
+
+def get_metadata():
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                             capture_output=True, text=True,
+                             check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        rev = None
+
+    return dict(git_revision=rev, python=platform.python_version(),
+                matplotlib=matplotlib.__version__,
+                platform=platform.platform())
+
+
+def print_results(results, baseline=None):
+    header = f"{'scenario':24s} {'operation':18s} {'n':>5s} {'p50':>9s} " \
+             f"{'p90':>9s} {'p99':>9s} {'max':>9s}"
+    if baseline is not None:
+        header += f" {'p50 base':>9s} {'ratio':>6s}"
+    print(header + "   (ms)")
+
+    for name, r in results.items():
+        for op, s in r["stats"].items():
+            line = (f"{name:24s} {op:18s} {s['n']:5d} {s['p50']:9.3f} "
+                    f"{s['p90']:9.3f} {s['p99']:9.3f} {s['max']:9.3f}")
+            if baseline is not None:
+                b = baseline.get(name, {}).get("stats", {}).get(op)
+                if b is not None:
+                    line += f" {b['p50']:9.3f} {s['p50'] / b['p50']:6.2f}"
+            print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--quick", action="store_true",
+                        help="run a smaller set of scenarios")
+    parser.add_argument("--repeat", type=int, default=None,
+                        help="number of samples per operation")
+    parser.add_argument("--filter", default=None,
+                        help="run the scenarios whose name contains this")
+    parser.add_argument("--json", default=None,
+                        help="save the results to the json file")
+    parser.add_argument("--compare", default=None,
+                        help="compare with the results in the json file")
+    args = parser.parse_args(argv)
+
+    repeat = args.repeat or (30 if args.quick else 100)
+
+    results = {}
+    for scenario in get_scenarios(args.quick):
+        if args.filter and args.filter not in scenario.name:
+            continue
+        samples = run_scenario(scenario, repeat)
+        results[scenario.name] = dict(
+            params=scenario.params(),
+            stats={op: summarize(v) for op, v in samples.items()})
+        print(f"done: {scenario.name}", file=sys.stderr)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+
+    print_results(results, baseline)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(dict(metadata=get_metadata(), repeat=repeat,
+                           results=results), f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
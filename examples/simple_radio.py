@@ -14,6 +14,11 @@ def test1():
         W.Radio("radio1", ["3", "4"], direction="h"),
         W.Radio("radio2", ["a", "b"], values=[1, 2]),
         W.Radio("radio3", ["1", "2"], tooltips=["tooltip 1", "tooltip 2"]),
+        # only 5 items are drawn at a time. Scroll with the wheel, the
+        # scrollbar or the up/down keys.
+        W.Radio("radio4", [f"item {i}" for i in range(1000)], max_visible=5),
+        W.Dropdown("dropdown", "Dataset",
+                   [f"dataset {i}" for i in range(2000)], max_visible=10),
     ]
 
     def cb(wb, ev, status):
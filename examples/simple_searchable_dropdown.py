@@ -0,0 +1,33 @@
+import matplotlib.pyplot as plt
+
+from mpl_widget_box import (widgets as W,
+                            install_widgets_simple)
+
+
+def main():
+
+    fig, ax = plt.subplots(num=2, clear=True)
+    l, = ax.plot([0, 1])
+
+    names = [f"{kind}_{i:04d}" for i in range(1000)
+             for kind in ["temperature", "pressure", "humidity"]]
+
+    widgets = [
+        W.Title("title", "Searchable Dropdown"),
+        # open the menu and type, e.g., "pre" or "0042".
+        W.SearchableDropdown("dataset", "dataset", names, match="substring"),
+    ]
+
+    def cb(wbm, ev, status):
+        print(ev, status)
+        if ev.wid == "dataset:select":
+            ax.set_title(status["dataset"]["value"])
+            wbm.draw_idle()
+
+    install_widgets_simple(ax, widgets, cb=cb, loc=2)
+
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,10 @@ def main():
                                value_tooltip_on=False,
                                value_label_on=True),
                AW.RangeSliderWidget("h", 0, 1, label="H"),
+               # a lighter slider without an Axes.
+               W.Slider("i", 0, 1, label="I", label_width=30),
+               W.Slider("j", 0, 10, valinit=2, valfmt="{:.0f}", label="J",
+                        label_width=30, callback_mode="release"),
                ]
 
     def cb(wbm, event, status):
@@ -0,0 +1,35 @@
+import matplotlib.pyplot as plt
+
+from mpl_widget_box import (widgets as W,
+                            install_widgets_simple)
+
+
+def main():
+
+    fig, ax = plt.subplots(num=2, clear=True)
+    l, = ax.plot([0, 1])
+
+    widgets = [
+        W.Title("title", "Text Entry"),
+        W.TextEntry("label", "line", label="Label", label_width=40),
+        W.TextEntry("title2", "", label="Title", label_width=40,
+                    callback_mode="release"),
+    ]
+
+    def cb(wbm, ev, status):
+        print(ev, status)
+        if ev.wid == "label":
+            l.set_label(status["label"]["text"])
+            ax.legend()
+            wbm.draw_idle()
+        elif ev.wid == "title2":
+            ax.set_title(status["title2"]["text"])
+            wbm.draw_idle()
+
+    install_widgets_simple(ax, widgets, cb=cb, loc=2)
+
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -43,3 +43,9 @@ def docs(session) -> None:
     install_with_constraints(session, "sphinx", "sphinx-rtd-theme",
                              "nbsphinx", "ipython", ".")
     session.run("sphinx-build", "docs", "docs/build")
+
+@nox.session(python="3.9")
+def benchmarks(session) -> None:
+    """Run the headless benchmarks. Arguments are passed to the script."""
+    session.install(".")
+    session.run("python", "benchmarks/bench_widget_box.py", *session.posargs)
@@ -64,6 +64,38 @@ You may pip instal directly from the github repo,
 
 __version__ = "0.1.0"
 
-from .widget_box import WidgetBoxManager, install_widgets_simple
-
 __all__ = ["WidgetBoxManager", "install_widgets_simple"]
+
+# The submodules (and matplotlib) are imported on the first access, so that
+# importing the package is cheap for the tools that only sometimes show the
+# widgets.
+_lazy_attrs = {
+    "WidgetBoxManager": "widget_box",
+    "install_widgets_simple": "widget_box",
+}
+
+
+def __getattr__(name):
+    import importlib
+
+    if name in _lazy_attrs:
+        module = importlib.import_module(f".{_lazy_attrs[name]}", __name__)
+        value = getattr(module, name)
+    elif not name.startswith("__"):
+        # the submodules, e.g., `mpl_widget_box.widgets`.
+        try:
+            value = importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as e:
+            if e.name != f"{__name__}.{name}":
+                raise
+            raise AttributeError(
+                f"module {__name__!r} has no attribute {name!r}") from None
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,180 @@
+"""
+Run the callback of the WidgetBoxManager off the GUI event loop, on a thread
+pool or an asyncio event loop (see `WidgetBoxManager.set_callback_executor`).
+
+The callback is given a snapshot of the status, as the widgets may change while
+it runs. When the callback completes, the result is handed back to the GUI
+thread by the canvas timer, and the figure is redrawn.
+
+For each wid, at most one callback runs at a time. When the callback of a wid
+is triggered while the previous one is still running, the policy of the wid
+decides what happens:
+
+    "queue" : run it after the running one (and any queued before it).
+    "drop" : drop it.
+    "latest" : run it after the running one, replacing any queued one.
+"""
+
+import asyncio
+import inspect
+import logging
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+_log = logging.getLogger(__name__)
+
+CALLBACK_POLICIES = ["queue", "drop", "latest"]
+
+
+def _call(callback, *args):
+    r = callback(*args)
+    if inspect.isawaitable(r):
+        r = asyncio.run(r)
+    return r
+
+
+async def _call_in_loop(callback, *args):
+    r = callback(*args)
+    if inspect.isawaitable(r):
+        r = await r
+    return r
+
+
+class AsyncCallbackDispatcher:
+    def __init__(self, wbm, executor="thread", on_done=None,
+                 poll_interval=0.02, policies=None, default_policy="queue"):
+        """
+        wbm : the WidgetBoxManager.
+        executor : "thread", an Executor or an asyncio event loop running in
+            another thread. "thread" creates a thread pool, which is shut down
+            by `close`.
+        on_done : called as ``on_done(wbm, e, result)`` on the GUI thread when
+            the callback completes.
+        poll_interval : interval of the canvas timer in seconds.
+        policies : a dictionary of wid to the policy.
+        """
+        self._wbm = wbm
+        self._own_executor = executor == "thread"
+        if self._own_executor:
+            executor = ThreadPoolExecutor(thread_name_prefix="mpl_widget_box")
+        elif not isinstance(executor, (Executor, asyncio.AbstractEventLoop)):
+            raise ValueError(f"unsupported executor: {executor}")
+
+        self._executor = executor
+        self._on_done = on_done
+        self._poll_interval = poll_interval
+        self.policies = {} if policies is None else policies
+        self.default_policy = default_policy
+
+        # wid -> (future, e) of the running callback, and the queued ones.
+        self._running = {}
+        self._queued = {}
+        self._timer = None
+
+    def submit(self, callback, e, status):
+        """
+        Run the callback, or queue it according to the policy of the wid.
+        Returns False if dropped.
+        """
+        key = e.wid
+        if key not in self._running:
+            self._start(key, callback, e, status)
+            return True
+
+        policy = self.policies.get(key, self.default_policy)
+        if policy == "drop":
+            return False
+        elif policy == "latest":
+            self._queued[key] = deque([(callback, e, status)])
+        else:
+            self._queued.setdefault(key, deque()).append((callback, e, status))
+
+        return True
+
+    def _start(self, key, callback, e, status):
+        args = (self._wbm, e, status)
+        if isinstance(self._executor, asyncio.AbstractEventLoop):
+            future = asyncio.run_coroutine_threadsafe(
+                _call_in_loop(callback, *args), self._executor)
+        else:
+            future = self._executor.submit(_call, callback, *args)
+
+        self._running[key] = (future, e)
+        self._start_timer()
+
+    def _start_timer(self):
+        if self._timer is None:
+            self._timer = self._wbm.fig.canvas.new_timer(
+                interval=max(int(self._poll_interval * 1000), 1))
+            self._timer.add_callback(self.process_pending)
+
+        self._timer.start()
+
+    def stop_timer(self):
+        "stop the timer. It restarts with the next callback."
+        if self._timer is not None:
+            self._timer.stop()
+
+    def has_pending(self):
+        return bool(self._running)
+
+    def process_pending(self, wait_all=False, timeout=None):
+        """
+        Hand the results of the completed callbacks to the GUI thread, and start
+        the queued ones. If *wait_all*, wait until all the callbacks, including
+        the queued ones, complete. Returns the number of completed callbacks.
+        """
+        n_done = 0
+        while True:
+            done = [(key, future, e) for key, (future, e) in self._running.items()
+                    if future.done()]
+
+            for key, future, e in done:
+                del self._running[key]
+                self._complete(future, e)
+                n_done += 1
+
+                queued = self._queued.get(key)
+                if queued:
+                    self._start(key, *queued.popleft())
+                    if not queued:
+                        del self._queued[key]
+
+            if not wait_all or not self._running:
+                break
+
+            finished, _ = wait([future for future, e in self._running.values()],
+                               timeout=timeout, return_when=FIRST_COMPLETED)
+            if not finished:
+                break
+
+        if not self._running:
+            self.stop_timer()
+
+        if n_done:
+            self._wbm.fig.canvas.draw_idle()
+
+        return n_done
+
+    def _complete(self, future, e):
+        wbm = self._wbm
+        with wbm.get_instrument().span("callback_done", wid=e.wid):
+            try:
+                result = future.result()
+            except Exception:
+                _log.exception("callback for %r failed", e.wid)
+                return
+
+            wbm._last_callback_return_value = result
+            if self._on_done is not None:
+                self._on_done(wbm, e, result)
+
+    def close(self, wait_all=True):
+        "process (or wait for) the pending callbacks and stop the timer."
+        if wait_all:
+            self.process_pending(wait_all=True)
+
+        self.stop_timer()
+
+        if self._own_executor:
+            self._executor.shutdown(wait=wait_all)
@@ -11,8 +11,10 @@ from matplotlib.widgets import TextBox, Slider, RangeSlider
 
 from .base_widget import BaseWidget
 from .widgets import Label, HWidgets, MouseOverEvent, WidgetBoxEvent
+from .widgets_impl import get_default_valfmt
 
 from ._abc import CompositeWidgetBase
+from .rate_limit import RateLimitedCall, RATE_LIMIT_MODES
 
 
 class OffsetBoxLocator:
@@ -116,10 +118,16 @@ class AxesWidget(BaseWidget):
 
         # self.ax.spines["left"].set_visible(False)
 
-    # Below two methods is to use this as a foreing widget.
+    # Below methods are to use this as a foreing widget.
     def purge_background(self):
         pass
 
+    def is_foreign_stale(self):
+        return self.ax.stale
+
+    def get_foreign_bbox(self, renderer):
+        return Bbox.union([self.get_window_extent(renderer), self.ax.bbox])
+
     def handle_event(self, event, parent=None):
         if event.name == "motion_notify_event":
             return self.handle_motion_notify(event, parent)
@@ -263,6 +271,9 @@ class TextAreaWidget(CompositeAxesWidgetBase):
     def _make_box(self, ax):
         _box = TextBox(ax, "", label_pad=0, initial=self._initial_text)
         # fixed_width=self._label_width)
+        _box.on_text_change(lambda text: self.axes_widget.touch_status())
+        self.axes_widget.touch_status()
+
         return _box
 
     def _get_status(self, box):
@@ -271,23 +282,7 @@ class TextAreaWidget(CompositeAxesWidgetBase):
 
 class SliderWidget(CompositeAxesWidgetBase):
     def _get_default_fmt(self, vmin, vmax):
-        # FIXME: there should be a better way. We may take a look at the
-        # ScalarTickFormatter.
-        dstep = abs(self._vmax - self._vmin) / 100.0
-        if dstep > 100:
-            valfmt = "{:.2e}"
-        elif dstep > 1.0:
-            valfmt = "{:.0f}"
-        elif dstep > 0.05:
-            valfmt = "{:.1f}"
-        elif dstep > 0.005:
-            valfmt = "{:.2f}"
-        elif dstep > 0.0005:
-            valfmt = "{:.3f}"
-        else:
-            valfmt = "{:e}"
-
-        return valfmt
+        return get_default_valfmt(vmin, vmax)
 
     def __init__(
         self,
@@ -305,7 +300,23 @@ class SliderWidget(CompositeAxesWidgetBase):
         value_overlay_on=True,
         value_label_on=False,
         overlay_alpha=0.6,
+        callback_mode="immediate",
+        callback_interval=0.1,
     ) -> None:
+        """
+        callback_mode : {"immediate", "latest", "throttle", "debounce", "release"}
+            How often the callback of the WidgetBoxManager is called while the
+            slider is dragged. "latest" calls once per iteration of the GUI
+            event loop, "throttle" calls at most once per
+            *callback_interval* seconds, "debounce" calls when the slider
+            stops for *callback_interval* seconds, and "release" calls only
+            when the mouse button is released. The value text is updated
+            regardless, and the callback is always called with the final
+            value when the mouse button is released.
+        """
+
+        if callback_mode not in RATE_LIMIT_MODES:
+            raise ValueError(f"unknown callback mode: {callback_mode}")
 
         axes_tooltip = "" if value_tooltip_on else None
 
@@ -335,6 +346,35 @@ class SliderWidget(CompositeAxesWidgetBase):
 
         self._overlay_alpha = overlay_alpha
 
+        self._callback_mode = callback_mode
+        self._callback_interval = callback_interval
+        self._rate_limited_callback = None
+        self._cid_release = None
+
+    def post_install(self, wbm):
+        canvas = wbm.fig.canvas
+        self._rate_limited_callback = RateLimitedCall(
+            self._trigger_callback, self._callback_mode,
+            self._callback_interval, new_timer=canvas.new_timer)
+        self._cid_release = canvas.mpl_connect("button_release_event",
+                                               self._on_release)
+
+        super().post_install(wbm)
+
+    def post_uninstall(self, wbm):
+        if self._rate_limited_callback is not None:
+            self._rate_limited_callback.cancel()
+        if self._cid_release is not None:
+            wbm.fig.canvas.mpl_disconnect(self._cid_release)
+            self._cid_release = None
+
+        super().post_uninstall(wbm)
+
+    def _on_release(self, event):
+        # the drag may end outside of the slider.
+        if self._rate_limited_callback is not None:
+            self._rate_limited_callback.flush()
+
     def cb(self, value):
         # if self.axes_widget.tooltip is not None:
         #     self.axes_widget.get_tooltip_textarea().set_text(self._vfmt.format(value))
@@ -344,11 +384,21 @@ class SliderWidget(CompositeAxesWidgetBase):
         #     self._value_label.set_label(self._vfmt.format(value))
 
         self.update_value(value)
+        self.axes_widget.touch_status()
+
+        limiter = self._rate_limited_callback
+        if limiter is None or not self._box.drag_active:
+            # e.g., the value is set programmatically.
+            if limiter is not None:
+                limiter.cancel()
+            self._trigger_callback()
+        else:
+            limiter.call()
 
-        status = self._wbm.get_named_status()
+    def _trigger_callback(self):
         e = WidgetBoxEvent(None, self.axes_widget.wid, auxinfo=None, callback_info=None)
 
-        self._wbm._callback(self._wbm, e, status)
+        self._wbm._trigger_callback(e)
 
     def _build_widgets(self):
 
@@ -401,6 +451,7 @@ class SliderWidget(CompositeAxesWidgetBase):
         _box.on_changed(self.cb)
 
         self.update_value(_box.valinit)
+        self.axes_widget.touch_status()
 
         return _box
 
@@ -415,6 +466,7 @@ class RangeSliderWidget(SliderWidget):
         _box.on_changed(self.cb)
 
         self.update_value(_box.valinit)
+        self.axes_widget.touch_status()
 
         return _box
 
@@ -449,3 +501,5 @@ class CompositeAxesWidget(CompositeAxesWidgetBase):
 
     def update_status(self, **kw):
         self._status.update(**kw)
+        if self.axes_widget is not None:
+            self.axes_widget.touch_status()
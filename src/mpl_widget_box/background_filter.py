@@ -0,0 +1,176 @@
+"""
+Built-in filters for the background saved by the WidgetBoxManager (see
+`WidgetBoxManager.set_background_filter`).
+
+The filters modify the buffer of the background (as returned by
+`canvas.copy_from_bbox`) in place through a numpy view, without making a copy
+of the whole buffer. Per-channel operations are done with a lookup table, and
+operations that mix the channels use scratch planes which are reused as long
+as the size of the background is unchanged.
+
+    wbm.set_background_filter(Desaturate(0.7))
+    wbm.set_background_filter([Grayscale(), Tint("w", 0.5)])
+"""
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from matplotlib.colors import to_rgb
+
+
+class BackgroundFilterBase(ABC):
+    def __call__(self, canvas, fig, background):
+        rgba = np.asarray(background)
+        if rgba.size:
+            self.apply(rgba)
+
+        return background
+
+    @abstractmethod
+    def apply(self, rgba):
+        """
+        Modifies the rgba array of shape (h, w, 4) and dtype uint8 in place.
+        """
+
+
+class _ScratchPlanes:
+    "a pool of uint16 planes of the same shape, reused between calls."
+
+    def __init__(self):
+        self._planes = []
+
+    def get(self, shape, n):
+        if not self._planes or self._planes[0].shape != shape:
+            self._planes = []
+        while len(self._planes) < n:
+            self._planes.append(np.empty(shape, dtype=np.uint16))
+
+        return self._planes[:n]
+
+
+def _apply_lut(channel, lut):
+    # mode="clip" lets numpy write to the output directly, without buffering.
+    np.take(lut, channel, out=channel, mode="clip")
+
+
+def _weighted_gray(rgba, out, tmp):
+    """
+    Store the luma of the rgba array, multiplied by 256, to `out`. The weights
+    are those of ITU-R 601 in 8-bit fixed point.
+    """
+    r, g, b = rgba[..., 0], rgba[..., 1], rgba[..., 2]
+    np.multiply(r, 77, out=out, dtype=np.uint16)
+    np.multiply(g, 150, out=tmp, dtype=np.uint16)
+    out += tmp
+    np.multiply(b, 29, out=tmp, dtype=np.uint16)
+    out += tmp
+
+
+class Tint(BackgroundFilterBase):
+    """
+    Blend the background toward the given color.
+
+    Parameters
+    ----------
+    color : color
+        The color to blend with.
+    amount : float
+        0 leaves the background unchanged and 1 fills it with the color.
+    """
+
+    def __init__(self, color="w", amount=0.5):
+        self.color = color
+        self.amount = amount
+
+        v = np.arange(256)
+        self._luts = [
+            np.round(v * (1 - amount) + 255 * c * amount).clip(0, 255).astype(np.uint8)
+            for c in to_rgb(color)
+        ]
+
+    def apply(self, rgba):
+        for i, lut in enumerate(self._luts):
+            _apply_lut(rgba[..., i], lut)
+
+
+class Dim(Tint):
+    """
+    Darken the background.
+
+    Parameters
+    ----------
+    amount : float
+        0 leaves the background unchanged and 1 makes it black.
+    """
+
+    def __init__(self, amount=0.5):
+        super().__init__("k", amount)
+
+
+class Desaturate(BackgroundFilterBase):
+    """
+    Blend the background toward its grayscale.
+
+    Parameters
+    ----------
+    amount : float
+        0 leaves the background unchanged and 1 makes it grayscale.
+    """
+
+    def __init__(self, amount=0.5):
+        self.amount = amount
+        self._k = int(round(np.clip(amount, 0, 1) * 256))
+        self._scratch = _ScratchPlanes()
+
+    def apply(self, rgba):
+        k = self._k
+        if k == 0:
+            return
+
+        gray, tmp = self._scratch.get(rgba.shape[:2], 2)
+        _weighted_gray(rgba, gray, tmp)
+
+        if k == 256:
+            gray >>= 8
+            for i in range(3):
+                np.copyto(rgba[..., i], gray, casting="unsafe")
+            return
+
+        # out = (c * (256 - k) + gray * k) / 256, in 16-bit integer.
+        gray >>= 8
+        gray *= k
+        for i in range(3):
+            c = rgba[..., i]
+            np.multiply(c, 256 - k, out=tmp, dtype=np.uint16)
+            tmp += gray
+            tmp >>= 8
+            np.copyto(c, tmp, casting="unsafe")
+
+
+class Grayscale(Desaturate):
+    "Convert the background to grayscale."
+
+    def __init__(self):
+        super().__init__(1.0)
+
+
+class FilterChain(BackgroundFilterBase):
+    """
+    Apply the filters in order. Any callable with the signature of
+    ``bg_filter(canvas, fig, background) -> background`` can be chained.
+    """
+
+    def __init__(self, filters):
+        self.filters = list(filters)
+
+    def __call__(self, canvas, fig, background):
+        for f in self.filters:
+            background = f(canvas, fig, background)
+
+        return background
+
+    def apply(self, rgba):
+        "apply the filters in place, which need to be BackgroundFilterBase."
+        for f in self.filters:
+            f.apply(rgba)
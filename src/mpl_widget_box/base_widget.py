@@ -1,13 +1,99 @@
+import itertools
+
+import numpy as np
+
 import matplotlib.transforms as mtransforms
 from matplotlib.offsetbox import PaddedBox
 from matplotlib.offsetbox import (
     AnnotationBbox,
+    OffsetBox,
     TextArea as _TextArea,
 )
 
 
+# A global counter for the status versions. As versions are taken from a
+# single counter, they can be compared against a mark to see if the status has
+# changed since.
+_status_version_counter = itertools.count(1)
+
+
+def next_status_version():
+    return next(_status_version_counter)
+
+
+# bumped whenever a layout is invalidated, so that the geometry of the widgets
+# can be compared against a mark (e.g., for the hit-test index).
+_layout_generation = 0
+
+
+def get_layout_generation():
+    return _layout_generation
+
+
+class LayoutCacheMixin:
+    """
+    Memoize the layout (the bbox and the offsets of the children) of an
+    offsetbox, keyed by the dpi of the renderer. Any change that affects the
+    layout need to call `invalidate_layout`, which marks the box and its
+    ancestors dirty.
+
+    Other offsetboxes in the subtree (e.g., matplotlib's TextArea) do not
+    call `invalidate_layout`. Their bboxes are recorded with the layout, and
+    the layout is invalidated if any of them has changed.
+    """
+
+    _layout_cache = None
+    # the box that last did the layout of this box as its child.
+    _layout_parent = None
+
+    def _get_cached_layout(self, renderer):
+        cache = self._layout_cache
+        if cache is not None and cache[0] == renderer.dpi:
+            for box, bounds in cache[2]:
+                if box.get_bbox(renderer).bounds != bounds:
+                    self.invalidate_layout()
+                    return None
+            return cache[1]
+
+        return None
+
+    def _set_cached_layout(self, renderer, layout):
+        # (box, bounds of its bbox) of the offsetboxes in the subtree that are
+        # not LayoutCacheMixin.
+        foreign_boxes = []
+        for c in self.get_children():
+            if isinstance(c, LayoutCacheMixin):
+                c._layout_parent = self
+                if c._layout_cache is not None:
+                    foreign_boxes.extend(c._layout_cache[2])
+            elif isinstance(c, OffsetBox):
+                foreign_boxes.append((c, c.get_bbox(renderer).bounds))
+
+        self._layout_cache = (renderer.dpi, layout, foreign_boxes)
+
+        return layout
+
+    def invalidate_layout(self):
+        global _layout_generation
+        _layout_generation += 1
+        self._layout_cache = None
+
+        # If the parent is already dirty, so are its ancestors.
+        node = self._layout_parent
+        while node is not None and node._layout_cache is not None:
+            node._layout_cache = None
+            node = node._layout_parent
+
+    def set_visible(self, b):
+        super().set_visible(b)
+        self.invalidate_layout()
+
+
 # TextArea with optional fixed width
-class TextArea(_TextArea):
+class TextArea(LayoutCacheMixin, _TextArea):
+    # bumped whenever the text changes.
+    _status_version = 0
+
     def __init__(self, s, textprops=None, multilinebaseline=False):
         super().__init__(s, textprops=textprops, multilinebaseline=multilinebaseline)
 
@@ -19,6 +105,40 @@ class TextArea(_TextArea):
             else:
                 raise KeyError(f"no set_f{k} method in {t}")
 
+        self.invalidate_layout()
+
+    def set_text(self, s):
+        super().set_text(s)
+        self._status_version = next_status_version()
+        self.invalidate_layout()
+
+    def set_multilinebaseline(self, t):
+        super().set_multilinebaseline(t)
+        self.invalidate_layout()
+
+    def get_bbox(self, renderer):
+        bbox = self._get_cached_layout(renderer)
+        if bbox is None:
+            bbox = self._set_cached_layout(renderer, super().get_bbox(renderer))
+
+        return bbox
+
+
+class RenderCache:
+    """
+    The pixels of a widget as drawn on the canvas. *key* is a tuple of the
+    widget state, dpi and the outer bbox. *region* is the slices of the canvas
+    buffer around the widget, whose pixels are *background* before the widget
+    is drawn and *image* after. The image is only drawn over the same
+    background, so that the result is identical to drawing the widget.
+    """
+
+    def __init__(self, key, region, background, image):
+        self.key = key
+        self.region = region
+        self.background = background
+        self.image = image
+
 
 # Widgets are derived from PaddedBox, which is basically an offsetbox.
 
@@ -27,7 +147,7 @@ class TextArea(_TextArea):
 # lost in the middle which does not support `draw` with return vlaues.
 
 
-class BaseWidget(PaddedBox):
+class BaseWidget(LayoutCacheMixin, PaddedBox):
     def __init__(
         self,
         child,
@@ -38,6 +158,7 @@ class BaseWidget(PaddedBox):
         expand=True,
         fixed_width=None,
         align="",
+        render_cache=False,
     ):
         super().__init__(child, pad=pad, draw_frame=draw_frame, patch_attrs=patch_attrs)
 
@@ -48,17 +169,65 @@ class BaseWidget(PaddedBox):
         self._align = align
         self._fixed_width = fixed_width
 
+        self._render_cache_on = render_cache
+        self._render_cache = None
+        # margin in points around the outer bbox, for shadows and frames.
+        self.render_cache_margin = 5
+
+    def set_render_cache(self, b):
+        """
+        Turn on or off the render cache. When on, the pixels of the widget are
+        kept once it is drawn, and are copied back while its state, dpi,
+        location and the background under it are unchanged. This is meant for
+        static widgets like labels and buttons.
+        """
+        self._render_cache_on = b
+        self._render_cache = None
+
+    def invalidate_render_cache(self):
+        self._render_cache = None
+
+    def _get_render_cache_state(self):
+        # Any change of the widget which is not captured here needs to call
+        # invalidate_render_cache.
+        return (self._mouse_on,)
+
+    def set_visible(self, b):
+        super().set_visible(b)
+        self.invalidate_render_cache()
+
+    # None means that the widget does not track the changes of its status, and
+    # its status will be recomputed whenever requested.
+    _status_version = None
+
+    def get_status_version(self):
+        """
+        Returns a version number which increases whenever the return value of
+        `get_status` may change, or None if unknown. Subclasses that override
+        `get_status` need to override this as well.
+        """
+        return self._status_version
+
+    def touch_status(self):
+        "mark that the status of the widget has changed."
+        self._status_version = next_status_version()
+
     def set_fixed_width(self, width):
         self._fixed_width = width
+        self.invalidate_layout()
 
     def _get_bbox_and_child_offsets(self, renderer):
+        layout = self._get_cached_layout(renderer)
+        if layout is not None:
+            return layout
+
         bbox, offsets = super()._get_bbox_and_child_offsets(renderer)
 
         w = bbox.width
         if self._fixed_width is not None:
             w = renderer.points_to_pixels(self._fixed_width + 2 * self.pad)
             bbox = bbox.from_bounds(bbox.x0, bbox.y0, w, bbox.height)
-        return bbox, offsets
+        return self._set_cached_layout(renderer, (bbox, offsets))
 
     # These two methods may be irrelavant w/ _get_bbox_and_child_offsets
 
@@ -152,6 +321,52 @@ class BaseWidget(PaddedBox):
             return [self.draw_tooltip]
 
     def draw_with_outer_bbox(self, renderer, outer_bbox):
+        if self._render_cache_on and hasattr(renderer, "buffer_rgba"):
+            return self._draw_with_render_cache(renderer, outer_bbox)
+
+        return self._draw_with_outer_bbox(renderer, outer_bbox)
+
+    def _get_render_cache_region(self, renderer, buf, outer_bbox):
+        "the slices of the buffer around the outer bbox, with the margin."
+        margin = renderer.points_to_pixels(self.render_cache_margin)
+        h, w = buf.shape[:2]
+        x0 = max(int(np.floor(outer_bbox.x0 - margin)), 0)
+        x1 = min(int(np.ceil(outer_bbox.x1 + margin)), w)
+        y0 = max(int(np.floor(outer_bbox.y0 - margin)), 0)
+        y1 = min(int(np.ceil(outer_bbox.y1 + margin)), h)
+
+        # the rows of the buffer start from the top.
+        return slice(h - y1, h - y0), slice(x0, x1)
+
+    def _draw_with_render_cache(self, renderer, outer_bbox):
+        buf = np.asarray(renderer.buffer_rgba())
+        key = (self._get_render_cache_state(), renderer.dpi,
+               tuple(outer_bbox.bounds))
+
+        cache = self._render_cache
+        if cache is not None and cache.key == key:
+            pixels = buf[cache.region]
+            if np.array_equal(pixels, cache.background):
+                pixels[...] = cache.image
+
+                self.stale = False
+
+                if self.tooltip is not None and self._mouse_on:
+                    return [self.draw_tooltip]
+                return []
+
+        if callable(self._offset):
+            return self._draw_with_outer_bbox(renderer, outer_bbox)
+
+        region = self._get_render_cache_region(renderer, buf, outer_bbox)
+        background = buf[region].copy()
+        delayed_draws = self._draw_with_outer_bbox(renderer, outer_bbox)
+        self._render_cache = RenderCache(key, region, background,
+                                         buf[region].copy())
+
+        return delayed_draws
+
+    def _draw_with_outer_bbox(self, renderer, outer_bbox):
         # a copy of PaddedBox.draw to use draw_frame_with_outer_bbox to draw frame
 
         # docstring inherited
@@ -190,10 +405,21 @@ class BaseWidget(PaddedBox):
             return self.handle_motion_notify(event, parent)
         elif event.name == "button_press_event":
             return self.handle_button_press(event, parent)
+        elif event.name == "scroll_event":
+            return self.handle_scroll(event, parent)
+        elif event.name == "key_press_event":
+            return self.handle_key_press(event, parent)
 
     def handle_button_press(self, event, parent=None):
         return None
 
+    def handle_scroll(self, event, parent=None):
+        return None
+
+    def handle_key_press(self, event, parent=None):
+        "key press while the mouse is over the widget, without a key focus."
+        return None
+
     def handle_motion_notify(self, event, parent=None):
         return None
 
@@ -7,6 +7,7 @@ from .fa_icons import fa_icons
 
 from .fa_helper import FontAwesome
 from .base_widget import TextArea
+from .instrument import traced_process_event
 
 get_icon_fontprop = FontAwesome.get_fontprop
 
@@ -68,6 +69,7 @@ class TitleCollapsableBase(CompositeWidgetBase):
     def expand_widgets(self, wbm, wc):
         pass
 
+    @traced_process_event
     def process_event(self, wbm: WidgetBoxManager, ev: W.WidgetBoxEvent, status: dict):
         if ev.wid == f"{self.wid}:btn":
             wc = ev.container_info["container"]
@@ -99,6 +101,7 @@ class TitleCollapsable(TitleCollapsableBase):
         self._widgets_orig = wb.widgets_orig
 
         self._button.get_children()[0] = self.button_expand
+        self._button.invalidate_layout()
 
         self._button.box.set_text(self.EXPAND)
         wc.reinit_widget_box(wbm, widgets)
@@ -148,6 +151,7 @@ class TitleCollapsableWithVisibility(TitleCollapsableBase):
         self._is_collapsed = False
         self._update_button()
 
+    @traced_process_event
     def process_event(self, wbm: WidgetBoxManager, ev: W.WidgetBoxEvent, status: dict):
 
         if ev.wid == "@installed":
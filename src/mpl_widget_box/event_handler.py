@@ -1,6 +1,14 @@
 import logging
 
 
+def get_event_area(w, renderer):
+    "returns the bbox of the widget that responds to the mouse events."
+    if hasattr(w, "get_event_area"):
+        return w.get_event_area(renderer)
+    else:
+        return w.get_window_extent(renderer)
+
+
 class EventHandlerBase:
     def get_child_widgets(self):
         return []
@@ -15,10 +23,7 @@ class EventHandlerBase:
             if not b.get_visible():
                 # we skip invisible widgets
                 continue
-            if hasattr(b, "get_event_area"):
-                w = b.get_event_area(renderer)
-            else:
-                w = b.get_window_extent(renderer)
+            w = get_event_area(b, renderer)
             if w.contains(mpl_event.x, mpl_event.y):
                 return i, b
 
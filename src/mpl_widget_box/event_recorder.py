@@ -0,0 +1,190 @@
+"""
+Record the canvas events handled by the WidgetBoxManager and replay them on
+another (e.g., headless Agg) figure with the same widgets.
+
+The events are saved as json lines, gzipped if the file name ends with ".gz".
+The first line is a header with the canvas size, and each of the following
+lines is an event with its time (in seconds, from the start of the recording)
+and pixel coordinates::
+
+    {"e": "header", "version": 1, "width": 640, "height": 480, "dpi": 100.0}
+    {"t": 0.0312, "e": "motion", "x": 120.0, "y": 300.5}
+    {"t": 0.2501, "e": "press", "x": 120.0, "y": 300.5, "b": 1}
+    {"t": 0.4012, "e": "release", "x": 130.0, "y": 300.5, "b": 1}
+    {"t": 0.9102, "e": "key", "x": 120.0, "y": 300.5, "k": " "}
+    {"t": 0.9530, "e": "scroll", "x": 120.0, "y": 300.5, "s": -1}
+    {"t": 1.0020, "e": "draw"}
+
+To record, ::
+
+    wbm.start_recording("session.jsonl.gz")
+    ...
+    wbm.stop_recording()
+
+and to replay, with the same widgets installed, ::
+
+    timings = replay_events(wbm, "session.jsonl.gz")
+"""
+
+import gzip
+import json
+import time
+
+from matplotlib.backend_bases import MouseEvent, KeyEvent
+
+FORMAT_VERSION = 1
+
+_EVENT_KINDS = {
+    "motion_notify_event": "motion",
+    "button_press_event": "press",
+    "button_release_event": "release",
+    "key_press_event": "key",
+    "scroll_event": "scroll",
+    "draw_event": "draw",
+}
+
+
+def _open(file, mode):
+    if hasattr(file, "write" if "w" in mode else "read"):
+        return file, False
+    if str(file).endswith(".gz"):
+        return gzip.open(file, mode + "t", encoding="utf-8"), True
+    return open(file, mode, encoding="utf-8"), True
+
+
+class EventRecorder:
+    def __init__(self, file, canvas):
+        """
+        file : a file name or a writable text file object.
+        canvas : the canvas of the events, whose size is saved in the header.
+        """
+        self._file, self._own_file = _open(file, "w")
+        self._t0 = time.perf_counter()
+
+        width, height = canvas.get_width_height()
+        self._write(dict(e="header", version=FORMAT_VERSION, width=width,
+                         height=height, dpi=canvas.figure.dpi))
+
+    def _write(self, d):
+        self._file.write(json.dumps(d, separators=(",", ":")))
+        self._file.write("\n")
+
+    def record(self, event):
+        kind = _EVENT_KINDS.get(event.name)
+        if kind is None:
+            return
+
+        d = dict(t=round(time.perf_counter() - self._t0, 6), e=kind)
+        if kind != "draw":
+            d["x"], d["y"] = event.x, event.y
+        if kind in ["press", "release"]:
+            d["b"] = None if event.button is None else int(event.button)
+            if event.dblclick:
+                d["dbl"] = True
+        elif kind == "key":
+            d["k"] = event.key
+        elif kind == "scroll":
+            d["s"] = event.step
+
+        self._write(d)
+
+    def close(self):
+        if self._own_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+def read_events(file):
+    """
+    returns the header and the list of recorded events.
+    """
+    f, own_file = _open(file, "r")
+    try:
+        records = [json.loads(l) for l in f if l.strip()]
+    finally:
+        if own_file:
+            f.close()
+
+    if not records or records[0].get("e") != "header":
+        raise ValueError("not a recorded event file")
+
+    header = records[0]
+    if header["version"] > FORMAT_VERSION:
+        raise ValueError(f"unsupported version: {header['version']}")
+
+    return header, records[1:]
+
+
+def replay_events(wbm, file, realtime=False, speed=1.0):
+    """
+    Feed the recorded events to the WidgetBoxManager. The motion and button
+    press events go to `handle_event_n_draw`, the button release events to
+    `on_button_release`, the scroll events to `on_scroll`, the key events to
+    `on_key`, and the draw events
+    redraw the canvas (which calls `save_n_draw`).
+
+    Parameters
+    ----------
+    wbm : WidgetBoxManager
+        The manager with the same widgets as the recorded one installed.
+    file : str or file object
+        The recorded events.
+    realtime : bool
+        If True, the events are replayed with the recorded timing (scaled by
+        *speed*). Otherwise, they are replayed as fast as possible.
+
+    Returns
+    -------
+    list of (kind, elapsed time in ms) of each event.
+    """
+    header, records = read_events(file)
+
+    canvas = wbm.fig.canvas
+    if canvas.get_width_height() != (header["width"], header["height"]):
+        # The pixel coordinates would not match the widgets.
+        raise ValueError(
+            f"the canvas size {canvas.get_width_height()} differs from the "
+            f"recorded one {(header['width'], header['height'])}")
+
+    timings = []
+    t_start = time.perf_counter()
+    for r in records:
+        kind = r["e"]
+        if kind == "press":
+            event = MouseEvent("button_press_event", canvas, r["x"], r["y"],
+                               button=r["b"], dblclick=r.get("dbl", False))
+            handler = wbm.handle_event_n_draw
+        elif kind == "release":
+            event = MouseEvent("button_release_event", canvas, r["x"], r["y"],
+                               button=r["b"])
+            handler = wbm.on_button_release
+        elif kind == "motion":
+            event = MouseEvent("motion_notify_event", canvas, r["x"], r["y"])
+            handler = wbm.handle_event_n_draw
+        elif kind == "scroll":
+            event = MouseEvent("scroll_event", canvas, r["x"], r["y"],
+                               step=r["s"])
+            handler = wbm.on_scroll
+        elif kind == "key":
+            event = KeyEvent("key_press_event", canvas, r["k"], r["x"], r["y"])
+            handler = wbm.on_key
+        elif kind == "draw":
+            event = None
+            handler = canvas.draw
+        else:
+            continue
+
+        if realtime:
+            delay = r["t"] / speed - (time.perf_counter() - t_start)
+            if delay > 0:
+                time.sleep(delay)
+
+        t0 = time.perf_counter()
+        if event is None:
+            handler()
+        else:
+            handler(event)
+        timings.append((kind, (time.perf_counter() - t0) * 1e3))
+
+    return timings
@@ -4,9 +4,7 @@ from matplotlib.font_manager import FontManager, FontProperties
 # import fontawesome
 import fontawesomefree
 
-from matplotlib.offsetbox import (
-    TextArea,
-)
+from .base_widget import TextArea
 
 __all__ = ["FontAwesome", "get_fa_textarea"]
 
@@ -14,8 +12,13 @@ __all__ = ["FontAwesome", "get_fa_textarea"]
 class FontAwesome:
     root = Path(fontawesomefree.__path__[0])
     fontname_dict = dict(regular="fa-regular-400.ttf", solid="fa-solid-900.ttf")
-    ymlpath = root / "static" / "fontawesomefree" / "metadata" / "icons.yml"
+    metadata_dir = root / "static" / "fontawesomefree" / "metadata"
+    ymlpath = metadata_dir / "icons.yml"
+    # name -> character, of the icons used by the package (see fa_icons.py).
     icons = {}
+    # name -> character, of the other icons found in the index so far.
+    _icon_cache = {}
+    _index = None
 
     @classmethod
     def get_fontprop(cls, family="solid", size=11):
@@ -26,6 +29,26 @@ class FontAwesome:
 
         return fontprop
 
+    @classmethod
+    def get_icon_index(cls):
+        "returns the IconIndex of all the icons, which is cached on disk."
+        if cls._index is None:
+            from .fa_index import load_icon_index
+
+            cls._index = load_icon_index(str(cls.metadata_dir))
+        return cls._index
+
+    @classmethod
+    def get_icon(cls, icon_name, default=None):
+        "returns the character of the icon."
+        char = cls.icons.get(icon_name) or cls._icon_cache.get(icon_name)
+        if char is None:
+            char = cls.get_icon_index().get(icon_name)
+            if char is None:
+                return default
+            cls._icon_cache[icon_name] = char
+        return char
+
     @classmethod
     def load_icons_yaml(cls):
         import yaml
@@ -55,13 +78,10 @@ class FontAwesome:
         return icons
 
 
-# While it would be good to generate the fa_icons dictionary by parsing the
-# yaml file included in the fontawesomefree package, reading the yaml file
-# takes more than I expected. Using ryml improves the reading speed, but it's
-# python interface seems to be still in development at this stage. We used to
-# use fontawesome package, but its contents seems outdated. For now, we
-# hardcode the unicode characters that are used in the package. We should think
-# about better way for it.
+# The icons used by the package are hardcoded in fa_icons.py, so that the
+# widgets do not need the index of all the icons. Other icons are looked up in
+# the index (see fa_index.py), which is built from the metadata of the
+# fontawesomefree package once and cached on disk.
 
 if __name__ != "__main__":
     # we do not want to import fa_icons if this file is executed to create the
@@ -81,7 +101,12 @@ def get_fa_textarea(
     assert family in ["regular", "solid"]
     fontprop = FontAwesome.get_fontprop(family=family, size=size)
 
-    char = FontAwesome.icons.get(icon_name, icon_name)
+    # the icon_name can be the character itself, which is used without
+    # loading the index of the icons.
+    if len(icon_name) <= 1 or not icon_name.isascii():
+        char = icon_name
+    else:
+        char = FontAwesome.get_icon(icon_name, icon_name)
     button = TextArea(
         char,
         textprops=dict(fontproperties=fontprop, color=color),
@@ -0,0 +1,177 @@
+"""
+An index of all the FontAwesome icons (and their aliases) of the installed
+fontawesomefree package, e.g., for `get_fa_textarea`.
+
+Reading the metadata of the icons takes a while (more than a half second for
+icons.yml with PyYAML). The index is thus built once and cached on disk as a
+table of (name, codepoint) sorted by the name, a .npy file that is memory
+mapped. An icon is then found by a binary search over the mapped names. The
+cache file is named after the version of fontawesomefree and the mtime of the
+metadata, so that it is rebuilt when either changes. The cache directory is
+$MPL_WIDGET_BOX_CACHE_DIR, or mpl_widget_box under $XDG_CACHE_HOME (or
+~/.cache).
+"""
+
+import glob
+import json
+import os
+
+import numpy as np
+
+_CACHE_PREFIX = "fa_icons-"
+
+
+def get_cache_dir():
+    d = os.environ.get("MPL_WIDGET_BOX_CACHE_DIR")
+    if d:
+        return os.path.expanduser(d)
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(root, "mpl_widget_box")
+
+
+def _get_version(metadata_dir):
+    "returns the version of fontawesomefree that has the metadata."
+    # importlib.metadata takes tens of ms to find the distribution, so the
+    # dist-info next to the package is tried first.
+    site_dir = os.path.abspath(os.path.join(metadata_dir, *[os.pardir] * 4))
+    dist_infos = glob.glob(os.path.join(site_dir,
+                                        "fontawesomefree-*.dist-info"))
+    if len(dist_infos) == 1:
+        return os.path.basename(dist_infos[0])[len("fontawesomefree-"):
+                                               -len(".dist-info")]
+
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:
+        return "unknown"
+    try:
+        return version("fontawesomefree")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def read_icons(metadata_dir):
+    """
+    returns the list of (name, codepoint) of the icons and their aliases, read
+    from icons.json (or icons.yml, which needs PyYAML) in the directory.
+    """
+    json_path = os.path.join(metadata_dir, "icons.json")
+    if os.path.exists(json_path):
+        with open(json_path, encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        import yaml
+
+        with open(os.path.join(metadata_dir, "icons.yml"),
+                  encoding="utf-8") as f:
+            data = yaml.load(f, Loader=getattr(yaml, "CLoader", yaml.Loader))
+
+    icons = {}
+    aliases = {}
+    for name, v in data.items():
+        code = int(v["unicode"], 16)
+        icons[str(name)] = code
+        for alias in (v.get("aliases") or {}).get("names", []):
+            aliases[alias] = code
+
+    # the names of the icons take precedence over the aliases.
+    aliases.update(icons)
+    return list(aliases.items())
+
+
+def build_table(icons):
+    "returns the structured array of (name, code), sorted by the name."
+    icons = sorted((name.encode("ascii"), code) for name, code in icons)
+    width = max((len(name) for name, _ in icons), default=1)
+    return np.array(icons, dtype=[("name", f"S{width}"), ("code", "<u4")])
+
+
+class IconIndex:
+    def __init__(self, table):
+        """
+        table : the structured array of (name, code) sorted by the name, which
+            may be memory mapped.
+        """
+        self._table = table
+        self._names = table["name"]
+        self._width = table.dtype["name"].itemsize
+
+    def __len__(self):
+        return len(self._table)
+
+    def __contains__(self, name):
+        return self.get_code(name) is not None
+
+    def get_code(self, name):
+        "returns the codepoint of the icon, or None."
+        try:
+            key = name.encode("ascii")
+        except UnicodeEncodeError:
+            return None
+        if not key or len(key) > self._width:
+            return None
+
+        i = int(np.searchsorted(self._names, key))
+        if i < len(self._names) and self._names[i] == key:
+            return int(self._table["code"][i])
+        return None
+
+    def get(self, name, default=None):
+        "returns the character of the icon."
+        code = self.get_code(name)
+        return default if code is None else chr(code)
+
+    def names(self):
+        return [n.decode("ascii") for n in self._names]
+
+
+def _get_cache_file(metadata_dir, cache_dir):
+    json_path = os.path.join(metadata_dir, "icons.json")
+    if not os.path.exists(json_path):
+        json_path = os.path.join(metadata_dir, "icons.yml")
+    mtime = os.stat(json_path).st_mtime_ns
+    version = _get_version(metadata_dir)
+    return os.path.join(cache_dir, f"{_CACHE_PREFIX}{version}-{mtime}.npy")
+
+
+def _load_table(cache_file):
+    try:
+        table = np.load(cache_file, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    if table.dtype.names != ("name", "code"):
+        return None
+    return table
+
+
+def _save_table(table, cache_file):
+    cache_dir = os.path.dirname(cache_file)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # write to a temporary file first, as other processes may read it.
+    tmp = f"{cache_file}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, table)
+    # The caches of the other versions are kept, as they may be used by other
+    # environments.
+    os.replace(tmp, cache_file)
+
+
+def load_icon_index(metadata_dir, cache_dir=None):
+    """
+    returns the IconIndex of the icons in the metadata directory of
+    fontawesomefree, from the cache if it is valid. If the cache directory is
+    not writable, the index is built in memory.
+    """
+    cache_dir = get_cache_dir() if cache_dir is None else cache_dir
+    cache_file = _get_cache_file(metadata_dir, cache_dir)
+
+    table = _load_table(cache_file)
+    if table is None:
+        table = build_table(read_icons(metadata_dir))
+        try:
+            _save_table(table, cache_file)
+        except OSError:
+            pass
+
+    return IconIndex(table)
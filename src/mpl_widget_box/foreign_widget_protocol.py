@@ -11,3 +11,27 @@ class ForeignWidgetProtocol(Protocol):
 
     def purge_background(self):
         ...
+
+
+class DirtyTrackingForeignWidgetProtocol(ForeignWidgetProtocol, Protocol):
+    """
+    An optional extension of ForeignWidgetProtocol. When the widgets are
+    partially redrawn, the WidgetBoxManager purges and redraws only the foreign
+    widgets that are stale or overlap with the redrawn region. Foreign widgets
+    without these methods are purged and redrawn with every redraw.
+    """
+
+    def is_foreign_stale(self):
+        "True if the widget has changed since it was last drawn."
+        ...
+
+    def get_foreign_bbox(self, renderer):
+        """
+        The bbox in display coordinates which covers what the widget draws
+        (including what it drew last time), and the background it saves.
+        """
+        ...
+
+
+def is_dirty_tracking(w):
+    return hasattr(w, "is_foreign_stale") and hasattr(w, "get_foreign_bbox")
@@ -0,0 +1,96 @@
+"""
+A spatial index of event areas, used by the WidgetBoxManager to find the
+widget under the mouse without walking every container.
+
+The index is a uniform grid over window-space bboxes. Entries are inserted in
+the order of their priority (i.e., the zorder is already resolved by the
+caller), so that a query returns the matching items in the order they should
+receive the event.
+"""
+
+import math
+
+from matplotlib.transforms import Bbox
+
+
+class UniformGridIndex:
+    def __init__(self, entries, cell_size=None):
+        """
+        entries : list of (bbox, item) in the order of priority.
+        cell_size : size of the grid cell in pixels. If None, it is chosen from
+            the union of bboxes and the number of entries.
+        """
+        self._entries = [(bb, item) for bb, item in entries
+                         if bb is not None and bb.width >= 0 and bb.height >= 0]
+
+        if not self._entries:
+            self.union = None
+            self._cells = {}
+            return
+
+        self.union = Bbox.union([bb for bb, _ in self._entries])
+
+        if cell_size is None:
+            n = len(self._entries)
+            area = max(self.union.width * self.union.height, 1.)
+            # roughly one entry per cell.
+            cell_size = max(math.sqrt(area / n), 8.)
+
+        self._cell_size = cell_size
+        self._x0, self._y0 = self.union.x0, self.union.y0
+
+        cells = {}
+        for i, (bb, item) in enumerate(self._entries):
+            i0, j0 = self._get_cell(bb.x0, bb.y0)
+            i1, j1 = self._get_cell(bb.x1, bb.y1)
+            for ii in range(i0, i1 + 1):
+                for jj in range(j0, j1 + 1):
+                    cells.setdefault((ii, jj), []).append(i)
+
+        self._cells = cells
+
+    def _get_cell(self, x, y):
+        return (int((x - self._x0) // self._cell_size),
+                int((y - self._y0) // self._cell_size))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def contains(self, x, y):
+        "quick check if (x, y) is inside the union of all bboxes."
+        return self.union is not None and self.union.contains(x, y)
+
+    def query(self, x, y):
+        """
+        returns a list of items whose bbox contains (x, y), in the order of
+        priority.
+        """
+        if not self.contains(x, y):
+            return []
+
+        candidates = self._cells.get(self._get_cell(x, y), [])
+        return [self._entries[i][1] for i in candidates
+                if self._entries[i][0].contains(x, y)]
+
+
+class EventAreaIndex:
+    """
+    Holds two grids: one for the boxes of the widget-boxes and the other for
+    the event areas of the (flattened) widgets.
+    """
+
+    def __init__(self, box_entries, widget_entries):
+        self.boxes = UniformGridIndex(box_entries)
+        self.widgets = UniformGridIndex(widget_entries)
+
+    def inside(self, x, y):
+        "check if (x, y) is located inside any of the widget-boxes"
+        if x is None or y is None:
+            return False
+        return bool(self.boxes.query(x, y))
+
+    def widgets_at(self, x, y):
+        "returns a list of (container, widget-box, widget) under (x, y)"
+        if x is None or y is None:
+            return []
+        return self.widgets.query(x, y)
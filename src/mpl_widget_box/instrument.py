@@ -0,0 +1,300 @@
+"""
+Timing instrumentation of the WidgetBoxManager.
+
+The manager times its phases (hit-testing, callback, status, layout, drawing,
+blit, ...) through an instrument. The default is the `NullInstrument`, whose
+spans do nothing. `PhaseStats` keeps the durations in rolling windows per
+event type and per container::
+
+    wbm.enable_instrumentation()
+    ...
+    wbm.get_phase_stats()["by_event"]["draw"]["motion_notify_event"]
+    # {'count': 120, 'mean': 3.1, 'p50': 2.9, 'p90': 4.2, 'p99': 6.0, 'max': 6.3}
+
+Spans may be nested, e.g., the "callback" phase includes the "status" phase.
+Durations are in ms.
+
+`TraceInstrument` records the spans as a timeline in the trace event format,
+which can be opened with Perfetto (https://ui.perfetto.dev) or
+chrome://tracing::
+
+    wbm.start_trace()
+    ...
+    wbm.stop_trace("widgets.trace.json")
+"""
+
+import functools
+import json
+import os
+import threading
+from collections import deque, OrderedDict
+from time import perf_counter
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullInstrument:
+    enabled = False
+
+    def begin_event(self, event_type):
+        pass
+
+    def span(self, phase, container=None, **args):
+        return _NULL_SPAN
+
+
+NULL_INSTRUMENT = NullInstrument()
+
+
+def get_container_label(c):
+    "a label to identify the container in the stats and traces."
+    if c is None:
+        return None
+    return getattr(c, "label", None) or f"{type(c).__name__}@{id(c):x}"
+
+
+class _Span:
+    __slots__ = ("_instrument", "_phase", "_container", "_t0")
+
+    def __init__(self, instrument, phase, container):
+        self._instrument = instrument
+        self._phase = phase
+        self._container = container
+
+    def __enter__(self):
+        self._t0 = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._instrument.add(self._phase, self._container,
+                             (perf_counter() - self._t0) * 1e3)
+        return False
+
+
+class RollingWindow:
+    "keeps the last *size* samples, and the total count and sum."
+
+    __slots__ = ("samples", "count", "total")
+
+    def __init__(self, size):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+        self.total = 0.
+
+    def add(self, v):
+        self.samples.append(v)
+        self.count += 1
+        self.total += v
+
+    def summary(self):
+        v = sorted(self.samples)
+        n = len(v)
+
+        def percentile(q):
+            return v[min(int(q / 100. * n), n - 1)]
+
+        return dict(count=self.count, mean=sum(v) / n, p50=percentile(50),
+                    p90=percentile(90), p99=percentile(99), max=v[-1])
+
+
+class PhaseStats:
+    """
+    Keep the durations of the phases in rolling windows of the given size,
+    both per event type and per container. Only the most recent
+    *max_containers* containers are kept, as popups come and go.
+    """
+
+    enabled = True
+
+    def __init__(self, window=1000, max_containers=100):
+        self.window = window
+        self.max_containers = max_containers
+        self._event_type = None
+        self._by_event = {}
+        self._by_container = OrderedDict()
+
+    def begin_event(self, event_type):
+        self._event_type = event_type
+
+    def span(self, phase, container=None, **args):
+        return _Span(self, phase, container)
+
+    def add(self, phase, container, dt):
+        key = (phase, self._event_type)
+        w = self._by_event.get(key)
+        if w is None:
+            w = self._by_event[key] = RollingWindow(self.window)
+        w.add(dt)
+
+        if container is not None:
+            label = get_container_label(container)
+            windows = self._by_container.get(label)
+            if windows is None:
+                windows = self._by_container[label] = {}
+                if len(self._by_container) > self.max_containers:
+                    self._by_container.popitem(last=False)
+            else:
+                self._by_container.move_to_end(label)
+            w = windows.get(phase)
+            if w is None:
+                w = windows[phase] = RollingWindow(self.window)
+            w.add(dt)
+
+    def get_stats(self):
+        """
+        returns a dictionary of
+
+            {"by_event": {phase: {event_type: summary}},
+             "by_container": {container_label: {phase: summary}}}
+
+        where summary is a dictionary of count, mean, p50, p90, p99 and max.
+        """
+        by_event = {}
+        for (phase, event_type), w in self._by_event.items():
+            by_event.setdefault(phase, {})[event_type] = w.summary()
+
+        by_container = {
+            label: {phase: w.summary() for phase, w in windows.items()}
+            for label, windows in self._by_container.items()
+        }
+
+        return dict(by_event=by_event, by_container=by_container)
+
+    def reset(self):
+        self._by_event.clear()
+        self._by_container.clear()
+
+
+class _TraceSpan:
+    __slots__ = ("_instrument", "_phase", "_args", "_t0")
+
+    def __init__(self, instrument, phase, args):
+        self._instrument = instrument
+        self._phase = phase
+        self._args = args
+
+    def __enter__(self):
+        self._t0 = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._instrument.add_complete_event(self._phase, self._t0,
+                                            perf_counter(), self._args)
+        return False
+
+
+class TraceInstrument:
+    """
+    Record the spans as "complete" events of the trace event format. The
+    events are annotated with the event type, the container and any extra
+    arguments of the span (e.g., the widget id). Only the most recent
+    *max_events* are kept.
+    """
+
+    enabled = True
+
+    def __init__(self, max_events=1000000):
+        self._events = deque(maxlen=max_events)
+        self._event_type = None
+        self._pid = os.getpid()
+        self._t0 = perf_counter()
+
+    def begin_event(self, event_type):
+        self._event_type = event_type
+
+    def span(self, phase, container=None, **args):
+        if self._event_type is not None:
+            args["event"] = self._event_type
+        if container is not None:
+            args["container"] = get_container_label(container)
+        return _TraceSpan(self, phase, args)
+
+    def add_complete_event(self, name, t_start, t_end, args):
+        self._events.append(dict(
+            name=name, cat="mpl_widget_box", ph="X",
+            ts=(t_start - self._t0) * 1e6, dur=(t_end - t_start) * 1e6,
+            pid=self._pid, tid=threading.get_ident(), args=args))
+
+    def get_trace_events(self):
+        return list(self._events)
+
+    def save(self, file):
+        "save the trace to the file name or a writable text file object."
+        trace = dict(traceEvents=self.get_trace_events(),
+                     displayTimeUnit="ms")
+        if hasattr(file, "write"):
+            json.dump(trace, file)
+        else:
+            with open(file, "w") as f:
+                json.dump(trace, f)
+
+
+class _GroupSpan:
+    __slots__ = ("_spans",)
+
+    def __init__(self, spans):
+        self._spans = spans
+
+    def __enter__(self):
+        for s in self._spans:
+            s.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        for s in reversed(self._spans):
+            s.__exit__(*exc)
+        return False
+
+
+class InstrumentGroup:
+    "pass the spans to all of the instruments, e.g., PhaseStats and a tracer."
+
+    enabled = True
+
+    def __init__(self, instruments):
+        self.instruments = list(instruments)
+
+    def begin_event(self, event_type):
+        for i in self.instruments:
+            i.begin_event(event_type)
+
+    def span(self, phase, container=None, **args):
+        return _GroupSpan([i.span(phase, container=container, **args)
+                           for i in self.instruments])
+
+    def get_stats(self):
+        for i in self.instruments:
+            if hasattr(i, "get_stats"):
+                return i.get_stats()
+        return None
+
+
+def traced_process_event(process_event):
+    """
+    A decorator for the `process_event` method of composite widgets, which
+    takes the WidgetBoxManager as its first argument. The call is recorded as
+    a "process_event" span with the wid of the composite widget.
+    """
+
+    @functools.wraps(process_event)
+    def wrapper(self, wbm, ev, *args, **kwargs):
+        get_instrument = getattr(wbm, "get_instrument", None)
+        if get_instrument is None:
+            return process_event(self, wbm, ev, *args, **kwargs)
+
+        with get_instrument().span("process_event",
+                                   wid=getattr(self, "wid", None),
+                                   event_wid=getattr(ev, "wid", None),
+                                   composite=type(self).__name__):
+            return process_event(self, wbm, ev, *args, **kwargs)
+
+    return wrapper
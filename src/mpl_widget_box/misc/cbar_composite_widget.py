@@ -1,22 +1,24 @@
+import weakref
+
 import numpy as np
 from matplotlib import rcParams
-from matplotlib.offsetbox import (
-    TextArea,
-    DrawingArea,
-)
+from matplotlib.offsetbox import DrawingArea
 from matplotlib.image import BboxImage
 
 from .. import widgets as W, WidgetBoxManager
 from .._abc import CompositeWidgetBase
+from ..base_widget import TextArea
+from ..instrument import traced_process_event
 from .matplotlib_colormaps import get_matplotlib_cmaps
+from .colormap_atlas import ColormapThumbnail
+from .image_recolor import ImageRecolor
+# astropy is imported only when a norm is created, and is optional.
+from .mpl_norm_helper import get_norm_da, get_norms, get_image_stats
 
-try:
-    from .mpl_norm_helper import get_norm_da, get_norms
 
-    include_norm_buttons = True
-except ImportError:
-    print("no norm support")
-    include_norm_buttons = False
+# shared by the colorbars of all the selectors.
+_gradient = np.linspace(0, 1, 256)
+GRADIENT = np.vstack((_gradient, _gradient))
 
 
 def get_colorbar(gradient, cmap, width, height):
@@ -31,11 +33,11 @@ def get_colorbar(gradient, cmap, width, height):
     return da, image
 
 
-def get_colormap(cmap):
-    gradient = np.linspace(0, 1, 256)
-    gradient = np.vstack((gradient, gradient))
-
-    da, _ = get_colorbar(gradient, cmap, 80, 10)
+def get_colormap(cmap, width=80, height=10):
+    # The thumbnail is a slice of the shared atlas, instead of a gradient
+    # resampled by every image.
+    da = DrawingArea(width, height, 0, 0)
+    da.add_artist(ColormapThumbnail(da.get_window_extent, cmap))
 
     t = TextArea(cmap)
     p = W.HPacker(pad=0, sep=6, children=[da, t])
@@ -53,26 +55,52 @@ class CbarSelectorWidget(CompositeWidgetBase):
     def _prefixed_name(self, n):
         return f"{self.rootname}:{n}"
 
-    def __init__(self, rootname, dir="v"):
+    def __init__(self, rootname, dir="v", recolor=False):
+        """
+        recolor : if True, the images are recolored by the lookup table of the
+            colormap (see ImageRecolor), instead of being normalized and
+            resampled again. The make_image of the images is hooked until
+            they are removed from the figure or the widget is uninstalled.
+        """
         self.rootname = rootname
+        self.recolor = recolor
+        # image -> ImageRecolor
+        self._recolors = weakref.WeakKeyDictionary()
 
         assert dir in "vh"
         self._dir = dir
 
         self.cmaps = get_matplotlib_cmaps()
         self.cm_kind_list = list(self.cmaps.keys())
-        _gradient = np.linspace(0, 1, 256)
-        self.gradient = np.vstack((_gradient, _gradient))
+        self.gradient = GRADIENT
+        # kind -> (menu items, names). The items are built once per kind.
+        self._cm_widgets = {}
 
-        if include_norm_buttons:
-            self.norms = get_norms()
-        else:
-            self.norms = {}
+        self.norms = get_norms()
 
         # use the default cm name. This will be updated later.
         cm_name = rcParams["image.cmap"]
         self.cbar, self.cbar_im = get_colorbar(self.gradient, cm_name, 80, 10)
 
+    def get_recolor(self, im):
+        "returns the ImageRecolor of the image, e.g., to preview a colormap."
+        self.detach_removed_recolors()
+        r = self._recolors.get(im)
+        if r is None:
+            r = self._recolors[im] = ImageRecolor(im)
+        return r
+
+    def detach_removed_recolors(self):
+        "restore the images that are removed from their figure."
+        for im in [im for im in self._recolors if im.figure is None]:
+            self._recolors.pop(im).detach()
+
+    def detach_recolors(self):
+        "restore all the recolored images."
+        for r in self._recolors.values():
+            r.detach()
+        self._recolors.clear()
+
     def update_cbar_widget(self, wbm, selected_name):
 
         self.cbar_im.set_cmap(selected_name)
@@ -80,8 +108,13 @@ class CbarSelectorWidget(CompositeWidgetBase):
         cm_name = wbm.get_widget_by_id(self._prefixed_name("cm-name"))
         cm_name.set_label(selected_name)
 
+    def get_colormap_widgets(self, kind):
+        if kind not in self._cm_widgets:
+            self._cm_widgets[kind] = get_colormap_widgets(self.cmaps, kind)
+        return self._cm_widgets[kind]
+
     def update_kind(self, wbm, kind):
-        cm_widgets, cm_names = get_colormap_widgets(self.cmaps, kind)
+        cm_widgets, cm_names = self.get_colormap_widgets(kind)
 
         cmap_menu_items = wbm.get_widget_by_id(self._prefixed_name("cm-selector"))
 
@@ -89,7 +122,7 @@ class CbarSelectorWidget(CompositeWidgetBase):
 
     def build_widgets(self):
 
-        cm_widgets, cm_names = get_colormap_widgets(self.cmaps, "perceptual")
+        cm_widgets, cm_names = self.get_colormap_widgets("perceptual")
 
         sub_widgets = [
             W.HWidgets(
@@ -103,20 +136,16 @@ class CbarSelectorWidget(CompositeWidgetBase):
             ),
         ]
 
-        if include_norm_buttons:
-
-            norm_names = ["linear", "sqrt", "log", "squared"]
-            _norm_da = [get_norm_da(c) for c in norm_names]
-            norm_buttons = [
-                W.RadioButton(
-                    self._prefixed_name("norm-selector"),
-                    _norm_da,
-                    values=norm_names,
-                    tooltips=norm_names,
-                )
-            ]
-        else:
-            norm_buttons = []
+        norm_names = ["linear", "sqrt", "log", "squared", "asinh"]
+        _norm_da = [get_norm_da(c) for c in norm_names]
+        norm_buttons = [
+            W.RadioButton(
+                self._prefixed_name("norm-selector"),
+                _norm_da,
+                values=norm_names,
+                tooltips=norm_names,
+            )
+        ]
 
         if self._dir == "h":
             kwargs = {"where": "selected"}
@@ -140,13 +169,18 @@ class CbarSelectorWidget(CompositeWidgetBase):
         pass
 
     def post_uninstall(self, wbm):
-        pass
+        self.detach_recolors()
 
+    @traced_process_event
     def process_event(self, wbm: WidgetBoxManager, ev: W.WidgetBoxEvent, status, im):
+        self.detach_removed_recolors()
+
         # when colormap button is selected.
         if ev.wid == self._prefixed_name("cm-selector"):
             selected_cmap = status[self._prefixed_name("cm-selector")]["value"]
             self.update_cbar_widget(wbm, selected_cmap)
+            if self.recolor:
+                self.get_recolor(im)
             im.set_cmap(selected_cmap)
 
             wbm.draw_idle()
@@ -160,8 +194,10 @@ class CbarSelectorWidget(CompositeWidgetBase):
         # when norm is selected
         elif ev.wid == self._prefixed_name("norm-selector"):
             norm_name = status[self._prefixed_name("norm-selector")]["value"]
-            im.set_norm(self.norms[norm_name]())
-            self.cbar_im.set_norm(self.norms[norm_name]())
+            # the limits of the image are computed once, not by every norm.
+            vmin, vmax = get_image_stats(im.get_array()).get_limits()
+            im.set_norm(self.norms[norm_name](vmin, vmax))
+            self.cbar_im.set_norm(self.norms[norm_name](0, 1))
 
             wbm.draw_idle()
             return True
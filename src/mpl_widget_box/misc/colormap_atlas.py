@@ -0,0 +1,188 @@
+"""
+A process-wide atlas of the colormap thumbnails, e.g., of the menu of
+CbarSelectorWidget.
+
+For each size (in pixels, so that it depends on the dpi) of the thumbnails,
+the colormaps are rendered once into a sprite sheet, an RGBA array of the
+thumbnails stacked vertically, and each thumbnail is a slice of the sheet. The
+sheets are built lazily on the first use, and can be saved to (and loaded
+from) a cache file::
+
+    atlas = get_colormap_atlas()
+    atlas.set_cache_file("~/.cache/mpl_widget_box/cmap_atlas.npz")
+"""
+
+import os
+
+import numpy as np
+import matplotlib
+from matplotlib.image import BboxImage
+
+from .matplotlib_colormaps import get_matplotlib_cmaps, get_cmap
+
+
+def _get_default_names():
+    return [n for _, names in get_matplotlib_cmaps().values() for n in names]
+
+
+def render_thumbnail(cmap, width, height):
+    "returns the (height, width, 4) uint8 array of the colormap gradient."
+    cmap = get_cmap(cmap) if isinstance(cmap, str) else cmap
+    # sample at the center of each pixel.
+    row = cmap((np.arange(width) + 0.5) / width, bytes=True)
+    return np.broadcast_to(row, (height, width, 4))
+
+
+class ColormapAtlas:
+    def __init__(self, names=None, cache_file=None):
+        """
+        names : the names of the colormaps to be rendered into the sheets. The
+            default is those of `get_matplotlib_cmaps`. Other colormaps are
+            added when requested.
+        cache_file : the npz file of the sheets, see `set_cache_file`.
+        """
+        self._names = list(_get_default_names() if names is None else names)
+        self._rows = {n: i for i, n in enumerate(self._names)}
+        # (width, height) -> sheet of (n * height, width, 4)
+        self._sheets = {}
+        self._cache_file = None
+        self._cache_loaded = False
+        if cache_file is not None:
+            self.set_cache_file(cache_file)
+
+    def set_cache_file(self, cache_file):
+        """
+        Load the sheets from the npz file (when needed), and save them to the
+        file when new sheets are rendered. The cache of a different version of
+        matplotlib is ignored.
+        """
+        self._cache_file = (None if cache_file is None
+                            else os.path.expanduser(cache_file))
+        self._cache_loaded = False
+
+    def get_names(self):
+        return list(self._names)
+
+    def _register(self, name):
+        self._rows[name] = len(self._names)
+        self._names.append(name)
+
+    def get_sheet(self, width, height):
+        "returns the sheet of the given size, rendering it if needed."
+        key = (width, height)
+        sheet = self._sheets.get(key)
+        if sheet is None and not self._cache_loaded:
+            self.load()
+            sheet = self._sheets.get(key)
+
+        n = len(self._names)
+        if sheet is None or len(sheet) < n * height:
+            # render the colormaps that are not in the sheet yet.
+            n0 = 0 if sheet is None else len(sheet) // height
+            new_rows = [render_thumbnail(name, width, height)
+                        for name in self._names[n0:]]
+            sheet = np.concatenate(([] if sheet is None else [sheet])
+                                   + new_rows)
+            sheet.flags.writeable = False
+            self._sheets[key] = sheet
+            if self._cache_file is not None:
+                self.save()
+
+        return sheet
+
+    def get(self, name, width, height):
+        """
+        returns the (height, width, 4) RGBA thumbnail of the colormap, which is
+        a read-only slice of the sheet.
+        """
+        if name not in self._rows:
+            self._register(name)
+
+        i = self._rows[name]
+        sheet = self.get_sheet(width, height)
+        return sheet[i * height:(i + 1) * height]
+
+    def save(self, cache_file=None):
+        cache_file = self._cache_file if cache_file is None else cache_file
+        d = os.path.dirname(cache_file)
+        if d:
+            os.makedirs(d, exist_ok=True)
+
+        arrays = {f"{w}x{h}": sheet for (w, h), sheet in self._sheets.items()}
+        # write to a temporary file first, as other processes may read it.
+        tmp = f"{cache_file}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, names=np.array(self._names),
+                 version=np.array(matplotlib.__version__), **arrays)
+        os.replace(tmp, cache_file)
+
+    def load(self, cache_file=None):
+        "load the sheets from the cache file. Returns True if loaded."
+        self._cache_loaded = True
+        cache_file = self._cache_file if cache_file is None else cache_file
+        if cache_file is None or not os.path.exists(cache_file):
+            return False
+
+        try:
+            with np.load(cache_file) as npz:
+                if str(npz["version"]) != matplotlib.__version__:
+                    return False
+                names = list(npz["names"])
+                arrays = {k: npz[k] for k in npz.files
+                          if k not in ["names", "version"]}
+        except (OSError, ValueError, KeyError):
+            return False
+
+        # the rows of the cached sheets are reused only if the names match.
+        if names[:len(self._names)] != self._names[:len(names)]:
+            return False
+        for name in names[len(self._names):]:
+            self._register(name)
+
+        for k, sheet in arrays.items():
+            w, h = map(int, k.split("x"))
+            sheet.flags.writeable = False
+            self._sheets.setdefault((w, h), sheet)
+
+        return True
+
+
+_atlas = None
+
+
+def get_colormap_atlas():
+    "returns the atlas shared in the process."
+    global _atlas
+    if _atlas is None:
+        _atlas = ColormapAtlas()
+    return _atlas
+
+
+class ColormapThumbnail(BboxImage):
+    """
+    BboxImage of the colormap, which draws a slice of the atlas sized to the
+    bbox (in pixels), so that the resampling by make_image is a no-op at the
+    dpi of the atlas.
+    """
+
+    def __init__(self, bbox, cmap, atlas=None, **kwargs):
+        super().__init__(bbox, interpolation="nearest", **kwargs)
+        self._atlas = get_colormap_atlas() if atlas is None else atlas
+        self._thumbnail_key = None
+        self.set_cmap_name(cmap)
+
+    def set_cmap_name(self, cmap):
+        self._cmap_name = cmap if isinstance(cmap, str) else cmap.name
+        self._thumbnail_key = None
+        self.stale = True
+
+    def get_cmap_name(self):
+        return self._cmap_name
+
+    def draw(self, renderer, *args, **kwargs):
+        bbox = self.get_window_extent(renderer)
+        key = (self._cmap_name, round(bbox.width), round(bbox.height))
+        if key != self._thumbnail_key and key[1] > 0 and key[2] > 0:
+            self.set_data(self._atlas.get(*key))
+            self._thumbnail_key = key
+
+        super().draw(renderer, *args, **kwargs)
@@ -0,0 +1,235 @@
+"""
+Recolor an image by a lookup table, e.g., when a colormap is picked by
+CbarSelectorWidget.
+
+Matplotlib normalizes and resamples the whole image at every draw. For a
+large image, this takes seconds even if only the colormap changes. The
+`ImageRecolor` hooks the `make_image` of an image so that, once per norm (and
+view), the image is rendered with a colormap that encodes the index of the
+lookup table of each pixel. The indices of the screen pixels are then cached,
+and drawing with another colormap only takes its lookup table with
+`numpy.take`::
+
+    recolor = ImageRecolor(im)
+    im.set_cmap("magma")  # cheap
+    fig.canvas.draw_idle()
+
+The result is identical to that of matplotlib, as long as the number of the
+colors (N) of the colormaps is the same (otherwise, the index is rescaled). A
+change of the data in place needs `invalidate`.
+"""
+
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+from matplotlib.colors import ListedColormap
+
+from .matplotlib_colormaps import get_cmap
+
+
+def _get_encoding_cmap(n):
+    """
+    A colormap whose colors encode their index (and under, over and bad) in
+    the red and green bytes.
+    """
+    i = np.arange(n + 3)
+    # the colors are converted to bytes by truncation.
+    colors = np.zeros((n + 3, 4))
+    colors[:, 0] = np.minimum((i & 0xFF) / 255 + 1e-6, 1)
+    colors[:, 1] = np.minimum((i >> 8) / 255 + 1e-6, 1)
+    colors[:, 3] = 1
+
+    cmap = ListedColormap(colors[:n], name=f"_index{n}")
+    cmap.set_under(colors[n])
+    cmap.set_over(colors[n + 1])
+    cmap.set_bad(colors[n + 2])
+
+    return cmap
+
+
+def get_lut(cmap, n=None):
+    """
+    The (n + 3, 4) uint8 lookup table of the colormap, whose last 3 entries are
+    the under, over and bad colors. If n differs from cmap.N, the colormap is
+    resampled.
+    """
+    n = cmap.N if n is None else n
+    if n == cmap.N:
+        colors = cmap(np.arange(n))
+    else:
+        colors = cmap((np.arange(n) + 0.5) / n)
+    lut = np.vstack([colors, [cmap.get_under(), cmap.get_over(),
+                              cmap.get_bad()]])
+
+    # the same conversion as the colormap with bytes=True.
+    return (lut * 255).astype(np.uint8)
+
+
+class ImageRecolor:
+    # the number of the cached views (and norms).
+    max_cache = 4
+
+    def __init__(self, image):
+        """
+        image : AxesImage (or any subclass of _ImageBase) of scalar data.
+        """
+        # The image is weakly referenced, as is the make_image of its class, so
+        # that the ImageRecolor does not keep the image alive.
+        self._image_ref = weakref.ref(image)
+        self._orig_instance_make_image = image.__dict__.get("make_image")
+        self._cache = OrderedDict()
+        self._encoding_cmaps = {}
+        self._luts = {}
+        self._preview_cmap = None
+
+        image.make_image = self._make_image
+
+    @property
+    def image(self):
+        "the image, or None if it is freed."
+        return self._image_ref()
+
+    def _orig_make_image(self, renderer, magnification=1.0, unsampled=False):
+        "the make_image of the image before it is hooked."
+        if self._orig_instance_make_image is not None:
+            return self._orig_instance_make_image(renderer, magnification,
+                                                  unsampled)
+        im = self.image
+        return type(im).make_image(im, renderer, magnification, unsampled)
+
+    def detach(self):
+        "restore the make_image of the image."
+        im = self.image
+        if im is not None and im.__dict__.get("make_image") == self._make_image:
+            if self._orig_instance_make_image is None:
+                del im.make_image
+            else:
+                im.make_image = self._orig_instance_make_image
+        self.invalidate()
+
+    def invalidate(self):
+        "drop the cached indices, e.g., when the data is changed in place."
+        self._cache.clear()
+        if self.image is not None:
+            self.image.stale = True
+
+    def preview(self, cmap):
+        """
+        Draw the image with the colormap without changing that of the image,
+        e.g., while the mouse is over the menu item. None to end the preview.
+        """
+        self._preview_cmap = get_cmap(cmap) if isinstance(cmap, str) else cmap
+        self.image.stale = True
+
+    def _get_interpolation_stage(self):
+        """
+        returns "data" if the image is interpolated before the colormap is
+        applied, i.e., the index of each pixel is not blended with others.
+        """
+        im = self.image
+        # get_interpolation_stage is new in matplotlib 3.9.
+        if hasattr(im, "get_interpolation_stage"):
+            stage = im.get_interpolation_stage()
+        else:
+            stage = getattr(im, "_interpolation_stage", "data")
+        if stage == "auto":
+            # matplotlib >= 3.10 interpolates in rgba when an image is
+            # downsampled, unless the interpolation does not blend.
+            return ("data" if im.get_interpolation() in ["nearest", "none"]
+                    else "rgba")
+        return stage
+
+    def can_recolor(self):
+        im = self.image
+        A = im.get_array()
+        return (A is not None and A.ndim == 2
+                and self._get_interpolation_stage() == "data"
+                and im.cmap.N + 3 <= 0x10000)
+
+    def _get_key(self, renderer, magnification):
+        """
+        returns the key of the cache, and the objects whose ids are in the key.
+        The objects are kept with the cached indices, as their ids may be
+        reused once they are freed (e.g., after set_data or set_norm).
+        """
+        im = self.image
+        A = im.get_array()
+        norm = im.norm
+        clip = im.get_clip_box()
+        alpha = im.get_alpha()
+        key = (
+            id(A), id(norm), norm.vmin, norm.vmax,
+            getattr(norm, "clip", None), im.cmap.N,
+            renderer.dpi if hasattr(renderer, "dpi") else None, magnification,
+            tuple(im.get_window_extent(renderer).bounds),
+            None if clip is None else tuple(clip.bounds),
+            im.get_interpolation(), im.get_resample(),
+            alpha if alpha is None or np.isscalar(alpha) else id(alpha),
+        )
+        return key, (A, norm, alpha)
+
+    def _get_indices(self, renderer, magnification):
+        key, refs = self._get_key(renderer, magnification)
+        cached = self._cache.get(key)
+        if cached is not None and all(a is b for a, b in zip(cached[0], refs)):
+            self._cache.move_to_end(key)
+            return cached[1]
+
+        im = self.image
+        n = im.cmap.N
+        if n not in self._encoding_cmaps:
+            self._encoding_cmaps[n] = _get_encoding_cmap(n)
+
+        # The colormap is swapped without set_cmap, which would notify the
+        # change (e.g., to the colorbar).
+        cmap = im.cmap
+        im.cmap = self._encoding_cmaps[n]
+        try:
+            rgba, x, y, trans = self._orig_make_image(renderer, magnification)
+        finally:
+            im.cmap = cmap
+
+        if rgba is None:
+            entry = (None, None, n, x, y, trans)
+        else:
+            indices = rgba[..., 0] | (rgba[..., 1].astype(np.uint16) << 8)
+            entry = (indices, rgba[..., 3].copy(), n, x, y, trans)
+
+        self._cache[key] = (refs, entry)
+        while len(self._cache) > self.max_cache:
+            self._cache.popitem(last=False)
+
+        return entry
+
+    def _get_lut(self, cmap, n):
+        key = (id(cmap), n)
+        cached = self._luts.get(key)
+        # the colormap is kept to make sure that its id is not reused.
+        if cached is None or cached[0] is not cmap:
+            if len(self._luts) > 64:
+                self._luts.clear()
+            cached = self._luts[key] = (cmap, get_lut(cmap, n))
+        return cached[1]
+
+    def _make_image(self, renderer, magnification=1.0, unsampled=False):
+        if unsampled or not self.can_recolor():
+            return self._orig_make_image(renderer, magnification, unsampled)
+
+        indices, alpha, n, x, y, trans = self._get_indices(renderer,
+                                                            magnification)
+        if indices is None:
+            return None, x, y, trans
+
+        cmap = self.image.cmap if self._preview_cmap is None else \
+            self._preview_cmap
+        lut = self._get_lut(cmap, n)
+
+        rgba = lut.take(indices, axis=0)
+        # the alpha of the image and its edges, multiplied as matplotlib does.
+        if lut[:, 3].min() == 255:
+            rgba[..., 3] = alpha
+        else:
+            rgba[..., 3] = rgba[..., 3].astype(np.uint16) * alpha // 255
+
+        return rgba, x, y, trans
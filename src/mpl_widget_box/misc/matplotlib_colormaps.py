@@ -1,3 +1,15 @@
+import matplotlib
+import matplotlib.cm
+
+
+def get_cmap(name):
+    "returns the registered colormap of the name."
+    try:
+        return matplotlib.colormaps[name]
+    except AttributeError:  # matplotlib < 3.5
+        return matplotlib.cm.get_cmap(name)
+
+
 def get_matplotlib_cmaps():
     cmaps = {}
 
@@ -1,46 +1,228 @@
+"""
+Norms of the stretches (linear, log, sqrt, squared and asinh) for the norm
+selector of CbarSelectorWidget.
+
+The norms are those of astropy (ImageNormalize) if it is installed, which is
+imported only when a norm is first created. Otherwise, the stretches are
+implemented with numpy, with the same definitions as the defaults of astropy.
+
+A norm created without vmin and vmax scans the image to autoscale. To switch
+the norms of a large image, the limits are instead taken from `ImageStats`,
+which computes the min, max and percentiles of an image once::
+
+    vmin, vmax = get_image_stats(im.get_array()).get_limits()
+    im.set_norm(Norms["log"](vmin, vmax))
+"""
+
+import weakref
+
 import numpy as np
+from matplotlib.colors import Normalize
 from matplotlib.offsetbox import DrawingArea
 import matplotlib.lines as mlines
 
-from astropy.visualization import (
-    LinearStretch,
-    LogStretch,
-    SqrtStretch,
-    SquaredStretch,
-    AsinhStretch,
-    ImageNormalize,
-)
+NORM_NAMES = ["linear", "log", "sqrt", "squared", "asinh"]
+
+
+def _log_stretch(x, a=1000):
+    return np.log(a * x + 1) / np.log(a + 1)
+
+
+def _log_inverse(y, a=1000):
+    return (np.power(a + 1, y) - 1) / a
+
+
+def _asinh_stretch(x, a=0.1):
+    return np.arcsinh(x / a) / np.arcsinh(1 / a)
+
+
+def _asinh_inverse(y, a=0.1):
+    return np.sinh(y * np.arcsinh(1 / a)) * a
+
+
+# name -> (stretch, inverse), both on the values normalized to [0, 1].
+_STRETCHES = {
+    "linear": (lambda x: x, lambda y: y),
+    "log": (_log_stretch, _log_inverse),
+    "sqrt": (np.sqrt, np.square),
+    "squared": (np.square, np.sqrt),
+    "asinh": (_asinh_stretch, _asinh_inverse),
+}
+
+_ASTROPY_STRETCHES = {
+    "linear": "LinearStretch",
+    "log": "LogStretch",
+    "sqrt": "SqrtStretch",
+    "squared": "SquaredStretch",
+    "asinh": "AsinhStretch",
+}
+
+_astropy = None
+
+
+def _get_astropy_visualization():
+    "returns astropy.visualization, or False if astropy is not installed."
+    global _astropy
+    if _astropy is None:
+        try:
+            import astropy.visualization as _astropy
+        except ImportError:
+            _astropy = False
+    return _astropy
+
+
+def get_stretch(name):
+    "returns the numpy function of the stretch on [0, 1]."
+    return _STRETCHES[name][0]
+
+
+class StretchNormalize(Normalize):
+    """
+    Normalize to [0, 1] linearly and then apply the stretch, as astropy's
+    ImageNormalize does.
+    """
 
+    def __init__(self, stretch="linear", vmin=None, vmax=None, clip=False):
+        super().__init__(vmin=vmin, vmax=vmax, clip=clip)
+        self.stretch_name = stretch
+        self._stretch, self._inverse = _STRETCHES[stretch]
 
-def norm_from_stretch(stretch):
-    def _norm():
-        return ImageNormalize(stretch=stretch())
+    def __call__(self, value, clip=None):
+        if clip is None:
+            clip = self.clip
+
+        result, is_scalar = self.process_value(value)
+        self.autoscale_None(result)
+        vmin, vmax = float(self.vmin), float(self.vmax)
+
+        if vmin == vmax:
+            result.fill(0)
+        else:
+            result -= vmin
+            result /= vmax - vmin
+            if clip:
+                mask = np.ma.getmask(result)
+                result = np.ma.array(np.clip(result.filled(1), 0, 1),
+                                     mask=mask)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                result = np.ma.masked_invalid(self._stretch(result),
+                                              copy=False)
+
+        if is_scalar:
+            result = result[0]
+        return result
+
+    def inverse(self, value):
+        if not self.scaled():
+            raise ValueError("Not invertible until both vmin and vmax are set")
+        vmin, vmax = float(self.vmin), float(self.vmax)
+        return vmin + self._inverse(np.asarray(value)) * (vmax - vmin)
+
+
+def get_norm(name, vmin=None, vmax=None):
+    visualization = _get_astropy_visualization()
+    if visualization:
+        stretch = getattr(visualization, _ASTROPY_STRETCHES[name])()
+        return visualization.ImageNormalize(vmin=vmin, vmax=vmax,
+                                           stretch=stretch)
+    return StretchNormalize(name, vmin=vmin, vmax=vmax)
+
+
+def norm_from_stretch(name):
+    def _norm(vmin=None, vmax=None):
+        return get_norm(name, vmin, vmax)
 
     return _norm
 
 
 def get_norms():
-    _norms = [
-        ("linear", LinearStretch),
-        ("log", LogStretch),
-        ("sqrt", SqrtStretch),
-        ("squared", SquaredStretch),
-        ("asinh", AsinhStretch),
-    ]
+    return dict((k, norm_from_stretch(k)) for k in NORM_NAMES)
+
 
-    norms = dict((k, norm_from_stretch(stretch=s)) for k, s in _norms)
+Norms = get_norms()
 
-    return norms
 
+class ImageStats:
+    """
+    The min, max and percentiles of the finite, unmasked values of an image.
+    Each of them is computed once, on the first request.
+    """
 
-Norms = get_norms()
+    def __init__(self, A):
+        self._A = A
+        self._values = None
+        self._limits = None
+        self._percentiles = {}
+
+    def _get_values(self):
+        if self._values is None:
+            A = np.ma.masked_invalid(self._A, copy=False)
+            self._values = A.compressed()
+            # the array itself is not needed anymore.
+            self._A = None
+        return self._values
+
+    def get_limits(self):
+        "returns (min, max), or (None, None) if no value is valid."
+        if self._limits is None:
+            values = self._get_values()
+            if values.size:
+                self._limits = (values.min(), values.max())
+            else:
+                self._limits = (None, None)
+        return self._limits
+
+    def get_percentile(self, q):
+        if q not in self._percentiles:
+            values = self._get_values()
+            self._percentiles[q] = (np.percentile(values, q) if values.size
+                                    else None)
+        return self._percentiles[q]
+
+    def get_percentile_interval(self, percent):
+        "returns the limits that include the central percent of the values."
+        lower = (100 - percent) / 2
+        return self.get_percentile(lower), self.get_percentile(100 - lower)
+
+
+# id(array) -> (weakref of the array, ImageStats)
+_image_stats = {}
+
+
+def get_image_stats(A):
+    """
+    returns the ImageStats of the array, which is shared while the array is
+    alive. If the array is changed in place, use `clear_image_stats`.
+    """
+    key = id(A)
+    cached = _image_stats.get(key)
+    if cached is not None and cached[0]() is A:
+        return cached[1]
+
+    stats = ImageStats(A)
+    try:
+        ref = weakref.ref(A, lambda _, key=key: _image_stats.pop(key, None))
+    except TypeError:
+        # not weakly referenceable (e.g., a list); not cached.
+        return stats
+    _image_stats[key] = (ref, stats)
+
+    return stats
+
+
+def clear_image_stats(A=None):
+    "drop the stats of the array, or of all the arrays if None."
+    if A is None:
+        _image_stats.clear()
+    else:
+        _image_stats.pop(id(A), None)
 
 
 def get_norm_da(norm_name, w=10, h=10):
     da = DrawingArea(w, h, 0, 0)
 
     a = np.linspace(0, 1, w)
-    l = mlines.Line2D(a * w, Norms[norm_name]()(a) * h, lw=3, color="0.5")
+    l = mlines.Line2D(a * w, get_stretch(norm_name)(a) * h, lw=3, color="0.5")
     da.add_artist(l)
 
     return da
@@ -3,6 +3,7 @@ import numpy as np
 from .. import widgets as W
 
 from ..composite_widget import CompositeWidgetBase
+from ..instrument import traced_process_event
 
 
 # class OutOfRangeException(Exception):
@@ -93,6 +94,7 @@ class NavButtons(CompositeWidgetBase):
         self.lbl.set_label(self.label_format.format(v))
         return v
 
+    @traced_process_event
     def process_event(self, wbm, ev, status):
 
 
@@ -0,0 +1,133 @@
+"""
+A lazily evaluated view of the named status of the widgets, which is passed to
+the callback of the WidgetBoxManager.
+
+The status of each widget is only computed when it is accessed, and is cached
+by the manager as long as the status version of the widget is unchanged (see
+`BaseWidget.get_status_version`).
+"""
+
+from collections.abc import MutableMapping
+
+
+def get_status_version(w):
+    "returns the status version of the widget, or None if not tracked."
+    get_version = getattr(w, "get_status_version", None)
+    return None if get_version is None else get_version()
+
+
+class NamedStatus(MutableMapping):
+    def __init__(self, wbm, since=None):
+        """
+        wbm : the WidgetBoxManager.
+        since : the status mark of the manager. The keys changed after this
+            mark are reported by `changed_keys`.
+        """
+        self._wbm = wbm
+        self._since = since
+        # the values that are already accessed, and the ones set by the user.
+        self._values = {}
+        self._overrides = set()
+        self._deleted = set()
+
+    def _get_widget(self, wid):
+        entries = self._wbm._wid_index.get(wid)
+        if not entries:
+            return None
+        # If there are duplicate wids, the last one wins, as in the plain
+        # dictionary.
+        return entries[-1][0]
+
+    def __getitem__(self, wid):
+        if wid in self._values:
+            return self._values[wid]
+
+        if wid in self._deleted:
+            raise KeyError(wid)
+
+        w = self._get_widget(wid)
+        if w is None:
+            raise KeyError(wid)
+
+        v = self._wbm._get_cached_status(wid, w)
+        # the cached status is shared among events. We make a shallow copy so
+        # that the callback can modify it.
+        if isinstance(v, dict):
+            v = dict(v)
+
+        self._values[wid] = v
+        return v
+
+    def __setitem__(self, wid, value):
+        self._values[wid] = value
+        self._overrides.add(wid)
+        self._deleted.discard(wid)
+
+    def __delitem__(self, wid):
+        if wid not in self:
+            raise KeyError(wid)
+        self._values.pop(wid, None)
+        self._overrides.discard(wid)
+        self._deleted.add(wid)
+
+    def __contains__(self, wid):
+        if wid in self._overrides:
+            return True
+        if wid in self._deleted:
+            return False
+        return self._get_widget(wid) is not None
+
+    def __iter__(self):
+        for wid in self._wbm._wid_index:
+            if wid not in self._deleted:
+                yield wid
+
+        for wid in self._overrides:
+            if wid not in self._wbm._wid_index:
+                yield wid
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def changed_keys(self):
+        """
+        Returns a list of the keys whose status may have changed since the
+        previous callback. Widgets that do not track their status versions and
+        the keys set by the user are always included.
+        """
+        since = self._since
+        keys = []
+        for wid in self:
+            if wid in self._overrides:
+                keys.append(wid)
+                continue
+
+            version = get_status_version(self._get_widget(wid))
+            if version is None or since is None or version > since:
+                keys.append(wid)
+
+        return keys
+
+    def copy(self):
+        "returns a plain dictionary with all the status evaluated."
+        return dict(self)
+
+    def snapshot(self):
+        """
+        returns a StatusSnapshot, a plain dictionary with all the status
+        evaluated, which remembers the changed keys. Unlike the lazy mapping, it
+        can be used after the widgets are changed (e.g., from another thread).
+        """
+        return StatusSnapshot(self, self.changed_keys())
+
+    def __repr__(self):
+        return f"NamedStatus({self.copy()!r})"
+
+
+class StatusSnapshot(dict):
+    def __init__(self, status, changed_keys):
+        super().__init__(status)
+        self._changed_keys = list(changed_keys)
+
+    def changed_keys(self):
+        return list(self._changed_keys)
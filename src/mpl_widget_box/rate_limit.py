@@ -0,0 +1,103 @@
+"""
+A helper to bound the rate of an expensive call, e.g., the callback of a slider
+during a drag.
+"""
+
+import time
+
+RATE_LIMIT_MODES = ["immediate", "latest", "throttle", "debounce", "release"]
+
+
+class RateLimitedCall:
+    """
+    Call *func* with the arguments of the latest `call`, according to the mode.
+
+    "immediate" : call every time.
+    "latest" : call once the events already queued in the GUI event loop are
+        processed (i.e., with a timer of zero interval), so that a burst of
+        calls is coalesced into one.
+    "throttle" : call at most once per *interval* seconds. The last call
+        within the interval is delayed, not dropped.
+    "debounce" : call once the calls stop for *interval* seconds.
+    "release" : call only with `flush` (e.g., when the mouse is released).
+
+    In any mode, `flush` calls the pending one right away. The delayed calls
+    are made by the timer created by *new_timer* (e.g., `canvas.new_timer`),
+    which does not run with non-interactive backends.
+    """
+
+    def __init__(self, func, mode="immediate", interval=0.1, new_timer=None):
+        if mode not in RATE_LIMIT_MODES:
+            raise ValueError(f"unknown mode: {mode}")
+        if mode in ["latest", "throttle", "debounce"] and new_timer is None:
+            raise ValueError(f"new_timer is required for the {mode} mode")
+
+        self._func = func
+        self.mode = mode
+        self.interval = interval
+        self._new_timer = new_timer
+        self._timer = None
+        self._pending = None
+        self._last_call_time = -float("inf")
+
+    def has_pending(self):
+        return self._pending is not None
+
+    def call(self, *args):
+        if self.mode == "immediate":
+            self._call(args)
+            return
+
+        if self.mode == "throttle":
+            elapsed = time.perf_counter() - self._last_call_time
+            if self._pending is None and elapsed >= self.interval:
+                self._call(args)
+                return
+
+            had_pending = self._pending is not None
+            self._pending = args
+            if not had_pending:
+                self._start_timer(self.interval - elapsed)
+
+        elif self.mode == "latest":
+            # The timer is already running if there was a pending call.
+            had_pending = self._pending is not None
+            self._pending = args
+            if not had_pending:
+                self._start_timer(0)
+
+        elif self.mode == "debounce":
+            self._pending = args
+            self._start_timer(self.interval)
+
+        else:
+            self._pending = args
+
+    def flush(self):
+        "make the pending call, if any."
+        args = self._pending
+        if args is None:
+            return
+
+        self.cancel()
+        self._call(args)
+
+    def cancel(self):
+        "drop the pending call."
+        self._pending = None
+        if self._timer is not None:
+            self._timer.stop()
+
+    def _call(self, args):
+        self._last_call_time = time.perf_counter()
+        self._func(*args)
+
+    def _start_timer(self, delay):
+        if self._timer is None:
+            self._timer = self._new_timer()
+            self._timer.single_shot = True
+            self._timer.add_callback(self.flush)
+
+        self._timer.stop()
+        self._timer.interval = max(int(delay * 1000), 0)
+        self._timer.start()
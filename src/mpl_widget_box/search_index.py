@@ -0,0 +1,59 @@
+"""
+An index of strings for the type-ahead search, e.g., of SearchableDropdown.
+"""
+
+from bisect import bisect_left
+
+SEARCH_MODES = ["prefix", "substring"]
+
+# larger than any character, to find the end of the keys with a prefix.
+_MAX_CHAR = chr(0x10FFFF)
+
+
+class SearchIndex:
+    """
+    Find the strings that start with (mode="prefix"), or contain
+    (mode="substring"), the query, ignoring the case.
+
+    The keys, which are the strings themselves or all of their suffixes for
+    the "substring" mode, are sorted once. The keys that start with the query
+    are then found by a binary search, so that a query takes O(log N + number
+    of the matches), regardless of the number of strings that do not match.
+    """
+
+    def __init__(self, strings, mode="prefix"):
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"unknown mode: {mode}")
+
+        self.mode = mode
+        self._n = len(strings)
+
+        keys = []
+        for i, s in enumerate(strings):
+            s = str(s).casefold()
+            if mode == "prefix":
+                keys.append((s, i))
+            else:
+                keys.extend((s[k:], i) for k in range(len(s)))
+
+        keys.sort()
+        self._keys = [k for k, i in keys]
+        self._ids = [i for k, i in keys]
+
+    def __len__(self):
+        return self._n
+
+    def find(self, query):
+        "returns the sorted list of the indices of the matching strings."
+        if not query:
+            return list(range(self._n))
+
+        q = query.casefold()
+        lo = bisect_left(self._keys, q)
+        hi = bisect_left(self._keys, q + _MAX_CHAR, lo)
+
+        if self.mode == "prefix":
+            return sorted(self._ids[lo:hi])
+        else:
+            # a string may contain the query more than once.
+            return sorted(set(self._ids[lo:hi]))
@@ -8,6 +8,9 @@ axes and setup the event handling.
 import logging
 
 import operator
+from contextlib import ExitStack
+
+import matplotlib as mpl
 
 from matplotlib.axes import Axes
 from matplotlib.offsetbox import (
@@ -18,16 +21,78 @@ from matplotlib.offsetbox import (
     OffsetImage,
 )
 import numpy as np
+from matplotlib.transforms import Bbox
 
-from .widgets import MouseOverEvent, WidgetBoxGlobalEvent
+from .widgets import (MouseOverEvent, WidgetBoxGlobalEvent, DragStartEvent,
+                      KeyFocusEvent, ScrolledEvent)
 from .widgets import HPacker, VPacker
 from .widgets_impl import PackedWidgetBase
 from ._abc import CompositeWidgetBase
 
-from .event_handler import WidgetsEventHandler
+from .event_handler import WidgetsEventHandler, get_event_area
+from .hit_test_index import EventAreaIndex
+from .background_filter import FilterChain
+from .event_recorder import EventRecorder
+# async_callback (and asyncio) is imported when an executor is set.
+from .rate_limit import RateLimitedCall
+from .instrument import (NULL_INSTRUMENT, PhaseStats, TraceInstrument,
+                         InstrumentGroup)
+from .named_status import NamedStatus, get_status_version
+from .base_widget import (BaseWidget, next_status_version,
+                          get_layout_generation)
 
 from typing import List
-from .foreign_widget_protocol import ForeignWidgetProtocol
+from .foreign_widget_protocol import ForeignWidgetProtocol, is_dirty_tracking
+
+
+def restore_background_region(canvas, region, bbox):
+    """
+    Restore the part of the saved *region* that is inside the *bbox* (in display
+    coordinates).
+    """
+    renderer = canvas.get_renderer()
+    # extents of the region are in pixels with the origin at the upper left.
+    x1, y1, x2, y2 = region.get_extents()
+    h = renderer.height
+
+    bx1 = max(int(np.floor(bbox.x0)), x1)
+    bx2 = min(int(np.ceil(bbox.x1)), x2)
+    by1 = max(int(h - np.ceil(bbox.y1)), y1)
+    by2 = min(int(h - np.floor(bbox.y0)), y2)
+
+    if bx1 >= bx2 or by1 >= by2:
+        return
+
+    # the bbox is inclusive, and the restored pixels are offset by xy.
+    canvas.restore_region(region, bbox=(bx1, by1, bx2 - 1, by2 - 1), xy=(x1, y1))
+
+
+class RegionBackground:
+    """
+    A background saved as a list of (bbox, region), instead of a single region
+    of the whole figure. The bboxes are in display coordinates and do not
+    overlap.
+    """
+
+    def __init__(self, canvas, bboxes):
+        self.regions = [(bb, canvas.copy_from_bbox(bb)) for bb in bboxes]
+
+    def covers(self, bbox):
+        "check if the bbox is inside one of the saved regions."
+        return any(bb.x0 <= bbox.x0 + 1 and bbox.x1 - 1 <= bb.x1 and
+                   bb.y0 <= bbox.y0 + 1 and bbox.y1 - 1 <= bb.y1
+                   for bb, _ in self.regions)
+
+    def restore(self, canvas, bbox=None):
+        for bb, region in self.regions:
+            if bbox is None:
+                canvas.restore_region(region)
+            elif bb.overlaps(bbox):
+                restore_background_region(canvas, region, bbox)
+
+    def filter(self, bg_filter, canvas, fig):
+        self.regions = [(bb, bg_filter(canvas, fig, region))
+                        for bb, region in self.regions]
 
 
 class AnnotationBbox(_AnnotationBbox):
@@ -144,6 +209,10 @@ class WidgetBoxManager:
         self.useblit = kw.pop("useblit", True)
         self.background = None
         self._background_filter = None
+        # see set_background_capture
+        self._background_capture = kw.pop("background_capture", "full")
+        self.background_margin = 10
+        self._capture_bboxes_cache = None
 
         self._callback = callback
 
@@ -152,12 +221,56 @@ class WidgetBoxManager:
         self._ephemeral_containers = {}
 
         self._mouse_owner = None
+        self._mouse_owner_container = None
+        # (widget, container, rate limiter of the callback) of the widget being
+        # dragged, which receives the motion events until the button is
+        # released.
+        self._drag = None
+        # (widget, container, rate limiter of the callback, exit stack) of the
+        # widget with the key focus, which receives the key events.
+        self._key_focus = None
         self._foreign_widgets: List[ForeignWidgetProtocol] = []
 
         self._stealed_lock = None
 
         self._last_callback_return_value = None
 
+        # wid -> list of (widget, widget-box, container) in the order of
+        # installation, and the entries of each widget-box.
+        self._wid_index = {}
+        self._wid_index_of_wb = {}
+
+        # wid -> (widget, status version, status)
+        self._status_cache = {}
+        self._status_mark = None
+
+        # spatial index of the event areas. It is built lazily and invalidated
+        # when containers are added/removed or the geometry of the widgets
+        # has changed (see _update_hit_index_key).
+        self._hit_index = None
+        self._hit_index_key = None
+
+        # regions that need to be redrawn with the next draw_widgets. If
+        # nothing is marked, the whole figure is redrawn.
+        self._dirty_bboxes = []
+        self._dirty_full = False
+        # margin in points around the dirty widgets, for shadows and frames.
+        self.dirty_margin = 5
+
+        # see set_motion_policy
+        self._motion_limiter = RateLimitedCall(self.handle_event_n_draw)
+
+        # see start_recording
+        self._recorder = None
+
+        # see set_callback_executor
+        self._callback_dispatcher = None
+        self._callback_policies = {}
+
+        # see enable_instrumentation and start_trace
+        self._instrument = NULL_INSTRUMENT
+        self._tracer = None
+
         self._spacebar = SpaceBar(fig, self, None)
 
     def get_last_callback_return_value(self):
@@ -171,6 +284,7 @@ class WidgetBoxManager:
 
     def add_container(self, container, zorder=0):
         self._container_list.append((zorder, container))
+        self.invalidate_hit_index()
 
     def remove_container(self, container):
         for z, c in self._container_list:
@@ -180,16 +294,61 @@ class WidgetBoxManager:
             raise RuntimeError("no container found")
 
         # we first try to remove any ephemeral containers of child widgets.
-        for zorder, wb in c.iter_wb_list():
-            flattened_widgets = wb._get_flattened_widgets(wb._widgets)
-            for w in flattened_widgets:
-                wid = w.wid
-                if wid in self._ephemeral_containers:
-                    c1 = self._ephemeral_containers[wid]
-                    self.remove_container(c1)
-                    del self._ephemeral_containers[wid]
+        for wid, c1 in list(self._ephemeral_containers.items()):
+            if wid not in self._ephemeral_containers:
+                # already removed as a descendant of other container.
+                continue
+            if any(c0 is c for _, _, c0 in self._wid_index.get(wid, [])):
+                self.remove_container(c1)
+                del self._ephemeral_containers[wid]
 
+        self.release_mouse_owner_of(c)
         self._container_list.remove((z, c))
+        self._unindex_container(c)
+        self.invalidate_hit_index()
+
+    def index_widget_box(self, container, wb):
+        """
+        Add the widgets of the widget-box to the wid index. This is called
+        when the widget-box is (re)initialized.
+        """
+        self.unindex_widget_box(wb)
+
+        entries = []
+        for w in wb.get_event_widgets():
+            wid = getattr(w, "wid", None)
+            if wid is None:
+                continue
+            entry = (w, wb, container)
+            self._wid_index.setdefault(wid, []).append(entry)
+            entries.append((wid, entry))
+
+        self._wid_index_of_wb[wb] = entries
+
+    def unindex_widget_box(self, wb):
+        entries_of_wb = self._wid_index_of_wb.pop(wb, [])
+        if (self._drag is not None and
+                any(entry[0] is self._drag[0] for wid, entry in entries_of_wb)):
+            self._drag[2].cancel()
+            self._drag = None
+
+        if (self._key_focus is not None and
+                any(entry[0] is self._key_focus[0] for wid, entry in entries_of_wb)):
+            self.release_key_focus(flush=False)
+
+        for wid, entry in entries_of_wb:
+            cached = self._status_cache.get(wid)
+            if cached is not None and cached[0] is entry[0]:
+                del self._status_cache[wid]
+
+            entries = self._wid_index[wid]
+            entries.remove(entry)
+            if not entries:
+                del self._wid_index[wid]
+
+    def _unindex_container(self, c):
+        for zorder, wb in c.iter_wb_list():
+            self.unindex_widget_box(wb)
 
     def add_widget_box(
             self,
@@ -318,19 +477,20 @@ class WidgetBoxManager:
         zorder=0,
     ):
 
-        sub = SubGuiBox(
-            widgets,
-            ax,
-            bbox_to_anchor=bbox_to_anchor,
-            xy=xy,
-            xybox=xybox,
-            sticky=sticky,
-            parent=parent,
-        )
+        with self._instrument.span("popup_create", container=parent):
+            sub = SubGuiBox(
+                widgets,
+                ax,
+                bbox_to_anchor=bbox_to_anchor,
+                xy=xy,
+                xybox=xybox,
+                sticky=sticky,
+                parent=parent,
+            )
 
-        self.add_container(sub, zorder=zorder)
+            self.add_container(sub, zorder=zorder)
 
-        sub.install(self)
+            sub.install(self)
 
         return sub
 
@@ -341,15 +501,23 @@ class WidgetBoxManager:
                 wc.install(self)
 
         cid = self.fig.canvas.mpl_connect(
-            "button_press_event", self.handle_event_n_draw
+            "button_press_event", self.on_button_press
         )
         self._cid_list["button_press_event"] = cid
 
         cid = self.fig.canvas.mpl_connect(
-            "motion_notify_event", self.handle_event_n_draw
+            "motion_notify_event", self.on_motion_notify
         )
         self._cid_list["motion_notify_event"] = cid
 
+        cid = self.fig.canvas.mpl_connect(
+            "button_release_event", self.on_button_release
+        )
+        self._cid_list["button_release_event"] = cid
+
+        cid = self.fig.canvas.mpl_connect("scroll_event", self.on_scroll)
+        self._cid_list["scroll_event"] = cid
+
         cid = self.fig.canvas.mpl_connect("draw_event", self.save_n_draw)
         self._cid_list["draw_event"] = cid
 
@@ -373,8 +541,210 @@ class WidgetBoxManager:
         for cid in self._cid_list.values():
             self.fig.canvas.mpl_disconnect(cid)
 
+        self._motion_limiter.cancel()
+
+        if self._drag is not None:
+            self._drag[2].cancel()
+            self._drag = None
+
+        if self._key_focus is not None:
+            self.release_key_focus(flush=False)
+
+        if self._callback_dispatcher is not None:
+            self._callback_dispatcher.stop_timer()
+
         self.fig.canvas.draw_idle()
 
+    def enable_instrumentation(self, window=1000):
+        """
+        Time each phase of the event handling and drawing. The durations are
+        kept in rolling windows of the given size, see `get_phase_stats`.
+        """
+        stats = PhaseStats(window=window)
+        if self._tracer is not None:
+            self._instrument = InstrumentGroup([stats, self._tracer])
+        else:
+            self._instrument = stats
+        return stats
+
+    def disable_instrumentation(self):
+        "disable the phase stats. The trace, if running, is not affected."
+        self._instrument = (NULL_INSTRUMENT if self._tracer is None
+                            else self._tracer)
+
+    def set_instrument(self, instrument):
+        "set a custom instrument, e.g. the ones from the instrument module."
+        self._instrument = NULL_INSTRUMENT if instrument is None else instrument
+
+    def get_instrument(self):
+        return self._instrument
+
+    def start_trace(self, max_events=1000000):
+        """
+        Start recording a timeline of the event handling and drawing, which can
+        be saved with `stop_trace` and viewed with Perfetto or chrome://tracing.
+        The trace is recorded in addition to the enabled instrumentation.
+        """
+        self.stop_trace()
+
+        tracer = TraceInstrument(max_events=max_events)
+        if self._instrument.enabled:
+            self._instrument = InstrumentGroup([self._instrument, tracer])
+        else:
+            self._instrument = tracer
+        self._tracer = tracer
+
+        return tracer
+
+    def stop_trace(self, file=None):
+        """
+        Stop the trace and save it to the file, if given. Returns the
+        TraceInstrument, or None if no trace is running.
+        """
+        tracer, self._tracer = self._tracer, None
+        if tracer is None:
+            return None
+
+        if self._instrument is tracer:
+            self._instrument = NULL_INSTRUMENT
+        elif isinstance(self._instrument, InstrumentGroup):
+            instruments = [i for i in self._instrument.instruments
+                           if i is not tracer]
+            self._instrument = (instruments[0] if len(instruments) == 1
+                                else InstrumentGroup(instruments))
+
+        if file is not None:
+            tracer.save(file)
+
+        return tracer
+
+    def get_phase_stats(self):
+        """
+        returns the phase stats (see `PhaseStats.get_stats`), or None if the
+        instrumentation is not enabled.
+        """
+        get_stats = getattr(self._instrument, "get_stats", None)
+        return None if get_stats is None else get_stats()
+
+    def start_recording(self, file):
+        """
+        Record the canvas events handled by the manager to the file, which can
+        be replayed with `event_recorder.replay_events`.
+        """
+        self.stop_recording()
+        self._recorder = EventRecorder(file, self.fig.canvas)
+        return self._recorder
+
+    def stop_recording(self):
+        if self._recorder is not None:
+            self._recorder.close()
+            self._recorder = None
+
+    def set_motion_policy(self, policy="immediate", max_hz=None):
+        """
+        Set how the motion_notify_events are processed.
+
+        policy : {"immediate", "latest", "throttle"}
+            "immediate" processes every motion event. "latest" processes only
+            the latest of the motion events queued in the GUI event loop.
+            "throttle" processes at most *max_hz* motion events per second,
+            and the stale ones are dropped. The pending motion event is
+            always processed before a button press or a key press, so they
+            are never reordered.
+
+        The delayed motion events are processed by the canvas timer. Note that
+        the timer of non-interactive backends (e.g., Agg) does not run.
+        """
+        if policy not in ["immediate", "latest", "throttle"]:
+            raise ValueError(f"unknown motion policy: {policy}")
+        if policy == "throttle" and not max_hz:
+            raise ValueError("max_hz is required for the throttle policy")
+
+        self.flush_pending_motion()
+
+        # the policies are the modes of the same names of RateLimitedCall.
+        self._motion_limiter = RateLimitedCall(
+            self.handle_event_n_draw, policy,
+            interval=1. / max_hz if policy == "throttle" else 0.,
+            new_timer=lambda: self.fig.canvas.new_timer())
+
+    def get_motion_policy(self):
+        return self._motion_limiter.mode
+
+    def flush_pending_motion(self):
+        "process the pending motion event, if any."
+        self._motion_limiter.flush()
+
+    def on_motion_notify(self, event):
+        if self._recorder is not None:
+            self._recorder.record(event)
+
+        self._motion_limiter.call(event)
+
+    def on_button_press(self, event):
+        if self._recorder is not None:
+            self._recorder.record(event)
+
+        # button press should not overtake the motion events before it.
+        self.flush_pending_motion()
+        self.handle_event_n_draw(event)
+
+    def on_scroll(self, event):
+        if self._recorder is not None:
+            self._recorder.record(event)
+
+        self.flush_pending_motion()
+
+        instrument = self._instrument
+        instrument.begin_event(event.name)
+        with instrument.span("handle_event", x=event.x, y=event.y):
+            self._handle_scroll(event)
+
+    def _handle_scroll(self, event):
+        """
+        Let the widget under the event scroll its content, for the scroll event
+        or the key press. Returns True if scrolled.
+        """
+        with self._instrument.span("hit_test"):
+            index = self.get_hit_index(event.canvas.get_renderer())
+            if not index.inside(event.x, event.y):
+                return False
+            e = self._dispatch_event(event)
+
+        if not isinstance(e, ScrolledEvent):
+            return False
+
+        # The item under the mouse has changed.
+        if self._mouse_owner is not None:
+            self._release_mouse_owner()
+        self.mark_widget_dirty(e.widget)
+        self.draw_widgets(event)
+
+        return True
+
+    def on_button_release(self, event):
+        if self._drag is None:
+            return
+
+        if self._recorder is not None:
+            self._recorder.record(event)
+
+        self.flush_pending_motion()
+
+        instrument = self._instrument
+        instrument.begin_event(event.name)
+
+        widget, container, limiter = self._drag
+        self._drag = None
+        with instrument.span("drag", wid=widget.wid):
+            widget.handle_release(event)
+            self.mark_widget_dirty(widget)
+            # the callback with the final value, if delayed.
+            limiter.flush()
+
+        if self._has_dirty():
+            self.draw_widgets(event)
+
     def handle_callback(self, event, e):
         wid = e.wid
         callback_info = e.callback_info
@@ -409,6 +779,15 @@ class WidgetBoxManager:
                 )
                 self._ephemeral_containers[wid] = c
 
+                # a widget of the popup may take the keys while it is open,
+                # e.g., the menu of SearchableDropdown.
+                key_focus = callback_info.get("key_focus")
+                if key_focus is not None:
+                    self.release_key_focus()
+                    ke = KeyFocusEvent(event, None, key_focus)
+                    ke.container_info["container"] = c
+                    self._set_key_focus(ke)
+
         elif callback_info["command"] == "update_widget":
             update_func = callback_info["update_func"]
             update_func(callback_info["value"])
@@ -456,79 +835,442 @@ class WidgetBoxManager:
             lock(self._stealed_lock)
             self._stealed_lock = None
 
+    def _iter_containers_by_zorder(self):
+        "iterate containers in the order they receive the events."
+        return reversed(sorted(self._container_list, key=operator.itemgetter(0)))
+
+    def invalidate_hit_index(self):
+        self._hit_index = None
+
+    def _get_geometry_key(self, renderer):
+        """
+        The key that changes with the locations of the widgets: the layout
+        generation and the visibility and the extent of the widget-boxes.
+        """
+        boxes = []
+        for zorder, c in self._container_list:
+            boxes.append((id(c), c.get_visible()))
+            for zorder, wb in c.iter_wb_list():
+                artist = wb.get_artist()
+                boxes.append(
+                    (id(wb), artist.get_visible(),
+                     tuple(artist.get_window_extent(renderer).bounds)))
+
+        return get_layout_generation(), tuple(boxes)
+
+    def _update_hit_index_key(self, renderer):
+        "invalidate the hit-test index if the widgets have moved."
+        key = self._get_geometry_key(renderer)
+        if key != self._hit_index_key:
+            self._hit_index_key = key
+            self.invalidate_hit_index()
+
+    def _build_hit_index(self, renderer):
+        box_entries = []
+        widget_entries = []
+        for zorder, c in self._iter_containers_by_zorder():
+            if not c.installed():
+                continue
+            for zorder, wb in c.iter_wb_list(reverse=True):
+                box_entries.append((wb.box.patch.get_extents(), (c, wb)))
+                for w in wb.get_event_widgets():
+                    if not w.get_visible():
+                        continue
+                    widget_entries.append(
+                        (get_event_area(w, renderer), (c, wb, w)))
+
+        return EventAreaIndex(box_entries, widget_entries)
+
+    def get_hit_index(self, renderer=None):
+        """
+        returns the spatial index of the event areas. The index is rebuilt only
+        after the widgets are drawn or containers are changed.
+        """
+        if self._hit_index is None:
+            if renderer is None:
+                renderer = self.fig.canvas.get_renderer()
+            self._hit_index = self._build_hit_index(renderer)
+
+        return self._hit_index
+
     def check_event_area(self, event):
         "check if event is located inside the containers"
-        for zorder, c in reversed(
-            sorted(self._container_list, key=operator.itemgetter(0))
-        ):
-            b = c.check_event_area(event)
-            if b:
-                self.steal_event_lock()
-                return True
+        index = self.get_hit_index(event.canvas.get_renderer())
+        if index.inside(event.x, event.y):
+            self.steal_event_lock()
+            return True
         else:
             self.restore_event_lock()
 
+    def _dispatch_event(self, event):
+        """
+        Find the widget responsible for the event using the hit-test index and
+        convert the event to WidgetBox's own event instance.
+        """
+        index = self.get_hit_index(event.canvas.get_renderer())
+
+        # Only the first widget in each widget-box is responsible for the
+        # event, which is the behavior of WidgetsEventHandler.
+        checked_wb = set()
+        for c, wb, w in index.widgets_at(event.x, event.y):
+            if wb in checked_wb or not w.get_visible():
+                continue
+            checked_wb.add(wb)
+
+            e = wb.handle_event_of_child(event, w)
+            if e is not None:
+                e.container_info["container"] = c
+                return e
+
+        return None
+
     def _trigger_callback(self, e):
         if self._callback is not None:
             status = self.get_named_status()
-            return self._callback(self, e, status)
+            if self._callback_dispatcher is not None:
+                # the widgets may change while the callback runs.
+                status = status.snapshot()
+            # changes after this point will be reported by the next status.
+            self._status_mark = next_status_version()
+            with self._instrument.span("callback", wid=e.wid):
+                if self._callback_dispatcher is not None:
+                    self._callback_dispatcher.submit(self._callback, e, status)
+                    return None
+                return self._callback(self, e, status)
+
+    def set_callback_executor(self, executor="thread", on_done=None,
+                              poll_interval=0.02):
+        """
+        Run the callback off the GUI event loop.
+
+        executor : None, "thread", concurrent.futures.Executor or asyncio loop
+            If None, the callback runs synchronously (the default). "thread"
+            uses a thread pool. An asyncio event loop needs to be running in
+            another thread, and the callback can be a coroutine function.
+        on_done : callable, optional
+            Called as ``on_done(wbm, e, result)`` on the GUI thread when the
+            callback completes. The figure is redrawn afterward.
+        poll_interval : float
+            Interval in seconds of the canvas timer that checks the completed
+            callbacks.
+
+        The callback is given a snapshot of the status, and should not modify
+        the widgets from the other thread; use *on_done* instead. The timers of
+        the non-interactive backends do not run, so `process_pending_callbacks`
+        needs to be called explicitly with them.
+        """
+        if self._callback_dispatcher is not None:
+            self._callback_dispatcher.close()
+            self._callback_dispatcher = None
+
+        if executor is not None:
+            from .async_callback import AsyncCallbackDispatcher
+
+            self._callback_dispatcher = AsyncCallbackDispatcher(
+                self, executor, on_done=on_done, poll_interval=poll_interval,
+                policies=self._callback_policies)
+
+    def set_callback_policy(self, wid, policy):
+        """
+        Set what happens when the callback of *wid* is triggered while the
+        previous one is still running, with the asynchronous callback.
+
+        policy : {"queue", "drop", "latest"}
+            "queue" runs it after the running one. "drop" drops it while
+            busy. "latest" runs only the latest one after the running one.
+        """
+        from .async_callback import CALLBACK_POLICIES
+
+        if policy not in CALLBACK_POLICIES:
+            raise ValueError(f"unknown callback policy: {policy}")
+
+        self._callback_policies[wid] = policy
+
+    def process_pending_callbacks(self, wait=False, timeout=None):
+        """
+        Process the completed asynchronous callbacks. This is called by the
+        canvas timer. If *wait*, it waits for all the pending callbacks.
+        Returns the number of the completed callbacks.
+        """
+        if self._callback_dispatcher is None:
+            return 0
+
+        return self._callback_dispatcher.process_pending(wait_all=wait,
+                                                         timeout=timeout)
 
     def handle_event_n_draw(self, event):
-        event_inside = self.check_event_area(event)
+        instrument = self._instrument
+        instrument.begin_event(event.name)
+
+        with instrument.span("handle_event", x=event.x, y=event.y):
+            self._handle_event_n_draw(event)
+
+    def _handle_event_n_draw(self, event):
+        instrument = self._instrument
+
+        if self._drag is not None and event.name == "motion_notify_event":
+            self._handle_drag(event)
+            return
+
+        with instrument.span("hit_test"):
+            event_inside = self.check_event_area(event)
+            # we look up the widgets under the event to find out any of them
+            # can catch the event and convert it to WidgetBox' own event
+            # instance.
+            e = self._dispatch_event(event) if event_inside else None
+
+        if (event.name == "button_press_event" and self._key_focus is not None
+                and getattr(e, "widget", None) is not self._key_focus[0]):
+            # a click elsewhere.
+            self.release_key_focus()
+            if not event_inside:
+                self.draw_widgets(event)
 
         if not event_inside:
             # we need remove the tooltips and redraw if they are still on.
             if self._mouse_owner is not None:
-                self._mouse_owner.set_mouse_leave()
-                self._mouse_owner = None
+                self._release_mouse_owner()
                 self.draw_widgets(event)
 
             return
 
-        # we iter through containers to find out any of the widget in the
-        # container can catch the event and convert it to WidgetBox' own event
-        # instance.
-        for zorder, c in reversed(
-            sorted(self._container_list, key=operator.itemgetter(0))
-        ):
-            e = c.handle_event(event, parent=self)
-            if e is not None:
-                break
-        else:
-            e = None
-
         need_redraw = False
 
         if event.name == "motion_notify_event":
             if isinstance(e, MouseOverEvent):
                 if self._mouse_owner != e.widget:
                     if self._mouse_owner is not None:
-                        self._mouse_owner.set_mouse_leave()
+                        self._release_mouse_owner()
                         need_redraw = True
                     self._mouse_owner = e.widget
+                    self._mouse_owner_container = e.container_info.get("container")
+                    self.mark_widget_dirty(e.widget)
                     need_redraw = True
             else:
                 if self._mouse_owner is not None:
-                    self._mouse_owner.set_mouse_leave()
-                    self._mouse_owner = None
+                    self._release_mouse_owner()
                     need_redraw = True
 
             # self._mouse_owner = e.wid
 
         if event.name in ["button_press_event"]:
-            if e and e.callback_info:
-                # note that some of the callback need to call `purge_emphemeral`.
-                self.handle_callback(event, e)
-            else:
-                self.purge_ephemeral_containers(e)
-
-            if e is not None and e.wid is not None:
+            # The callback can change any widget or popup. We redraw all.
+            self.mark_dirty()
+
+            with instrument.span("popup", wid=getattr(e, "wid", None)):
+                if e and e.callback_info:
+                    # note that some of the callback need to call
+                    # `purge_emphemeral`.
+                    self.handle_callback(event, e)
+                elif not (isinstance(e, DragStartEvent) and e.wid is None):
+                    # a drag without the callback, e.g., of a scrollbar,
+                    # keeps the popups.
+                    self.purge_ephemeral_containers(e)
+
+            if isinstance(e, DragStartEvent):
+                # the callback may be delayed according to the widget.
+                self._start_drag(e)
+            elif isinstance(e, KeyFocusEvent):
+                if self._key_focus is None:
+                    self._set_key_focus(e)
+            elif e is not None and e.wid is not None:
                 self._last_callback_return_value = self._trigger_callback(e)
 
         # if drawing is needed.
-        if event.name in ["button_press_event"] or need_redraw:
+        if (event.name in ["button_press_event"] and self._has_dirty()
+                or need_redraw):
             self.draw_widgets(event)
 
+    def _start_drag(self, e):
+        widget = e.widget
+        limiter = RateLimitedCall(
+            self._trigger_rate_limited_callback,
+            getattr(widget, "callback_mode", "immediate"),
+            getattr(widget, "callback_interval", 0.1),
+            new_timer=self.fig.canvas.new_timer)
+        self._drag = (widget, e.container_info.get("container"), limiter)
+
+        if e.wid is not None:
+            limiter.call(e)
+
+    def _handle_drag(self, event):
+        widget, container, limiter = self._drag
+
+        with self._instrument.span("drag", wid=widget.wid):
+            renderer = event.canvas.get_renderer()
+            # the tooltip may shrink.
+            self.mark_widget_dirty(widget, renderer)
+            e = widget.handle_drag(event)
+            if e is None:
+                self._pop_dirty_region()
+                return
+
+            e.container_info["container"] = container
+            self.mark_widget_dirty(widget, renderer)
+            if e.wid is not None:
+                limiter.call(e)
+
+        if self._has_dirty():
+            self.draw_widgets(event)
+
+    def _trigger_rate_limited_callback(self, e):
+        # This may be called by the timer of the rate limiter, after the event
+        # is handled. Unlike the button press, only the regions marked dirty
+        # (the widget itself and whatever the callback marks) are redrawn.
+        self._last_callback_return_value = self._trigger_callback(e)
+
+        if self._has_dirty():
+            self.draw_widgets(e.event)
+
+    def _set_key_focus(self, e):
+        widget = e.widget
+        limiter = RateLimitedCall(
+            self._trigger_rate_limited_callback,
+            getattr(widget, "callback_mode", "immediate"),
+            getattr(widget, "callback_interval", 0.1),
+            new_timer=self.fig.canvas.new_timer)
+
+        # Disable the key bindings of the figure while typing, as
+        # matplotlib's TextBox does.
+        stack = ExitStack()
+        toolmanager = getattr(self.fig.canvas.manager, "toolmanager", None)
+        if toolmanager is not None:
+            toolmanager.keypresslock(self)
+            stack.callback(toolmanager.keypresslock.release, self)
+        else:
+            stack.enter_context(mpl.rc_context(
+                {k: [] for k in mpl.rcParams if k.startswith("keymap.")}))
+
+        self._key_focus = (widget, e.container_info.get("container"), limiter,
+                           stack)
+        widget.set_key_focus(True)
+
+    def get_key_focus(self):
+        "returns the widget with the key focus, or None."
+        return None if self._key_focus is None else self._key_focus[0]
+
+    def release_key_focus(self, flush=True):
+        """
+        Release the key focus. If *flush*, the delayed callback of the change
+        is called.
+        """
+        if self._key_focus is None:
+            return
+
+        widget, container, limiter, stack = self._key_focus
+        self._key_focus = None
+        stack.close()
+
+        widget.set_key_focus(False)
+        if flush:
+            self.mark_widget_dirty(widget)
+            limiter.flush()
+        else:
+            limiter.cancel()
+            self.mark_dirty()
+
+    def _handle_key(self, event):
+        widget, container, limiter, stack = self._key_focus
+
+        with self._instrument.span("key", wid=widget.wid):
+            self.mark_widget_dirty(widget, event.canvas.get_renderer())
+
+            if event.key == "escape":
+                self.release_key_focus()
+                self._close_popup(container)
+            else:
+                e = widget.handle_key(event)
+                if e is None:
+                    pass
+                elif isinstance(e, ScrolledEvent):
+                    # e.g., the list is filtered. The widget may grow.
+                    self.mark_widget_dirty(widget, event.canvas.get_renderer())
+                else:
+                    e.container_info["container"] = container
+                    if e.auxinfo.get("action") == "submit":
+                        self.release_key_focus()
+                        if e.callback_info:
+                            # this may close the popups.
+                            self.handle_callback(event, e)
+                            self.mark_dirty()
+                        self._trigger_rate_limited_callback(e)
+                    else:
+                        limiter.call(e)
+
+        if self._has_dirty():
+            self.draw_widgets(event)
+
+    def _close_popup(self, container):
+        "close the container if it is a popup that closes with any click."
+        for wid, c in list(self._ephemeral_containers.items()):
+            if c is container and not c.sticky:
+                self.remove_container(c)
+                del self._ephemeral_containers[wid]
+                self.mark_dirty()
+
+    def _release_mouse_owner(self, removed=False):
+        if removed:
+            # the extent of the widget is not available any more.
+            self.mark_dirty()
+        else:
+            self.mark_widget_dirty(self._mouse_owner)
+        self._mouse_owner.set_mouse_leave()
+        self._mouse_owner = None
+        self._mouse_owner_container = None
+
+    def release_mouse_owner_of(self, container):
+        """
+        Release the mouse owner if it is a widget of the container, whose
+        widgets are about to be removed (e.g., collapsed).
+        """
+        if (self._mouse_owner is not None and
+                self._mouse_owner_container is container):
+            self._release_mouse_owner(removed=True)
+
+    def mark_dirty(self, bbox=None):
+        """
+        Mark the region (in display coordinates) that need to be redrawn with
+        the next `draw_widgets`. If bbox is None, the whole figure will be
+        redrawn.
+        """
+        if bbox is None:
+            self._dirty_full = True
+        else:
+            self._dirty_bboxes.append(bbox)
+
+    def _get_widget_extent(self, widget, renderer):
+        bboxes = [widget.get_window_extent(renderer)]
+        if hasattr(widget, "get_event_area"):
+            bboxes.append(widget.get_event_area(renderer))
+        if hasattr(widget, "patch"):
+            bboxes.append(widget.patch.get_window_extent(renderer))
+        if getattr(widget, "tooltip", None) is not None:
+            bboxes.append(widget.tooltip.get_window_extent(renderer))
+
+        return Bbox.union(bboxes)
+
+    def mark_widget_dirty(self, widget, renderer=None):
+        "Mark the area of the widget (including its tooltip) as dirty."
+        if renderer is None:
+            renderer = self.fig.canvas.get_renderer()
+
+        bbox = self._get_widget_extent(widget, renderer)
+        self.mark_dirty(bbox.padded(renderer.points_to_pixels(self.dirty_margin)))
+
+    def _has_dirty(self):
+        return self._dirty_full or bool(self._dirty_bboxes)
+
+    def _pop_dirty_region(self):
+        if self._dirty_full or not self._dirty_bboxes:
+            dirty = None
+        else:
+            dirty = Bbox.union(self._dirty_bboxes)
+
+        self._dirty_bboxes = []
+        self._dirty_full = False
+
+        return dirty
+
     def savebg(self, event):
         canvas = self.fig.canvas
         if self.useblit:
@@ -539,15 +1281,108 @@ class WidgetBoxManager:
         Modifies the background that is being saved.
 
             bg_filter(canvas, fig, background) -> background
+
+        A list of filters is applied in order. See `background_filter` module
+        for built-in filters which modify the background in place. The
+        background is filtered once per draw of the figure and reused until the
+        next draw.
         """
+        if isinstance(bg_filter, (list, tuple)):
+            bg_filter = FilterChain(bg_filter)
+
         self._background_filter = bg_filter
 
     def get_background_filter(self):
         return self._background_filter
 
+    def set_background_capture(self, mode, margin=None):
+        """
+        Set how the background is saved on each draw of the figure.
+
+        mode : {"full", "regions"}
+            "full" saves the whole figure. "regions" saves only the regions
+            that the widget-boxes and their tooltips occupy, padded by the
+            margin (in points). When a widget-box (e.g., a new popup) is outside
+            of the saved regions, the figure is redrawn to capture them again.
+            The "full" mode is used when a background filter is set, or there
+            are foreign widgets other than the axes widgets.
+        """
+        if mode not in ["full", "regions"]:
+            raise ValueError(f"unknown background capture mode: {mode}")
+
+        self._background_capture = mode
+        if margin is not None:
+            self.background_margin = margin
+
+    def get_background_capture(self):
+        return self._background_capture
+
+    def _use_region_background(self):
+        # filters need to be applied to the whole figure.
+        return (self._background_capture == "regions" and
+                self._background_filter is None and
+                all(isinstance(a, BaseWidget) for a in self._foreign_widgets))
+
+    def _get_capture_bboxes(self, renderer):
+        """
+        returns a list of non-overlapping bboxes which cover the containers and
+        the tooltips of their widgets.
+        """
+        pad = renderer.points_to_pixels(self.background_margin)
+
+        bboxes = [bb for c, bb in self._get_container_extents(renderer)]
+
+        # The tooltips are costly to locate. They are reused unless the layout
+        # of the containers changes.
+        key = (tuple(self.fig.bbox.bounds), pad,
+               tuple(tuple(bb.bounds) for bb in bboxes))
+        if self._capture_bboxes_cache is not None:
+            cached_key, cached_bboxes = self._capture_bboxes_cache
+            if cached_key == key:
+                return cached_bboxes
+
+        for zorder, c in self._container_list:
+            if not c.get_visible() or not c.installed():
+                continue
+            for zorder, wb in c.iter_wb_list():
+                for w in wb.get_event_widgets():
+                    if getattr(w, "tooltip", None) is not None:
+                        bboxes.append(w.tooltip.get_window_extent(renderer))
+
+        merged = []
+        for bb in bboxes:
+            bb = Bbox.intersection(bb.padded(pad), self.fig.bbox)
+            if bb is None:
+                continue
+            overlapping = [m for m in merged if m.overlaps(bb)]
+            while overlapping:
+                for m in overlapping:
+                    merged.remove(m)
+                bb = Bbox.union([bb] + overlapping)
+                overlapping = [m for m in merged if m.overlaps(bb)]
+            merged.append(bb)
+
+        # snap to the pixels so that the regions are fully covered.
+        merged = [Bbox.from_extents(np.floor(bb.x0), np.floor(bb.y0),
+                                    np.ceil(bb.x1), np.ceil(bb.y1))
+                  for bb in merged]
+        self._capture_bboxes_cache = (key, merged)
+
+        return merged
+
     def _get_background(self, event):
 
         canvas = event.canvas
+
+        if self._use_region_background():
+            renderer = canvas.get_renderer()
+            background = RegionBackground(canvas,
+                                          self._get_capture_bboxes(renderer))
+            if self.get_background_filter() is not None:
+                background.filter(self._background_filter, canvas, self.fig)
+
+            return background
+
         background = canvas.copy_from_bbox(self.fig.bbox)
 
         if self.get_background_filter() is not None:
@@ -555,76 +1390,263 @@ class WidgetBoxManager:
 
         return background
 
-        # renderer = canvas.get_renderer()
-        # bg_rgba = np.array(background)
-        # rgb = bg_rgba[:, :, :-1]
+    def _check_background_coverage(self, renderer):
+        """
+        check if the saved background covers all the containers. If not, it
+        requests the redraw of the figure, which captures the background again.
+        """
+        if not isinstance(self.background, RegionBackground):
+            return True
 
-        # gray = np.sum(rgb * [0.299, 0.587, 0.114], axis=-1).astype(rgb.dtype)
+        if not self._use_region_background() or not all(
+                self.background.covers(Bbox.intersection(bb, self.fig.bbox) or bb)
+                for c, bb in self._get_container_extents(renderer)):
+            self.fig.canvas.draw_idle()
+            return False
 
-        # gray = 255 - ((255 - gray) >> 2)
+        return True
 
-        # bg_rgba[:, :, :-1] = gray[:, :, np.newaxis]
+    def _restore_background(self, bbox=None):
+        "restore the saved background, optionally only inside the bbox."
+        canvas = self.fig.canvas
+        if isinstance(self.background, RegionBackground):
+            self.background.restore(canvas, bbox)
+        elif bbox is None:
+            canvas.restore_region(self.background)
+        else:
+            restore_background_region(canvas, self.background, bbox)
 
-        # gc = renderer.new_gc()
-        # renderer.draw_image(
-        #     gc, 0, 0, bg_rgba[::-1])
+    def save_n_draw(self, event):
+        if self._recorder is not None:
+            self._recorder.record(event)
 
-        # return canvas.copy_from_bbox(fig.bbox)
+        instrument = self._instrument
+        instrument.begin_event(event.name)
 
+        with instrument.span("save_background"):
+            self.savebg(event)
 
-    def save_n_draw(self, event):
-        self.savebg(event)
+        if self.background is not None and self._background_filter is not None:
+            # show the filtered background right away, instead of waiting for
+            # the next draw_widgets.
+            with instrument.span("restore"):
+                self._restore_background()
 
         # self.draw_child_containers(event, draw_foreign_widgets=False)
         self.draw_child_containers(event, draw_foreign_widgets=True)
 
     def on_key(self, event):
+        if self._recorder is not None:
+            self._recorder.record(event)
+
+        self.flush_pending_motion()
+
+        self._instrument.begin_event(event.name)
+        if self._key_focus is not None:
+            self._handle_key(event)
+            return
+
+        # the keys over the scrollable widgets.
+        if event.x is not None and self._handle_scroll(event):
+            return
+
         t = self._spacebar.on_key(event)
         if t:
             e = WidgetBoxGlobalEvent("@key")
             self._trigger_callback(e)
 
     def draw_widgets(self, event):
+        with self._instrument.span("draw_widgets"):
+            self._draw_widgets(event)
+
+    def _draw_widgets(self, event):
+        dirty = self._pop_dirty_region()
+
         if self.useblit:
             if self.background is not None:
-                self.fig.canvas.restore_region(self.background)
+                renderer = self.fig.canvas.get_renderer()
+                if not self._check_background_coverage(renderer):
+                    return
+
+                if dirty is not None:
+                    self._draw_widgets_in_region(event, dirty)
+                    return
+
+                instrument = self._instrument
+                with instrument.span("restore"):
+                    self._restore_background()
 
                 self.draw_child_containers(event)
-                self.fig.canvas.blit(self.fig.bbox)
 
-    def draw_child_containers(self, event, draw_foreign_widgets=True):
+                with instrument.span("blit"):
+                    self.fig.canvas.blit(self.fig.bbox)
+
+    def _is_orphaned(self, c):
+        "check if the axes of the container is removed from the figure."
+        return (isinstance(c, AxesWidgetBoxContainer) and
+                isinstance(c.ax, Axes) and
+                c.ax not in self.fig.axes)
+
+    def _get_container_extents(self, renderer):
+        """
+        returns a list of (container, bbox) of the visible containers, where
+        bbox covers everything drawn by the container, including the tooltip
+        of the mouse owner.
+        """
+        pad = renderer.points_to_pixels(self.dirty_margin)
+
+        extents = []
+        for zorder, c in self._container_list:
+            if not c.get_visible() or not c.installed():
+                continue
+            bboxes = [wb.get_artist().get_window_extent(renderer)
+                      for zorder, wb in c.iter_wb_list()]
+            if (c is self._mouse_owner_container and
+                    getattr(self._mouse_owner, "tooltip", None) is not None):
+                bboxes.append(self._mouse_owner.tooltip.get_window_extent(renderer))
+            if bboxes:
+                extents.append((c, Bbox.union(bboxes).padded(pad)))
+
+        return extents
+
+    def _draw_widgets_in_region(self, event, dirty):
+        """
+        Redraw the widgets only in the dirty region. The region to be restored
+        is extended to include all the containers (and the foreign widgets)
+        overlapping with it, so that any container is either fully redrawn or
+        left untouched. Only the dirty region is blitted.
+        """
+        canvas = self.fig.canvas
+        renderer = canvas.get_renderer()
+
+        blit_bbox = Bbox.intersection(dirty, self.fig.bbox)
+        if blit_bbox is None:
+            return
+
+        instrument = self._instrument
+
+        if (not all(is_dirty_tracking(a) for a in self._foreign_widgets) or
+                any(self._is_orphaned(c) for _, c in self._container_list)):
+            # we do not know the extents of foreign widgets. Redraw all but
+            # blit only the dirty region.
+            with instrument.span("restore"):
+                self._restore_background()
+            self.draw_child_containers(event)
+            with instrument.span("blit"):
+                canvas.blit(blit_bbox)
+            return
+
+        pad = renderer.points_to_pixels(self.dirty_margin)
+        foreign_extents = [(a, a.get_foreign_bbox(renderer).padded(pad))
+                           for a in self._foreign_widgets]
+
+        # stale foreign widgets need to be redrawn as if they are dirty.
+        stale = [bb for a, bb in foreign_extents if a.is_foreign_stale()]
+        if stale:
+            dirty = Bbox.union([dirty] + stale)
+            blit_bbox = Bbox.intersection(dirty, self.fig.bbox)
+
+        region = dirty
+        selected = []
+        remaining = self._get_container_extents(renderer) + foreign_extents
+        changed = True
+        while changed:
+            changed = False
+            # padded by a few pixels to be safe with pixel snapping.
+            padded_region = region.padded(2)
+            for o, bb in remaining[:]:
+                if bb.overlaps(padded_region):
+                    region = Bbox.union([region, bb])
+                    selected.append(o)
+                    remaining.remove((o, bb))
+                    changed = True
+
+        foreign_widgets = [a for a, bb in foreign_extents if a in selected]
+        containers = set(o for o in selected if o not in foreign_widgets)
+
+        with instrument.span("restore"):
+            self._restore_background(region)
+        self.draw_child_containers(event, containers=containers,
+                                   foreign_widgets=foreign_widgets)
+        with instrument.span("blit"):
+            canvas.blit(blit_bbox)
+
+    def draw_child_containers(self, event, draw_foreign_widgets=True,
+                              containers=None, foreign_widgets=None):
+        """
+        draw the containers. If *containers* is given, only those containers
+        are drawn. Likewise for *foreign_widgets*.
+        """
+        instrument = self._instrument
+        renderer = event.canvas.get_renderer()
+
         delayed_draws = []
         to_be_removed = []
         for zorder, c in self._container_list:
             # check if c.ax is still in the figure and uninstall if not.
-            if (isinstance(c, AxesWidgetBoxContainer) and
-                  isinstance(c.ax, Axes) and
-                  c.ax not in self.fig.axes):
+            if self._is_orphaned(c):
                 c.uninstall(self)
                 to_be_removed.append((zorder, c))
                 continue
 
-            _ = c.draw_widgets(event)
+            if containers is not None and c not in containers:
+                continue
+
+            if instrument.enabled:
+                # do the layout beforehand so that it is timed separately.
+                # The layout is cached and reused by the drawing.
+                with instrument.span("layout", container=c):
+                    for _zorder, wb in c.iter_wb_list():
+                        wb.get_artist().get_window_extent(renderer)
+
+            with instrument.span("draw", container=c):
+                _ = c.draw_widgets(event)
             delayed_draws.extend(_ or [])
 
         for zc in to_be_removed:
             self._container_list.remove(zc)
+            self._unindex_container(zc[1])
 
-        renderer = event.canvas.get_renderer()
+        if to_be_removed:
+            self.invalidate_hit_index()
+        # The locations of the widgets are updated while drawing. The index is
+        # kept if nothing has moved, e.g., with the hover changes.
+        self._update_hit_index_key(renderer)
 
         # foreign widgets may need to be an attribute of axes.
-        if draw_foreign_widgets:
-            for a in self._foreign_widgets:
-                a.purge_background()
-                a.draw(renderer)
+        if foreign_widgets is None:
+            foreign_widgets = self._foreign_widgets
 
-        for draw in delayed_draws:
-            draw(renderer)
+        if draw_foreign_widgets and foreign_widgets:
+            with instrument.span("foreign"):
+                for a in foreign_widgets:
+                    a.purge_background()
+                    a.draw(renderer)
+
+        if delayed_draws:
+            with instrument.span("delayed_draw"):
+                for draw in delayed_draws:
+                    draw(renderer)
 
     def get_named_status(self):
-        status = {}
-        for zorder, c in self._container_list:
-            status.update(c.get_named_status())
+        """
+        Returns a mapping of wid to the status of the widget. The status is
+        evaluated lazily when accessed. Use its `changed_keys` method to get the
+        keys which may have changed since the previous callback.
+        """
+        return NamedStatus(self, since=self._status_mark)
+
+    def _get_cached_status(self, wid, w):
+        version = get_status_version(w)
+        if version is not None:
+            cached = self._status_cache.get(wid)
+            if cached is not None and cached[0] is w and cached[1] == version:
+                return cached[2]
+
+        with self._instrument.span("status"):
+            status = w.get_status()
+        if version is not None:
+            self._status_cache[wid] = (w, version, status)
 
         return status
 
@@ -632,16 +1654,16 @@ class WidgetBoxManager:
         self.fig.canvas.draw_idle()
 
     def get_widget_by_id(self, wid):
-        for zorder, c in self._container_list:
-            w = c.get_widget_by_id(wid)
-            if w is not None:
-                return w
+        entries = self._wid_index.get(wid)
+        if entries:
+            w, wb, c = entries[0]
+            return w
 
     def get_parents_of_wid(self, wid):
-        for zorder, c in self._container_list:
-            wb = c.get_widgetbox_of_wid(wid)
-            if wb is not None:
-                return c, wb
+        entries = self._wid_index.get(wid)
+        if entries:
+            w, wb, c = entries[0]
+            return c, wb
         return None, None
 
     def wait_for_button(self):
@@ -776,6 +1798,7 @@ class WidgetBoxContainerBase:
     def install(self, wbm):
         for zorder, wb in self.iter_wb_list():
             wb.init_widgets()
+            wbm.index_widget_box(self, wb)
             wb.trigger_post_install_hooks(wbm)
 
         self._installed = True
@@ -827,14 +1850,19 @@ class AxesWidgetBoxContainer(WidgetBoxContainerBase):
         super().uninstall(wbm)
 
     def reinit_widget_box(self, wbm, widgets):
-        wb = self.get_widget_box()
-        # assert wb in [_wb for _, _wb in self._wb_list]
+        with wbm.get_instrument().span("reinit_widget_box", container=self):
+            wb = self.get_widget_box()
+            # assert wb in [_wb for _, _wb in self._wb_list]
+
+            wbm.release_mouse_owner_of(self)
+            wb.trigger_post_uninstall_hooks(wbm)
+            wb.get_artist().remove()
+            wb.init_widgets(widgets)
+            wbm.index_widget_box(self, wb)
+            self.ax.add_artist(wb.get_artist())
+            wb.trigger_post_install_hooks(wbm)
 
-        wb.trigger_post_uninstall_hooks(wbm)
-        wb.get_artist().remove()
-        wb.init_widgets(widgets)
-        self.ax.add_artist(wb.get_artist())
-        wb.trigger_post_install_hooks(wbm)
+        wbm.invalidate_hit_index()
 
 
 class WidgetContainer(AxesWidgetBoxContainer):
@@ -1022,6 +2050,10 @@ class WidgetBoxBase:
         flattened_widgets = self._get_flattened_widgets(self._widgets)
         self._handler = WidgetsEventHandler(flattened_widgets)
 
+        self._widgets_by_id = {}
+        for w in flattened_widgets:
+            self._widgets_by_id.setdefault(getattr(w, "wid", None), w)
+
         self.box = self.wrap(_widgets, direction=self.direction)
 
     def get_artist(self):
@@ -1073,6 +2105,19 @@ class WidgetBoxBase:
 
         return e
 
+    def get_event_widgets(self):
+        "returns the (flattened) widgets which respond to the events."
+        return self._handler.get_child_widgets()
+
+    def handle_event_of_child(self, event, widget):
+        "Similar to handle_event, but the responsible widget is already known."
+        renderer = event.canvas.get_renderer()
+        if not self._check_xy(renderer):
+            return None
+
+        if hasattr(widget, "handle_event"):
+            return widget.handle_event(event, parent=self)
+
     def get_named_status(self):
         status = self._handler.get_named_status()
 
@@ -1097,9 +2142,7 @@ class WidgetBoxBase:
         #     cb(wbm)
 
     def get_widget_by_id(self, wid):
-        for w in self._handler.get_child_widgets():
-            if w.wid == wid:
-                return w
+        return self._widgets_by_id.get(wid)
 
 
 class WidgetBox(WidgetBoxBase):
@@ -1,7 +1,10 @@
+import numpy as np
+
 from matplotlib import rcParams
-from matplotlib.offsetbox import TextArea
+from matplotlib.transforms import Bbox
 from matplotlib.widgets import SpanSelector as _SpanSelector
 
+from .base_widget import TextArea
 from .fa_helper import FontAwesome
 
 fa_icons = FontAwesome.icons
@@ -11,6 +14,7 @@ get_icon_fontprop = FontAwesome.get_fontprop
 from .widgets import Radio, HWidgets, Button, HPacker
 
 from ._abc import CompositeWidgetBase
+from .instrument import traced_process_event
 
 
 class SpanSelector(_SpanSelector):
@@ -73,6 +77,14 @@ class Span:
     def purge_background(self):
         self.span.purge_background()
 
+    def is_foreign_stale(self):
+        return any(a.stale for a in self.span.artists)
+
+    def get_foreign_bbox(self, renderer):
+        # The span saves the background of the axes for blitting, which need
+        # to be purged whenever the widgets in the axes are redrawn.
+        return self.ax.bbox
+
 
 class SpanSelectors(Span, CompositeWidgetBase):
     def __init__(self, rootname, ax, labels=[], values=None):
@@ -161,6 +173,7 @@ class SpanSelectors(Span, CompositeWidgetBase):
         saved_extent = self.extents_dict.get(s["value"], (0, 0))
         self.set_current_extents(saved_extent)
 
+    @traced_process_event
     def process_event(self, wb, ev, status):
 
         if ev.wid in [self._prefixed_name("sel")]:
@@ -217,6 +230,10 @@ class SpanSelectionBars:
         self.span = span
         self.ann = ann
 
+        # the extents and the bbox of the last draw.
+        self._drawn_extents = None
+        self._drawn_bbox = None
+
     def draw(self, renderer):
         for i, v in enumerate(self.span.values):
             if v in self.span.extents_dict:
@@ -226,5 +243,24 @@ class SpanSelectionBars:
                 self.ann.set_xdata([x1, x1, x2, x2])
                 self.ann.draw(renderer)
 
+        self._drawn_extents = dict(self.span.extents_dict)
+        self._drawn_bbox = self._get_bars_bbox(renderer)
+
     def purge_background(self):
         pass
+
+    def is_foreign_stale(self):
+        return self._drawn_extents != self.span.extents_dict
+
+    def _get_bars_bbox(self, renderer):
+        xs = [x for x1x2 in self.span.extents_dict.values() for x in x1x2]
+        xs.extend(self.span.ax.get_xlim())
+        xy = self.ann.get_transform().transform(
+            [(x, y) for x in xs for y in [1.02, 1.04]])
+        return Bbox(np.array([xy.min(axis=0), xy.max(axis=0)]))
+
+    def get_foreign_bbox(self, renderer):
+        bbox = self._get_bars_bbox(renderer)
+        if self._drawn_bbox is not None:
+            bbox = Bbox.union([bbox, self._drawn_bbox])
+        return bbox
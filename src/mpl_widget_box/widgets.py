@@ -1 +1,23 @@
-from .widgets_impl import *
+"""
+The widgets (see widgets_impl), which are imported on the first access.
+"""
+
+
+def __getattr__(name):
+    from . import widgets_impl
+
+    try:
+        value = getattr(widgets_impl, name)
+    except AttributeError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}") from None
+
+    # `__all__` is also taken from widgets_impl, for `import *`.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    from . import widgets_impl
+
+    return sorted(set(globals()) | set(widgets_impl.__all__))
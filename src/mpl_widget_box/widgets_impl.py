@@ -7,8 +7,12 @@ __all__ = ["VPacker", "HPacker", "HWidgets", "VWidgets",
            "Label", "Title", "Button",
            "Radio", "CheckBox", "Sub", "Dropdown",
            "RadioButton", "RadioButtonV",
-           "Dropdown", "DropdownMenu"]
+           "Dropdown", "DropdownMenu",
+           "SearchableDropdown", "SearchableDropdownMenu",
+           "DragStartEvent", "KeyFocusEvent", "ScrolledEvent",
+           "Slider", "TextEntry"]
 
+from bisect import bisect_left
 from itertools import zip_longest
 
 import matplotlib.transforms as mtransforms
@@ -17,7 +21,14 @@ import matplotlib.transforms as mtransforms
 from matplotlib.offsetbox import (
     bbox_artist,
     OffsetBox,
+    DrawingArea,
 )
+from matplotlib.patches import Rectangle
+from matplotlib.lines import Line2D
+from matplotlib.text import Text
+from matplotlib.textpath import TextToPath
+from matplotlib.font_manager import FontProperties
+from matplotlib.transforms import IdentityTransform
 
 from matplotlib.offsetbox import VPacker as _VPacker, HPacker as _HPacker
 from matplotlib import patheffects
@@ -31,11 +42,13 @@ from .event_handler import WidgetBoxEventHandlerBase
 from ._abc import PackedWidgetBase
 
 from .fa_helper import FontAwesome
+from .rate_limit import RATE_LIMIT_MODES
+from .search_index import SearchIndex
 
 fa_icons = FontAwesome.icons
 get_icon_fontprop = FontAwesome.get_fontprop
 
-from .base_widget import BaseWidget, TextArea
+from .base_widget import BaseWidget, TextArea, LayoutCacheMixin
 
 
 class Centered(BaseWidget):
@@ -47,9 +60,20 @@ class Centered(BaseWidget):
             c.set_offset((px + (outer_bbox.width - w) * 0.5 + ox, py + oy))
 
 
-class DrawWithDelayed:
+class DrawWithDelayed(LayoutCacheMixin):
     def _get_bbox_and_child_offsets(self, renderer):
-        return super()._get_bbox_and_child_offsets(renderer)
+        layout = self._get_cached_layout(renderer)
+        if layout is None:
+            layout = self._set_cached_layout(
+                renderer, super()._get_bbox_and_child_offsets(renderer))
+
+        return layout
+
+    def set_width(self, width):
+        # the width can be set by the parent packer of the "expand" mode.
+        if width != self.width:
+            self.invalidate_layout()
+        super().set_width(width)
 
     def draw(self, renderer):
         """
@@ -189,6 +213,38 @@ class MouseOverEvent(WidgetBoxEvent):
         self.widget = widget
 
 
+class DragStartEvent(WidgetBoxEvent):
+    """
+    Returned by a widget that starts to be dragged with the button press. The
+    manager routes the following motion events to `widget.handle_drag`, until
+    the button is released.
+    """
+    def __init__(self, event, wid, widget, auxinfo=None, callback_info=None):
+        super().__init__(event, wid, auxinfo=auxinfo, callback_info=callback_info)
+        self.widget = widget
+
+
+class KeyFocusEvent(WidgetBoxEvent):
+    """
+    Returned by a widget that takes the key focus with the button press. The
+    manager routes the following key events to `widget.handle_key`, until the
+    focus is released by "escape" or a button press elsewhere.
+    """
+    def __init__(self, event, wid, widget, auxinfo=None, callback_info=None):
+        super().__init__(event, wid, auxinfo=auxinfo, callback_info=callback_info)
+        self.widget = widget
+
+
+class ScrolledEvent(WidgetBoxEvent):
+    """
+    Returned by a widget which scrolled its content. The manager redraws the
+    widget without triggering the callback.
+    """
+    def __init__(self, event, wid, widget, auxinfo=None, callback_info=None):
+        super().__init__(event, wid, auxinfo=auxinfo, callback_info=callback_info)
+        self.widget = widget
+
+
 class NamedWidget(BaseWidget):
     def __init__(self, wid, box, pad=None, draw_frame=True, auxinfo=None, **kwargs):
         self.wid = wid
@@ -233,6 +289,11 @@ class LabelBase(NamedWidget):
 
     def set_textprops(self, **textprops):
         self.textbox.set_textprops(**textprops)
+        self.invalidate_render_cache()
+
+    def _get_render_cache_state(self):
+        lbl = self.textbox.get_text() if self.textbox is not None else None
+        return super()._get_render_cache_state() + (lbl,)
 
     def _update_patch(self, patch):
         patch.update(dict(ec="none"))
@@ -245,6 +306,11 @@ class LabelBase(NamedWidget):
 
         return {"label": lbl}
 
+    def get_status_version(self):
+        if self.textbox is None:
+            return 0
+        return getattr(self.textbox, "_status_version", None)
+
     def handle_button_press(self, event, parent=None):
         return WidgetBoxEvent(event, None, auxinfo=self.auxinfo)
 
@@ -383,6 +449,9 @@ class Button(LabelBase):
     def set_context(self, c):
         self._context = c
 
+    def _get_render_cache_state(self):
+        return super()._get_render_cache_state() + (self._context,)
+
     def get_event_area(self, renderer):
         return self.button_box.patch.get_window_extent()
 
@@ -447,6 +516,9 @@ class Button(LabelBase):
         contextual_themes.update(themes)
         self._contextual_theme = contextual_themes
 
+        if hasattr(self, "_render_cache"):
+            self.invalidate_render_cache()
+
     def _init_patch_n_context(self, patch):
         patch = self.button_box.patch
 
@@ -600,14 +672,18 @@ class Dropdown(Sub, SelectableBase):
 
     def get_boxes(self, widgets):
         self.menu = DropdownMenu(
-            self.wid + ":select", widgets, update_func=self.update_value, pad=0
+            self.wid + ":select", widgets, update_func=self.update_value, pad=0,
+            max_visible=self._max_visible,
         )
         menu = [self.menu]
         return menu
 
     def __init__(
-        self, wid, label, widgets, pad=None, draw_frame=True, where="selected", **kwargs
+        self, wid, label, widgets, pad=None, draw_frame=True, where="selected",
+        max_visible=None, **kwargs
     ):
+        # the menu of a long list is better with max_visible (see Radio).
+        self._max_visible = max_visible
 
         super().__init__(
             wid, label, [], pad=pad, draw_frame=draw_frame, where=where, **kwargs
@@ -641,6 +717,9 @@ class Dropdown(Sub, SelectableBase):
     def get_status(self):
         return dict(value=self._button_label.get_text())
 
+    def get_status_version(self):
+        return getattr(self._button_label, "_status_version", None)
+
 
 class Radio(BaseWidget, WidgetBoxEventHandlerBase, SelectableBase):
     """Radio buttons.
@@ -658,6 +737,11 @@ class Radio(BaseWidget, WidgetBoxEventHandlerBase, SelectableBase):
     tooltips: str
     direction: str
         The direction of radio items will be packed. 'v' or 'h'. Default is 'v'.
+    max_visible: int
+        If given, only this number of items are laid out and drawn at a time,
+        and the list can be scrolled by the mouse wheel, the scrollbar, or the
+        up/down/pageup/pagedown/home/end keys while the mouse is over it. The
+        labels need to be strings. Only supported with the 'v' direction.
 
     Examples
     --------
@@ -712,6 +796,7 @@ class Radio(BaseWidget, WidgetBoxEventHandlerBase, SelectableBase):
         tooltips=None,
         pad=3,
         direction="v",
+        max_visible=None,
     ):
         if tooltips is None:
             tooltips = [None] * len(labels)
@@ -723,6 +808,9 @@ class Radio(BaseWidget, WidgetBoxEventHandlerBase, SelectableBase):
 
         self.wid = wid
 
+        # see _init_virtual_list
+        self._max_visible = max_visible
+
         # label_box = TextArea("Label:")
         if title is not None:
             label_box = HPacker(
@@ -736,12 +824,20 @@ class Radio(BaseWidget, WidgetBoxEventHandlerBase, SelectableBase):
 
         self.values = values if values is not None else labels
 
-        self.boxes.extend(self.get_boxes(labels, tooltips=tooltips))
-
         kwargs = {}
-        if direction == "h":
+        if max_visible is not None:
+            if direction != "v":
+                raise ValueError("max_visible is only supported with the 'v' direction")
+            self._init_virtual_list(labels, tooltips)
+            self.boxes.extend(self._rows)
+            box = self._virtual_list_box
+            if title is not None:
+                box = VPacker(children=[label_box, box], pad=0, sep=3)
+        elif direction == "h":
+            self.boxes.extend(self.get_boxes(labels, tooltips=tooltips))
             box = HPacker(children=self.boxes, pad=0, sep=3, **kwargs)
         elif direction == "v":
+            self.boxes.extend(self.get_boxes(labels, tooltips=tooltips))
             box = VPacker(children=self.boxes, pad=0, sep=3, **kwargs)
         else:
             raise ValueError("unknown dir value of '{dir'}")
@@ -758,16 +854,206 @@ class Radio(BaseWidget, WidgetBoxEventHandlerBase, SelectableBase):
 
         self.select(selected)
 
+    # The virtual list. Only max_visible rows are created, and they are
+    # updated with the labels of the items from self._first when scrolled.
+
+    _max_visible = None
+
+    # width of the scrollbar in points.
+    scrollbar_width = 5
+    # number of items scrolled by a step of the mouse wheel.
+    scroll_lines = 3
+
+    def _init_virtual_list(self, labels, tooltips):
+        if not all(isinstance(l, str) for l in labels):
+            raise ValueError("max_visible requires string labels")
+
+        self._labels = list(labels)
+        self._tooltips = list(tooltips) if any(tooltips) else None
+        self._first = 0
+
+        # The rows have a fixed width of the longest label (by the number of
+        # characters, as measuring all of them would be O(N)), so that the
+        # layout does not change with scroll.
+        longest = max(self._labels, key=len, default="")
+        w, h, d = TextToPath().get_text_width_height_descent(
+            longest, FontProperties(), ismath=False)
+        self._label_width = w + 2
+
+        self._rows = []
+        self._build_rows()
+
+        self._rows_box = VPacker(children=self._rows, pad=0, sep=3)
+        # a packer with no children cannot be laid out.
+        self._rows_box.set_visible(bool(self._rows))
+        self._scrollbar_space = DrawingArea(self.scrollbar_width, 0)
+        self._virtual_list_box = HPacker(
+            children=[self._rows_box, self._scrollbar_space], pad=0, sep=2,
+            align="top")
+
+        self._scrollbar_track = Rectangle((0, 0), 0, 0, fc="0.9", ec="none",
+                                          transform=IdentityTransform())
+        self._scrollbar_thumb = Rectangle((0, 0), 0, 0, fc="0.6", ec="none",
+                                          transform=IdentityTransform())
+        self._scrollbar_bbox = None
+
+    def _build_rows(self):
+        # The existing rows are reused, e.g., when the labels are replaced.
+        n = min(self._max_visible, len(self._labels))
+        del self._rows[n:]
+        for k in range(len(self._rows), n):
+            row = self.get_default_box(self._labels[k])
+            row.get_children()[1].set_fixed_width(self._label_width)
+            if getattr(self, "figure", None) is not None:
+                row.set_figure(self.figure)
+            self._rows.append(row)
+
+        self._first = min(self._first, len(self._labels) - n)
+
+    def _is_selected(self, i):
+        return i == self.selected
+
+    def _update_rows(self):
+        for k, row in enumerate(self._rows):
+            i = self._first + k
+            button, label = row.get_children()
+            label.set_label(self._labels[i])
+
+            tooltip = None if self._tooltips is None else self._tooltips[i]
+            if label.tooltip is not None and tooltip is not None:
+                label.get_tooltip_textarea().set_text(tooltip)
+            elif label.tooltip is not None or tooltip is not None:
+                label.set_tooltip(tooltip)
+                if getattr(self, "figure", None) is not None:
+                    label.set_figure(self.figure)
+
+            row.get_children()[0] = (self.button_on if self._is_selected(i)
+                                     else self.button_off)
+            row.invalidate_layout()
+
+    def get_first_visible(self):
+        "the index of the first visible item of the virtual list."
+        return self._first
+
+    def set_first_visible(self, i):
+        """
+        Scroll the virtual list so that the i-th item comes first. Returns True
+        if scrolled.
+        """
+        i = max(min(i, len(self._labels) - len(self._rows)), 0)
+        if i == self._first:
+            return False
+
+        self._first = i
+        self._update_rows()
+        return True
+
+    def scroll_to(self, i):
+        "Scroll the virtual list, if needed, so that the i-th item is visible."
+        n = len(self._rows)
+        if i < self._first:
+            return self.set_first_visible(i)
+        elif i >= self._first + n:
+            return self.set_first_visible(i - n + 1)
+        return False
+
+    def _draw_with_outer_bbox(self, renderer, outer_bbox):
+        delayed_draws = super()._draw_with_outer_bbox(renderer, outer_bbox)
+
+        if self._max_visible is not None and len(self._labels) > len(self._rows):
+            self._draw_scrollbar(renderer)
+        else:
+            self._scrollbar_bbox = None
+
+        return delayed_draws
+
+    def _draw_scrollbar(self, renderer):
+        x0, _, x1, _ = self._scrollbar_space.get_window_extent(renderer).extents
+        _, y0, _, y1 = self._rows_box.get_window_extent(renderer).extents
+        self._scrollbar_bbox = bb = mtransforms.Bbox([[x0, y0], [x1, y1]])
+
+        n = len(self._labels)
+        h = max(bb.height * len(self._rows) / n, renderer.points_to_pixels(4))
+        top = bb.y1 - (bb.height - h) * self._first / (n - len(self._rows))
+
+        self._scrollbar_track.set_bounds(bb.x0, bb.y0, bb.width, bb.height)
+        self._scrollbar_thumb.set_bounds(bb.x0, top - h, bb.width, h)
+        for p in [self._scrollbar_track, self._scrollbar_thumb]:
+            p.set_figure(self.figure)
+            p.draw(renderer)
+
+    def _scroll_by_scrollbar(self, event):
+        # the thumb is centered at the mouse.
+        bb = self._scrollbar_bbox
+        frac = (bb.y1 - event.y) / bb.height if bb.height else 0
+        n = len(self._rows)
+        return self.set_first_visible(round(frac * len(self._labels) - n / 2))
+
+    def handle_drag(self, event):
+        if self._scroll_by_scrollbar(event):
+            return ScrolledEvent(event, None, self)
+
+    def handle_release(self, event):
+        pass
+
+    def handle_scroll(self, event, parent=None):
+        if self._max_visible is None:
+            return None
+
+        if self.set_first_visible(self._first - event.step * self.scroll_lines):
+            return ScrolledEvent(event, None, self)
+
+    def handle_key_press(self, event, parent=None):
+        if self._max_visible is None:
+            return None
+
+        n = len(self._rows)
+        first = dict(up=self._first - 1, down=self._first + 1,
+                     pageup=self._first - n, pagedown=self._first + n,
+                     home=0, end=len(self._labels)).get(event.key)
+
+        if first is not None and self.set_first_visible(first):
+            return ScrolledEvent(event, None, self)
+
+    def get_child_widgets(self):
+        return self.boxes
+
+    def _get_item_at(self, event):
+        "returns the index of the item under the event, and its box."
+        i, b = self.get_responsible_child(event)
+
+        i -= self._title_offset
+        if i >= 0 and self._max_visible is not None:
+            i += self._first
+
+        return i, b
+
     def replace_labels(self, labels, values=None):
+        if self._max_visible is not None:
+            self._labels = list(labels)
+            self._tooltips = None
+            self._first = 0
+            self._build_rows()
+            self.boxes[self._title_offset:] = self._rows
+            self._update_rows()
+            self._rows_box.set_visible(bool(self._rows))
+
+            self.values = labels if values is None else values
+            self.touch_status()
+            return
+
         new_labels = self.get_boxes(labels)
         for l in new_labels:
             l.set_figure(self.figure)
         self.boxes[self._title_offset :] = new_labels
+        # self.boxes is the list of children of self.box.
+        self.box.invalidate_layout()
 
         if values is None:
             values = labels
 
         self.values = values
+        self.touch_status()
 
     def _update_patch(self, patch):
         # patch.update(dict(ec="none"))
@@ -786,6 +1072,13 @@ class Radio(BaseWidget, WidgetBoxEventHandlerBase, SelectableBase):
 
         i = i % len(self.values)
 
+        if self._max_visible is not None:
+            self.selected = i
+            if not self.scroll_to(i):
+                self._update_rows()
+            self.touch_status()
+            return i
+
         o = self._title_offset
 
         for _i, b in enumerate(self.boxes[o:]):
@@ -793,9 +1086,11 @@ class Radio(BaseWidget, WidgetBoxEventHandlerBase, SelectableBase):
                 b.get_children()[0] = self.button_on
             else:
                 b.get_children()[0] = self.button_off
+            b.invalidate_layout()
 
         # self.selected[:] = [i]
         self.selected = i
+        self.touch_status()
 
         return i
 
@@ -808,9 +1103,12 @@ class Radio(BaseWidget, WidgetBoxEventHandlerBase, SelectableBase):
                 return b1.handle_motion_notify(event, parent)
 
     def handle_button_press(self, event, parent=None):
-        i, b = self.get_responsible_child(event)
+        if (self._max_visible is not None and self._scrollbar_bbox is not None
+                and self._scrollbar_bbox.padded(2).contains(event.x, event.y)):
+            self._scroll_by_scrollbar(event)
+            return DragStartEvent(event, None, self)
 
-        i -= self._title_offset
+        i, b = self._get_item_at(event)
 
         if i >= 0:
             self.select(i)
@@ -835,9 +1133,11 @@ class DropdownMenu(Radio):
         title=None,
         pad=0,
         update_func=None,
+        max_visible=None,
     ):
         super().__init__(
-            wid, labels, selected=selected, values=values, title=title, pad=pad
+            wid, labels, selected=selected, values=values, title=title, pad=pad,
+            max_visible=max_visible,
         )
         self._update_func = update_func
 
@@ -860,14 +1160,17 @@ class DropdownMenu(Radio):
         )
 
     def handle_button_press(self, event, parent=None):
-        i, b = self.get_responsible_child(event)
+        if (self._max_visible is not None and self._scrollbar_bbox is not None
+                and self._scrollbar_bbox.padded(2).contains(event.x, event.y)):
+            self._scroll_by_scrollbar(event)
+            return DragStartEvent(event, None, self)
 
-        i -= self._title_offset
+        i, b = self._get_item_at(event)
 
         if i >= 0:
             self.select(i)
 
-        if self._update_func is not None:
+        if self._update_func is not None and i >= 0:
             callback_info = dict(
                 command="update_widget",
                 update_func=self._update_func,
@@ -879,6 +1182,161 @@ class DropdownMenu(Radio):
         return WidgetBoxEvent(event, self.wid, callback_info=callback_info)
 
 
+class SearchableDropdownMenu(DropdownMenu):
+    """
+    The menu of SearchableDropdown. The first row shows the query, and only the
+    items that match the query are listed. The selection is kept over the full
+    list, and the status is that of the full list.
+    """
+
+    def __init__(
+        self,
+        wid,
+        labels,
+        selected=None,
+        values=None,
+        pad=0,
+        update_func=None,
+        max_visible=None,
+        match="prefix",
+    ):
+        self._all_labels = list(labels)
+        self._all_values = self._all_labels if values is None else list(values)
+        self._index = SearchIndex(self._all_labels, mode=match)
+        self._query = ""
+        self._key_focus = False
+        # indices of the listed items in the full list.
+        self._ids = list(range(len(self._all_labels)))
+        self._selected_id = None
+
+        super().__init__(
+            wid, self._all_labels, selected=selected, values=self._all_values,
+            title="", pad=pad, update_func=update_func, max_visible=max_visible,
+        )
+
+        self._query_text = self.boxes[0].get_children()[0]
+        self._update_query_text()
+
+    def _update_query_text(self):
+        cursor = "|" if self._key_focus else ""
+        if self._query:
+            s = f"{self._query}{cursor}  ({len(self._ids)})"
+        else:
+            s = f"{cursor}type to filter"
+        self._query_text.set_text(s)
+        self.boxes[0].invalidate_layout()
+
+    def get_query(self):
+        return self._query
+
+    def set_query(self, query):
+        """
+        List only the items matching the query. Returns True if changed.
+        """
+        if query == self._query:
+            return False
+
+        ids = self._index.find(query)
+        self._query = query
+        self._ids = ids
+
+        k = bisect_left(ids, self._selected_id)
+        self.selected = k if k < len(ids) and ids[k] == self._selected_id else -1
+
+        self.replace_labels([self._all_labels[i] for i in ids],
+                            [self._all_values[i] for i in ids])
+        if self._max_visible is None and self.selected >= 0:
+            super().select(self.selected)
+
+        self._update_query_text()
+
+        return True
+
+    def select(self, i):
+        "select the i-th of the listed items."
+        i = super().select(i)
+        self._selected_id = self._ids[self.selected]
+        return i
+
+    def get_status(self):
+        i = self._selected_id
+        return dict(selected=i, value=self._all_values[i])
+
+    def set_key_focus(self, b):
+        self._key_focus = b
+        self._update_query_text()
+
+    def handle_key(self, event):
+        key = event.key
+        if key == "enter":
+            if not self._ids:
+                return None
+            # the first visible item is selected.
+            i = self._first if self._max_visible is not None else 0
+            self.select(i)
+            callback_info = None
+            if self._update_func is not None:
+                callback_info = dict(command="update_widget",
+                                     update_func=self._update_func,
+                                     value=self.values[i])
+            return WidgetBoxEvent(event, self.wid, auxinfo=dict(action="submit"),
+                                  callback_info=callback_info)
+        elif key == "backspace":
+            query = self._query[:-1]
+        elif key is not None and len(key) == 1:
+            query = self._query + key
+        else:
+            return self.handle_key_press(event)
+
+        if self.set_query(query):
+            return ScrolledEvent(event, None, self)
+
+
+class SearchableDropdown(Dropdown):
+    """Dropdown whose items can be filtered by typing.
+
+    While the menu is open, the typed keys narrow the listed items to those
+    that start with (or contain) the query, backspace removes the last
+    character, enter selects the first listed item, and escape closes the
+    menu. The matching items are found by a precomputed index of the labels
+    (see `SearchIndex`), and only the visible ones are drawn.
+
+    Parameters
+    ----------
+    wid : str
+       The widget ID.
+    label : str
+       The label of the button.
+    widgets : list of str
+       The labels of the items.
+    match : str
+       "prefix" or "substring".
+    max_visible : int
+       The number of the items drawn at a time. Default is 15.
+    """
+
+    def __init__(self, wid, label, widgets, match="prefix", max_visible=15,
+                 **kwargs):
+        self._match = match
+        super().__init__(wid, label, widgets, max_visible=max_visible, **kwargs)
+
+    def get_boxes(self, widgets):
+        self.menu = SearchableDropdownMenu(
+            self.wid + ":select", widgets, update_func=self.update_value, pad=0,
+            max_visible=self._max_visible, match=self._match,
+        )
+        return [self.menu]
+
+    def handle_button_press(self, event, parent=None):
+        e = super().handle_button_press(event, parent)
+
+        # the menu starts with the full list, and takes the keys.
+        self.menu.set_query("")
+        e.callback_info["key_focus"] = self.menu
+
+        return e
+
+
 class CheckBox(Radio):
     """Checkbox.
 
@@ -923,6 +1381,7 @@ class CheckBox(Radio):
 
     def initialize_selections(self, selected):
         self.selected = []
+        self.touch_status()
         if selected is None:
             return
 
@@ -935,6 +1394,16 @@ class CheckBox(Radio):
         if i is None:
             return
 
+        if self._max_visible is not None:
+            if i in self.selected:
+                self.selected.remove(i)
+            else:
+                self.selected.append(i)
+            if not self.scroll_to(i):
+                self._update_rows()
+            self.touch_status()
+            return
+
         o = self._title_offset
 
         b = self.boxes[o + i]
@@ -944,6 +1413,11 @@ class CheckBox(Radio):
         else:
             self.selected.append(i)
             b.get_children()[0] = self.button_on
+        b.invalidate_layout()
+        self.touch_status()
+
+    def _is_selected(self, i):
+        return i in self.selected
 
     def get_status(self):
         return dict(
@@ -1028,6 +1502,7 @@ class RadioButton(Radio):
                 b.set_context("")
 
         self.selected = i
+        self.touch_status()
 
     def _set_figure_extra(self, fig):
         pass
@@ -1065,3 +1540,466 @@ class RadioButtonV(RadioButton):
 
         self.initialize_selections(selected)
 
+
+
+def get_default_valfmt(vmin, vmax):
+    "the format of the values, with the precision of 1/100 of the range."
+    dstep = abs(vmax - vmin) / 100.0
+    if dstep > 100:
+        valfmt = "{:.2e}"
+    elif dstep > 1.0:
+        valfmt = "{:.0f}"
+    elif dstep > 0.05:
+        valfmt = "{:.1f}"
+    elif dstep > 0.005:
+        valfmt = "{:.2f}"
+    elif dstep > 0.0005:
+        valfmt = "{:.3f}"
+    else:
+        valfmt = "{:e}"
+
+    return valfmt
+
+
+class Slider(NamedWidget):
+    """A slider drawn as a plain offsetbox.
+
+    Unlike `axes_widget.SliderWidget`, it does not create a matplotlib Axes,
+    and is dragged through the event handling of the WidgetBoxManager. Its
+    status is the same, i.e., ``{"val": value}``.
+
+    Parameters
+    ----------
+    wid : str
+       The widget ID.
+    valmin, valmax : float
+       The range of the value.
+    valinit : float
+       The initial value. Default is the center of the range.
+    width, height : float
+       The size of the slider track in points.
+    valfmt : str
+       The format string of the value, e.g., "{:.2f}".
+    label : str
+       The label placed on the left of the slider.
+    label_width : float
+       The fixed width of the label.
+    tooltip : str
+       The tooltip. The value is appended if value_tooltip_on is True.
+    value_tooltip_on : bool
+       Show the value as a tooltip while the mouse is over the slider.
+    value_overlay_on : bool
+       Show the value over the slider while the mouse is not on it.
+    value_label_on : bool
+       Show the value on the right of the slider.
+    callback_mode : {"immediate", "latest", "throttle", "debounce", "release"}
+       How often the callback is called while the slider is dragged. See
+       `axes_widget.SliderWidget`.
+
+    Examples
+    --------
+
+    >>> s1 = W.Slider("s1", 0, 1, label="S1")
+    >>> install_widgets_simple(ax, [s1])
+    """
+
+    def __init__(
+        self,
+        wid,
+        valmin,
+        valmax,
+        valinit=None,
+        width=60,
+        height=20,
+        valfmt=None,
+        label=None,
+        tooltip=None,
+        label_width=None,
+        value_tooltip_on=True,
+        value_overlay_on=True,
+        value_label_on=False,
+        overlay_alpha=0.6,
+        color="C0",
+        track_color="lightgrey",
+        callback_mode="immediate",
+        callback_interval=0.1,
+        pad=3,
+        auxinfo=None,
+    ):
+        if callback_mode not in RATE_LIMIT_MODES:
+            raise ValueError(f"unknown callback mode: {callback_mode}")
+        if not valmin < valmax:
+            raise ValueError(f"valmin ({valmin}) must be less than valmax "
+                             f"({valmax})")
+
+        self.valmin = valmin
+        self.valmax = valmax
+        self.valfmt = get_default_valfmt(valmin, valmax) if valfmt is None else valfmt
+        self.callback_mode = callback_mode
+        self.callback_interval = callback_interval
+
+        self._dragging = False
+
+        self.track_box = DrawingArea(width, height)
+        self._track = Rectangle((0, 0), width, height, fc=track_color, ec="none")
+        self._fill = Rectangle((0, 0), 0, height, fc=color, ec="none")
+        self._handle = Line2D([0, 0], [0, height], color="0.3", lw=2)
+        for a in [self._track, self._fill, self._handle]:
+            self.track_box.add_artist(a)
+
+        if value_overlay_on:
+            self._overlay = [
+                Rectangle((0, 0), width, height, ec="none", fc="w",
+                          alpha=overlay_alpha),
+                Text(width * 0.5, height * 0.5, "", ha="center", va="center"),
+            ]
+            for a in self._overlay:
+                self.track_box.add_artist(a)
+        else:
+            self._overlay = []
+
+        children = []
+        if label is not None:
+            children.append(BaseWidget(TextArea(label), fixed_width=label_width))
+        children.append(self.track_box)
+
+        if value_label_on:
+            self._value_label = TextArea("")
+            children.append(self._value_label)
+        else:
+            self._value_label = None
+
+        box = HPacker(children=children, pad=0, sep=3, align="center")
+
+        self._tooltip_prefix = tooltip
+        self._value_tooltip_on = value_tooltip_on
+        if value_tooltip_on:
+            tooltip = ""
+
+        super().__init__(wid, box, pad=pad, draw_frame=False, auxinfo=auxinfo,
+                         tooltip=tooltip)
+
+        self.val = None
+        self.set_val(0.5 * (valmin + valmax) if valinit is None else valinit)
+        self.valinit = self.val
+
+    def set_val(self, val):
+        "set the value, clipped to the range. Returns True if changed."
+        val = min(max(val, self.valmin), self.valmax)
+        if val == self.val:
+            return False
+
+        self.val = val
+
+        frac = (val - self.valmin) / (self.valmax - self.valmin)
+        x = frac * self.track_box.width
+        self._fill.set_width(x)
+        self._handle.set_xdata([x, x])
+
+        s = self.valfmt.format(val)
+        if self._overlay:
+            self._overlay[1].set_text(s)
+        if self._value_label is not None:
+            self._value_label.set_text(s)
+        if self._value_tooltip_on:
+            if self._tooltip_prefix:
+                s = f"{self._tooltip_prefix}: {s}"
+            self.get_tooltip_textarea().set_text(s)
+
+        self.invalidate_render_cache()
+        self.touch_status()
+
+        return True
+
+    def get_val(self):
+        return self.val
+
+    def reset(self):
+        self.set_val(self.valinit)
+
+    def get_status(self):
+        return dict(val=self.val)
+
+    def _get_render_cache_state(self):
+        return super()._get_render_cache_state() + (self.val, self._dragging)
+
+    def _get_tooltip_anchor(self):
+        return self._track
+
+    def get_event_area(self, renderer):
+        return self._track.get_window_extent(renderer)
+
+    def _get_val_at(self, event):
+        bb = self._track.get_window_extent()
+        frac = (event.x - bb.x0) / bb.width if bb.width else 0
+        return self.valmin + frac * (self.valmax - self.valmin)
+
+    def handle_motion_notify(self, event, parent=None):
+        auxinfo = {}
+        if self._mouse_on == False:
+            self._mouse_on = True
+            auxinfo["mouse_entered"] = True
+
+        return MouseOverEvent(event, self.wid, self, auxinfo=auxinfo)
+
+    def handle_button_press(self, event, parent=None):
+        if event.button != 1:
+            return None
+
+        self._dragging = True
+        self.set_val(self._get_val_at(event))
+
+        return DragStartEvent(event, self.wid, self, auxinfo=self.auxinfo)
+
+    def handle_drag(self, event):
+        """
+        Called by the manager with the motion events while dragged. Returns an
+        event if the value is changed.
+        """
+        if self.set_val(self._get_val_at(event)):
+            return WidgetBoxEvent(event, self.wid, auxinfo=self.auxinfo)
+
+        return None
+
+    def handle_release(self, event):
+        self._dragging = False
+        self.invalidate_render_cache()
+
+    def set_mouse_leave(self):
+        self._mouse_on = False
+
+    def _update_overlay(self):
+        # the value is shown by the tooltip while the mouse is on.
+        show = not (self._mouse_on or self._dragging)
+        for a in self._overlay:
+            a.set_visible(show)
+
+    def draw(self, renderer):
+        self._update_overlay()
+        return super().draw(renderer)
+
+    def draw_with_outer_bbox(self, renderer, outer_bbox):
+        self._update_overlay()
+        return super().draw_with_outer_bbox(renderer, outer_bbox)
+
+
+class TextEntry(NamedWidget):
+    """A single line text entry.
+
+    Unlike `axes_widget.TextAreaWidget`, it does not create a matplotlib Axes.
+    A click on the entry takes the key focus, and the keys are handled through
+    the key_press_event connection of the WidgetBoxManager. The focus is
+    released by "enter", "escape" or a click elsewhere. The status is
+    ``{"text": text}``.
+
+    The callback is called with ``auxinfo["action"]`` of "change" when the
+    text is changed, and "submit" when "enter" is pressed.
+
+    Parameters
+    ----------
+    wid : str
+       The widget ID.
+    initial_text : str
+    width, height : float
+       The size of the entry in points.
+    label : str
+       The label placed on the left of the entry.
+    label_width : float
+       The fixed width of the label.
+    tooltip : str
+    textprops : dict
+       text properties to be set. Default is None.
+    callback_mode : {"immediate", "latest", "throttle", "debounce", "release"}
+       How often the callback is called for the changes while typing.
+       "release" calls only when the focus is released.
+
+    Examples
+    --------
+
+    >>> t1 = W.TextEntry("name", "", label="Name")
+    >>> install_widgets_simple(ax, [t1])
+    """
+
+    def __init__(
+        self,
+        wid,
+        initial_text="",
+        width=60,
+        height=16,
+        label=None,
+        label_width=None,
+        tooltip=None,
+        textprops=None,
+        callback_mode="immediate",
+        callback_interval=0.3,
+        pad=3,
+        auxinfo=None,
+    ):
+        if callback_mode not in RATE_LIMIT_MODES:
+            raise ValueError(f"unknown callback mode: {callback_mode}")
+
+        self.callback_mode = callback_mode
+        self.callback_interval = callback_interval
+
+        # margin of the text inside the entry, in points.
+        self.text_margin = 2
+
+        self.text_box = DrawingArea(width, height, clip=True)
+        self._text = Text(self.text_margin, height * 0.5, "", ha="left",
+                          va="center", **(textprops or {}))
+        if hasattr(self._text, "set_parse_math"):
+            self._text.set_parse_math(False)
+        self._cursor_line = Line2D([0, 0], [2, height - 2], color="k", lw=1)
+        self._cursor_line.set_visible(False)
+        self.text_box.add_artist(self._text)
+        self.text_box.add_artist(self._cursor_line)
+        # The text is not clipped by the clip path of the DrawingArea with the
+        # agg backend. We clip it by the clip box.
+        self._text.set_clip_box(mtransforms.TransformedBbox(
+            mtransforms.Bbox.from_bounds(0, 0, width, height),
+            self.text_box.get_transform()))
+
+        self.entry_box = BaseWidget(self.text_box, pad=1, draw_frame=True)
+        self.entry_box.patch.update(dict(fc="w", ec="0.5"))
+
+        children = []
+        if label is not None:
+            children.append(BaseWidget(TextArea(label), fixed_width=label_width))
+        children.append(self.entry_box)
+
+        box = HPacker(children=children, pad=0, sep=3, align="center")
+
+        super().__init__(wid, box, pad=pad, draw_frame=False, auxinfo=auxinfo,
+                         tooltip=tooltip)
+
+        self.text = None
+        self.cursor = 0
+        self.focused = False
+        # horizontal scroll of the text in points, to keep the cursor visible.
+        self._scroll = 0.
+
+        self.set_text(initial_text)
+
+    def set_text(self, s):
+        if s == self.text:
+            return
+
+        self.text = s
+        self.cursor = min(self.cursor, len(s))
+        self._text.set_text(s)
+
+        self.invalidate_render_cache()
+        self.touch_status()
+
+    def get_text(self):
+        return self.text
+
+    def get_status(self):
+        return dict(text=self.text)
+
+    def _get_render_cache_state(self):
+        return super()._get_render_cache_state() + (
+            self.text, self.cursor, self.focused)
+
+    def _get_tooltip_anchor(self):
+        return self.entry_box.patch
+
+    def get_event_area(self, renderer):
+        return self.entry_box.patch.get_window_extent(renderer)
+
+    def handle_motion_notify(self, event, parent=None):
+        auxinfo = {}
+        if self._mouse_on == False:
+            self._mouse_on = True
+            auxinfo["mouse_entered"] = True
+
+        return MouseOverEvent(event, self.wid, self, auxinfo=auxinfo)
+
+    def set_mouse_leave(self):
+        self._mouse_on = False
+
+    def handle_button_press(self, event, parent=None):
+        if event.button != 1:
+            return None
+
+        self.cursor = len(self.text)
+
+        return KeyFocusEvent(event, self.wid, self, auxinfo=self.auxinfo)
+
+    def set_key_focus(self, b):
+        self.focused = b
+        self.entry_box.patch.set_edgecolor("C0" if b else "0.5")
+        self.invalidate_render_cache()
+
+    def handle_key(self, event):
+        """
+        Called by the manager with the key events while focused. Returns an
+        event if the text is changed or submitted.
+        """
+        key = event.key
+        text, i = self.text, self.cursor
+
+        if key == "enter":
+            return WidgetBoxEvent(event, self.wid,
+                                  auxinfo=dict(self.auxinfo, action="submit"))
+        elif key == "backspace":
+            if i > 0:
+                text, i = text[:i - 1] + text[i:], i - 1
+        elif key == "delete":
+            text = text[:i] + text[i + 1:]
+        elif key == "left":
+            i = max(i - 1, 0)
+        elif key == "right":
+            i = min(i + 1, len(text))
+        elif key == "home":
+            i = 0
+        elif key == "end":
+            i = len(text)
+        elif key is not None and len(key) == 1:
+            text, i = text[:i] + key + text[i:], i + 1
+        else:
+            # e.g., modifier keys.
+            return None
+
+        self.cursor = i
+        self.invalidate_render_cache()
+
+        if text != self.text:
+            self.set_text(text)
+            return WidgetBoxEvent(event, self.wid,
+                                  auxinfo=dict(self.auxinfo, action="change"))
+
+        return None
+
+    def _get_text_width(self, renderer, s):
+        "width of the string in points."
+        if not s:
+            return 0.
+        w, h, d = renderer.get_text_width_height_descent(
+            s, self._text.get_fontproperties(), ismath=False)
+        return w / renderer.points_to_pixels(1.)
+
+    def _update_text_position(self, renderer):
+        margin = self.text_margin
+        width = self.text_box.width
+
+        x = self._get_text_width(renderer, self.text[:self.cursor])
+
+        # scroll the text so that the cursor is visible.
+        if x + self._scroll > width - 2 * margin:
+            self._scroll = width - 2 * margin - x
+        elif x + self._scroll < 0:
+            self._scroll = -x
+        self._scroll = min(self._scroll, 0.)
+
+        self._text.set_x(margin + self._scroll)
+        self._cursor_line.set_xdata([margin + self._scroll + x] * 2)
+        self._cursor_line.set_visible(self.focused)
+
+    def draw(self, renderer):
+        self._update_text_position(renderer)
+        return super().draw(renderer)
+
+    def draw_with_outer_bbox(self, renderer, outer_bbox):
+        self._update_text_position(renderer)
+        return super().draw_with_outer_bbox(renderer, outer_bbox)
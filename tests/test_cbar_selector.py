@@ -0,0 +1,72 @@
+import gc
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from mpl_widget_box import widgets as W, WidgetBoxManager
+from mpl_widget_box.misc.cbar_composite_widget import CbarSelectorWidget
+
+
+def _select_cmap(wbm, selector, im, cmap):
+    wid = selector._prefixed_name("cm-selector")
+    status = {wid: {"value": cmap}}
+    return selector.process_event(wbm, W.WidgetBoxEvent(None, wid), status, im)
+
+
+def _setup(**kwargs):
+    fig, ax = plt.subplots()
+    im = ax.imshow(np.arange(100).reshape((10, 10)))
+    selector = CbarSelectorWidget("csw", **kwargs)
+    wbm = WidgetBoxManager(fig)
+    wbm.add_anchored_widget_box([selector], ax, loc=2)
+    wbm.install_all()
+    fig.canvas.draw()
+    return fig, ax, im, selector, wbm
+
+
+def test_recolor_is_off_by_default():
+    fig, ax, im, selector, wbm = _setup()
+    assert _select_cmap(wbm, selector, im, "magma")
+    assert "make_image" not in vars(im)
+    assert im.get_cmap().name == "magma"
+    plt.close(fig)
+
+
+def test_recolor_is_detached_when_uninstalled():
+    fig, ax, im, selector, wbm = _setup(recolor=True)
+    _select_cmap(wbm, selector, im, "magma")
+    assert "make_image" in vars(im)
+
+    wbm.uninstall_all()
+    assert "make_image" not in vars(im)
+    plt.close(fig)
+
+
+def test_recolor_is_detached_when_the_image_is_removed():
+    fig, ax, im, selector, wbm = _setup(recolor=True)
+    _select_cmap(wbm, selector, im, "magma")
+
+    im.remove()
+    im2 = ax.imshow(np.ones((10, 10)))
+    _select_cmap(wbm, selector, im2, "gray")
+
+    assert "make_image" not in vars(im)
+    assert list(selector._recolors) == [im2]
+    plt.close(fig)
+
+
+def test_recolor_does_not_keep_the_image_alive():
+    fig, ax, im, selector, wbm = _setup(recolor=True)
+    _select_cmap(wbm, selector, im, "magma")
+    fig.canvas.draw()
+
+    ax.images[0].remove()
+    del im
+    gc.collect()
+
+    assert len(selector._recolors) == 0
+    plt.close(fig)
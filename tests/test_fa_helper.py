@@ -0,0 +1,35 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import pytest
+
+from mpl_widget_box.fa_helper import FontAwesome, get_fa_textarea
+
+
+@pytest.fixture
+def no_index(monkeypatch):
+    "fail if the index of the icons is loaded."
+    def get_icon_index():
+        raise AssertionError("the index of the icons is loaded")
+
+    monkeypatch.setattr(FontAwesome, "get_icon_index", get_icon_index)
+
+
+@pytest.mark.parametrize("char", ["", "x", "\uf067", "\u2713"])
+def test_character_is_used_as_is(no_index, char):
+    assert get_fa_textarea(char).get_text() == char
+
+
+def test_icon_used_by_the_package(no_index):
+    assert get_fa_textarea("plus").get_text() == "+"
+
+
+def test_icons_from_the_index_are_not_added_to_the_icons(monkeypatch,
+                                                        tmp_path):
+    monkeypatch.setenv("MPL_WIDGET_BOX_CACHE_DIR", str(tmp_path))
+    icons = dict(FontAwesome.icons)
+    char = get_fa_textarea("house").get_text()
+
+    assert char == FontAwesome.get_icon("house")
+    assert FontAwesome.icons == icons
@@ -0,0 +1,84 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.transforms import Bbox
+
+from mpl_widget_box import widgets as W, WidgetBoxManager
+from mpl_widget_box.hit_test_index import UniformGridIndex, EventAreaIndex
+
+
+def _bbox(x0, y0, x1, y1):
+    return Bbox.from_extents(x0, y0, x1, y1)
+
+
+def test_query_returns_items_in_the_order_of_priority():
+    index = UniformGridIndex([(_bbox(0, 0, 100, 100), "back"),
+                              (_bbox(40, 40, 60, 60), "front"),
+                              (_bbox(200, 200, 210, 210), "far")])
+
+    assert index.query(50, 50) == ["back", "front"]
+    assert index.query(10, 10) == ["back"]
+    assert index.query(205, 205) == ["far"]
+    assert index.query(150, 150) == []
+    assert index.query(-1, -1) == []
+
+
+def test_query_matches_a_linear_scan():
+    entries = [(_bbox(i * 7 % 300, i * 13 % 200, i * 7 % 300 + 25,
+                      i * 13 % 200 + 12), i) for i in range(200)]
+    index = UniformGridIndex(entries)
+
+    for x in range(-5, 330, 9):
+        for y in range(-5, 220, 7):
+            expected = [i for bb, i in entries if bb.contains(x, y)]
+            assert index.query(x, y) == expected
+
+
+def test_empty_index():
+    index = UniformGridIndex([])
+    assert len(index) == 0
+    assert not index.contains(0, 0)
+    assert index.query(0, 0) == []
+
+
+def test_event_area_index_ignores_events_without_location():
+    index = EventAreaIndex([(_bbox(0, 0, 10, 10), "box")],
+                           [(_bbox(0, 0, 10, 10), "widget")])
+
+    assert index.inside(5, 5)
+    assert index.widgets_at(5, 5) == ["widget"]
+    assert not index.inside(None, 5)
+    assert index.widgets_at(5, None) == []
+
+
+def test_index_is_kept_unless_the_widgets_move():
+    fig, ax = plt.subplots()
+    wbm = WidgetBoxManager(fig)
+    wbm.add_anchored_widget_box(
+        [W.Button("b1", "Button 1"), W.Button("b2", "Button 2"),
+         W.Label("l", "label")], ax, loc=2)
+    wbm.install_all()
+    canvas = fig.canvas
+    canvas.draw()
+    renderer = canvas.get_renderer()
+
+    def center(wid):
+        bb = wbm.get_widget_by_id(wid).get_window_extent(renderer)
+        return (bb.x0 + bb.x1) / 2, (bb.y0 + bb.y1) / 2
+
+    MouseEvent("motion_notify_event", canvas, *center("b1"))._process()
+    index = wbm.get_hit_index(renderer)
+
+    # the hover changes redraw the widgets, but do not move them.
+    MouseEvent("motion_notify_event", canvas, *center("b2"))._process()
+    MouseEvent("motion_notify_event", canvas, *center("b1"))._process()
+    assert wbm.get_hit_index(renderer) is index
+
+    wbm.get_widget_by_id("l").set_label("a much longer label")
+    MouseEvent("motion_notify_event", canvas, *center("b2"))._process()
+    assert wbm.get_hit_index(renderer) is not index
+
+    plt.close(fig)
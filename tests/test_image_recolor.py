@@ -0,0 +1,71 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from mpl_widget_box.misc import image_recolor
+from mpl_widget_box.misc.image_recolor import ImageRecolor
+from mpl_widget_box.misc.mpl_norm_helper import StretchNormalize
+
+
+@pytest.fixture
+def recolor(monkeypatch):
+    # All the objects share an id, as the ids of the freed ones are reused.
+    monkeypatch.setattr(image_recolor, "id", lambda obj: 0, raising=False)
+
+    fig, ax = plt.subplots(figsize=(3, 3))
+    im = ax.imshow(np.random.default_rng(0).random((40, 50)),
+                   norm=StretchNormalize("linear", 0, 1))
+    recolor = ImageRecolor(im)
+    fig.canvas.draw()
+    yield recolor
+    plt.close(fig)
+
+
+def _assert_same_as_matplotlib(recolor):
+    renderer = recolor.image.figure.canvas.get_renderer()
+    rgba = recolor._make_image(renderer)[0]
+    expected = recolor._orig_make_image(renderer)[0]
+    np.testing.assert_array_equal(rgba, expected)
+
+
+def test_recolor_after_set_data(recolor):
+    rng = np.random.default_rng(1)
+    for cmap in ["magma", "gray"]:
+        recolor.image.set_data(rng.random((40, 50)))
+        _assert_same_as_matplotlib(recolor)
+        recolor.image.set_cmap(cmap)
+        _assert_same_as_matplotlib(recolor)
+
+
+def test_recolor_after_set_norm(recolor):
+    # the same vmin and vmax, but another stretch.
+    for stretch in ["sqrt", "log", "squared", "asinh"]:
+        recolor.image.set_norm(StretchNormalize(stretch, 0, 1))
+        _assert_same_as_matplotlib(recolor)
+
+
+def test_no_recolor_when_interpolated_in_rgba(recolor):
+    im = recolor.image
+    # the image is downsampled.
+    im.set_data(np.random.default_rng(2).random((2000, 1500)))
+    im.set_interpolation_stage("rgba")
+
+    assert not recolor.can_recolor()
+    _assert_same_as_matplotlib(recolor)
+
+
+@pytest.mark.parametrize("interpolation, expected", [
+    ("nearest", True), ("none", True), ("antialiased", False),
+    ("bilinear", False)])
+def test_auto_interpolation_stage(recolor, monkeypatch, interpolation,
+                                  expected):
+    # the default of matplotlib >= 3.10.
+    im = recolor.image
+    monkeypatch.setattr(im, "_interpolation_stage", "auto")
+    im.set_interpolation(interpolation)
+
+    assert recolor.can_recolor() == expected
@@ -0,0 +1,46 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+from matplotlib.offsetbox import TextArea as MplTextArea
+
+from mpl_widget_box import widgets as W, WidgetBoxManager
+
+
+def _install(widgets):
+    fig, ax = plt.subplots()
+    wbm = WidgetBoxManager(fig)
+    wbm.add_anchored_widget_box(widgets, ax, loc=2)
+    wbm.install_all()
+    fig.canvas.draw()
+    return fig, wbm
+
+
+def test_label_of_matplotlib_textarea_follows_its_text():
+    t = MplTextArea("ab")
+    label = W.Label("l", t)
+    long_label = W.Label("l2", MplTextArea("a much longer text than before"))
+    fig, wbm = _install([label, long_label])
+    renderer = fig.canvas.get_renderer()
+    w0 = label.get_window_extent(renderer).width
+
+    # matplotlib's TextArea does not invalidate the cached layout.
+    t.set_text("a much longer text than before")
+    fig.canvas.draw()
+    w1 = label.get_window_extent(renderer).width
+
+    assert w1 > w0
+    assert w1 == long_label.get_window_extent(renderer).width
+    plt.close(fig)
+
+
+def test_layout_is_cached_for_native_textarea():
+    label = W.Label("l", "ab")
+    fig, wbm = _install([label])
+    renderer = fig.canvas.get_renderer()
+    assert label._get_cached_layout(renderer) is not None
+
+    label.set_label("a much longer text than before")
+    assert label._get_cached_layout(renderer) is None
+    plt.close(fig)
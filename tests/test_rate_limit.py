@@ -0,0 +1,154 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import pytest
+from matplotlib.backend_bases import MouseEvent
+
+from mpl_widget_box import widgets as W, WidgetBoxManager
+from mpl_widget_box.rate_limit import RateLimitedCall
+
+
+class FakeTimer:
+    "a timer that runs only when fired."
+
+    def __init__(self):
+        self.single_shot = False
+        self.interval = None
+        self.running = False
+        self.callbacks = []
+
+    def add_callback(self, func):
+        self.callbacks.append(func)
+
+    def start(self):
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+    def fire(self):
+        assert self.running
+        self.running = False
+        for func in self.callbacks:
+            func()
+
+
+def _make(mode, interval=0.1):
+    calls = []
+    timers = []
+
+    def new_timer():
+        timers.append(FakeTimer())
+        return timers[-1]
+
+    limiter = RateLimitedCall(lambda *args: calls.append(args), mode,
+                              interval=interval, new_timer=new_timer)
+    return limiter, calls, timers
+
+
+def test_immediate():
+    limiter, calls, timers = _make("immediate")
+    limiter.call(1)
+    limiter.call(2)
+    assert calls == [(1,), (2,)]
+    assert not limiter.has_pending()
+    assert timers == []
+
+
+def test_latest_coalesces_the_calls():
+    limiter, calls, timers = _make("latest")
+    for i in range(5):
+        limiter.call(i)
+
+    assert calls == []
+    assert len(timers) == 1 and timers[0].interval == 0
+
+    timers[0].fire()
+    assert calls == [(4,)]
+    assert not limiter.has_pending()
+
+
+def test_throttle_delays_the_last_call():
+    limiter, calls, timers = _make("throttle", interval=100)
+    limiter.call(1)
+    limiter.call(2)
+    limiter.call(3)
+
+    assert calls == [(1,)]
+    assert timers[0].running and timers[0].interval > 0
+
+    timers[0].fire()
+    assert calls == [(1,), (3,)]
+
+
+def test_debounce_restarts_the_timer():
+    limiter, calls, timers = _make("debounce", interval=0.5)
+    limiter.call(1)
+    limiter.call(2)
+
+    assert calls == []
+    assert timers[0].interval == 500
+    timers[0].fire()
+    assert calls == [(2,)]
+
+
+def test_release_calls_only_on_flush():
+    limiter, calls, timers = _make("release")
+    limiter.call(1)
+    limiter.call(2)
+    assert calls == []
+
+    limiter.flush()
+    assert calls == [(2,)]
+    limiter.flush()
+    assert calls == [(2,)]
+
+
+def test_cancel_drops_the_pending_call():
+    limiter, calls, timers = _make("latest")
+    limiter.call(1)
+    limiter.cancel()
+
+    assert not limiter.has_pending()
+    assert not timers[0].running
+    limiter.flush()
+    assert calls == []
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        RateLimitedCall(print, "unknown")
+    for mode in ["latest", "throttle", "debounce"]:
+        with pytest.raises(ValueError):
+            RateLimitedCall(print, mode)
+
+
+def test_motion_policy_latest():
+    fig, ax = plt.subplots()
+    wbm = WidgetBoxManager(fig)
+    wbm.add_anchored_widget_box([W.Button("b", "Button")], ax, loc=2)
+    wbm.install_all()
+    canvas = fig.canvas
+    canvas.draw()
+
+    handled = []
+    wbm.handle_event_n_draw = handled.append
+    wbm.set_motion_policy("latest")
+    assert wbm.get_motion_policy() == "latest"
+
+    events = [MouseEvent("motion_notify_event", canvas, x, 10)
+              for x in [10, 20, 30]]
+    for event in events:
+        event._process()
+    # Agg timers do not run.
+    assert handled == []
+
+    wbm.flush_pending_motion()
+    assert handled == [events[-1]]
+
+    with pytest.raises(ValueError):
+        wbm.set_motion_policy("throttle")
+
+    plt.close(fig)
@@ -0,0 +1,102 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from matplotlib.backend_bases import MouseEvent
+
+from mpl_widget_box import widgets as W, WidgetBoxManager
+
+
+def _make(render_cache):
+    fig, ax = plt.subplots(figsize=(4, 3))
+    ax.imshow(np.random.default_rng(0).random((20, 20)))
+    wbm = WidgetBoxManager(fig)
+    wbm.add_anchored_widget_box(
+        [W.Label("l0", "label", render_cache=render_cache),
+         W.Button("b", "Button", tooltip="tooltip",
+                  render_cache=render_cache),
+         W.Label("l", "label", render_cache=render_cache)], ax, loc=2)
+    wbm.install_all()
+    fig.canvas.draw()
+    return fig, wbm
+
+
+@pytest.fixture
+def figs():
+    figs = [_make(False), _make(True)]
+    yield figs
+    for fig, wbm in figs:
+        plt.close(fig)
+
+
+def _draw(figs, change=None):
+    "apply the change to both figures, and assert that they are identical."
+    bufs = []
+    for fig, wbm in figs:
+        if change is not None:
+            change(wbm)
+        fig.canvas.draw()
+        bufs.append(np.asarray(fig.canvas.buffer_rgba()).copy())
+    np.testing.assert_array_equal(bufs[0], bufs[1])
+
+
+def _count_draws(monkeypatch, widget):
+    count = []
+    draw = widget._draw_with_outer_bbox
+
+    def _draw_with_outer_bbox(renderer, outer_bbox):
+        count.append(1)
+        return draw(renderer, outer_bbox)
+
+    monkeypatch.setattr(widget, "_draw_with_outer_bbox", _draw_with_outer_bbox)
+    return count
+
+
+def test_cache_hit(figs, monkeypatch):
+    label = figs[1][1].get_widget_by_id("l")
+    count = _count_draws(monkeypatch, label)
+
+    _draw(figs)
+    _draw(figs)
+    assert label._render_cache is not None
+    assert count == []
+
+
+def test_cache_miss_draws_once(figs, monkeypatch):
+    label = figs[1][1].get_widget_by_id("l")
+    count = _count_draws(monkeypatch, label)
+
+    _draw(figs, lambda wbm: wbm.get_widget_by_id("l").set_label("changed"))
+    assert count == [1]
+
+
+def test_set_text(figs):
+    _draw(figs, lambda wbm: wbm.get_widget_by_id("l").set_label("changed"))
+    _draw(figs, lambda wbm: wbm.get_widget_by_id("l").set_label("label"))
+
+
+def test_status_change(figs):
+    _draw(figs, lambda wbm: wbm.get_widget_by_id("b").set_context("disabled"))
+
+    # hover
+    for fig, wbm in figs:
+        renderer = fig.canvas.get_renderer()
+        bb = wbm.get_widget_by_id("b").get_event_area(renderer)
+        MouseEvent("motion_notify_event", fig.canvas,
+                   (bb.x0 + bb.x1) / 2, (bb.y0 + bb.y1) / 2)._process()
+    _draw(figs)
+
+
+def test_moved_widget(figs):
+    # a longer label above moves the other widgets.
+    _draw(figs, lambda wbm: wbm.get_widget_by_id("l0").set_label(
+        "a much\nlonger label"))
+
+    # the patch, which anchors the tooltip and the event area, is moved too.
+    extents = [wbm.get_widget_by_id("l").patch.get_window_extent(
+        fig.canvas.get_renderer()).bounds for fig, wbm in figs]
+    assert extents[0] == extents[1]
+    _draw(figs)
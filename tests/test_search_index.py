@@ -0,0 +1,57 @@
+import pytest
+
+from mpl_widget_box.search_index import SearchIndex
+
+NAMES = ["viridis", "Viridis_r", "plasma", "magma", "inferno", "gray",
+         "Greys", "RdGy", "banana"]
+
+
+def _linear(strings, query, mode):
+    q = query.casefold()
+    if mode == "prefix":
+        return [i for i, s in enumerate(strings) if s.casefold().startswith(q)]
+    return [i for i, s in enumerate(strings) if q in s.casefold()]
+
+
+def test_prefix():
+    index = SearchIndex(NAMES)
+    assert index.find("vir") == [0, 1]
+    assert index.find("GR") == [5, 6]
+    assert index.find("gy") == []
+
+
+def test_substring():
+    index = SearchIndex(NAMES, mode="substring")
+    assert index.find("gy") == [7]
+    assert index.find("MA") == [2, 3]
+    assert index.find("xyz") == []
+
+
+def test_string_with_repeated_matches_is_found_once():
+    index = SearchIndex(NAMES, mode="substring")
+    assert index.find("an") == [8]
+    assert index.find("a") == [2, 3, 5, 8]
+
+
+def test_empty_query_matches_all():
+    for mode in ["prefix", "substring"]:
+        index = SearchIndex(NAMES, mode=mode)
+        assert index.find("") == list(range(len(NAMES)))
+        assert len(index) == len(NAMES)
+
+
+@pytest.mark.parametrize("mode", ["prefix", "substring"])
+def test_find_matches_a_linear_scan(mode):
+    index = SearchIndex(NAMES, mode=mode)
+    for query in ["v", "r", "ri", "IS", "s_", "e", "ma", "Z", "banana!"]:
+        assert index.find(query) == _linear(NAMES, query, mode)
+
+
+def test_casefold():
+    index = SearchIndex(["Straße", "STRASSE", "other"])
+    assert index.find("strass") == [0, 1]
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        SearchIndex(NAMES, mode="fuzzy")
@@ -0,0 +1,23 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import pytest
+
+from mpl_widget_box import widgets as W
+
+
+@pytest.mark.parametrize("valmin, valmax", [(1, 1), (2, 1)])
+def test_empty_range_is_rejected(valmin, valmax):
+    with pytest.raises(ValueError):
+        W.Slider("s", valmin, valmax)
+
+
+def test_value_is_clipped_to_the_range():
+    s = W.Slider("s", 0, 10)
+    assert s.get_status() == {"val": 5}
+
+    s.set_val(20)
+    assert s.get_status() == {"val": 10}
+    s.set_val(-1)
+    assert s.get_status() == {"val": 0}